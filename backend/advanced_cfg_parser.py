@@ -14,25 +14,26 @@ Enhancements over basic parser:
 6. Advanced error recovery and reporting
 """
 
-import nltk
 from nltk import CFG, ChartParser
-from typing import Dict, List, Any, Optional, Tuple, Set, Union
+from typing import Dict, List, Any, Optional, Tuple
 import re
-from datetime import datetime
+import sys
+import threading
 from enum import Enum
-import json
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from collections import Counter
 
-class HTTPMethod(Enum):
-    """Enumeration of supported HTTP methods."""
-    GET = "GET"
-    POST = "POST"
-    PUT = "PUT"
-    DELETE = "DELETE"
-    HEAD = "HEAD"
-    OPTIONS = "OPTIONS"
-    PATCH = "PATCH"
-    TRACE = "TRACE"
-    CONNECT = "CONNECT"
+from time_utils import iso_now
+
+# Supported HTTP methods
+VALID_METHODS = frozenset(sys.intern(method) for method in (
+    'GET', 'POST', 'PUT', 'DELETE', 'HEAD', 'OPTIONS', 'PATCH', 'TRACE', 'CONNECT'
+))
+
+# Supported HTTP versions
+VALID_VERSIONS = frozenset({'HTTP/1.0', 'HTTP/1.1', 'HTTP/2.0', 'HTTP/3.0'})
 
 class TokenType(Enum):
     """Token types for lexical analysis."""
@@ -47,206 +48,431 @@ class TokenType(Enum):
     MESSAGE_BODY = "MESSAGE_BODY"
     INVALID = "INVALID"
 
+@dataclass(slots=True)
+class Token:
+    """Represents a token produced by the lexical analyzer."""
+    type: str
+    value: str
+    position: int
+    line: int
+    column: int
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the token to its JSON-serializable dictionary form."""
+        token = {
+            'type': self.type,
+            'value': self.value,
+            'position': self.position,
+            'line': self.line,
+            'column': self.column
+        }
+        if self.error is not None:
+            token['error'] = self.error
+        return token
+
 class LexicalAnalyzer:
     """
-    Finite State Automaton for HTTP request lexical analysis.
-    
-    States:
-    - START: Initial state
-    - METHOD: Reading HTTP method
-    - METHOD_END: Method completed, expecting space
-    - URI_START: Starting URI parsing
-    - URI: Reading URI
-    - URI_END: URI completed, expecting space
-    - VERSION_START: Starting HTTP version
-    - VERSION: Reading HTTP version
-    - VERSION_END: Version completed, expecting CRLF
-    - HEADER_START: Starting header parsing
-    - HEADER_NAME: Reading header name
-    - HEADER_COLON: Expecting colon after header name
-    - HEADER_VALUE_START: Starting header value
-    - HEADER_VALUE: Reading header value
-    - HEADER_END: Header completed, expecting CRLF
-    - BODY_START: Starting message body
-    - BODY: Reading message body
-    - END: Final state
+    Regular-expression scanner for HTTP request lexical analysis.
+    
+    HTTP request lexing is a regular language, so the finite state automaton
+    is compiled into one regular expression per message section and each
+    line is recognized by a single match in the regex engine:
+    - REQUEST_LINE: METHOD SP+ URI SP+ HTTP_VERSION CRLF
+    
+    CRLF and bare LF line endings are both accepted by the patterns
+    themselves, so the input is never copied to normalize it.
+    - HEADERS: HEADER_NAME COLON SP* HEADER_VALUE CRLF, until an empty line
+    - BODY: everything after the empty line is one MESSAGE_BODY token
+    
+    When a line does not match, an INVALID token describing the first
+    offending character is emitted and scanning stops.
+    
+    Tokens are stored column-wise in the parallel lists `types`, `values`,
+    `positions`, `lines` and `columns`; error messages are kept sparsely in
+    `errors` keyed by token index. `tokens` materializes Token objects on
+    demand for callers that want them.
     """
     
+    _URI_CHARS = r"A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=%"
+    
+    _REQUEST_LINE_RE = re.compile(
+        r"\s*(?P<METHOD>[A-Za-z]+)"
+        r"(?: +(?P<URI>/[" + _URI_CHARS + r"]*)"
+        r"(?: +(?P<HTTP_VERSION>H[A-Z0-9/.]*))?)?"
+    )
+    
+    _HEADER_LINE_RE = re.compile(
+        r"[^\S\n]*(?:(?P<CRLF>\n)|(?P<HEADER_NAME>[A-Za-z\-][A-Za-z0-9\-_]*)"
+        r"(?:(?P<COLON>:) *(?P<HEADER_VALUE>[^\r\n]*(?:\r(?!\n)[^\r\n]*)*)(?P<EOL>\r?\n)?)?)"
+    )
+    
     def __init__(self):
         self.reset()
     
     def reset(self):
-        """Reset the FSA to initial state."""
-        self.state = "START"
-        self.tokens = []
-        self.current_token = ""
-        self.position = 0
+        """Reset the scanner to its initial state."""
+        self.types: List[str] = []
+        self.values: List[str] = []
+        self.positions: List[int] = []
+        self.lines: List[int] = []
+        self.columns: List[int] = []
+        self.errors: Dict[int, str] = {}
         self.line = 1
-        self.column = 1
+        self.line_start = 0
     
-    def tokenize(self, input_text: str) -> List[Dict[str, Any]]:
+    def scan(self, input_text: str):
         """
-        Tokenize HTTP request using finite state automaton.
+        Scan an HTTP request into the column-wise token lists.
         
         Args:
             input_text (str): Raw HTTP request text
-            
-        Returns:
-            List[Dict[str, Any]]: List of tokens with type and position info
         """
         self.reset()
-        input_text = input_text.replace('\r\n', '\n')  # Normalize line endings
-        
-        for char in input_text:
-            self._process_character(char)
-            self._update_position(char)
         
-        # Process any remaining token
-        if self.current_token:
-            self._emit_token()
+        position = self._scan_request_line(input_text)
+        if position is not None:
+            position = self._scan_headers(input_text, position)
+        if position is not None and position < len(input_text):
+            self._emit(TokenType.MESSAGE_BODY, input_text[position:], position)
+    
+    def tokenize(self, input_text: str) -> List[Token]:
+        """
+        Tokenize HTTP request using compiled regular expressions.
         
+        Args:
+            input_text (str): Raw HTTP request text
+            
+        Returns:
+            List[Token]: List of tokens with type and position info
+        """
+        self.scan(input_text)
         return self.tokens
     
-    def _process_character(self, char: str):
-        """Process a single character based on current FSA state."""
-        if self.state == "START":
-            if char.isalpha():
-                self.state = "METHOD"
-                self.current_token = char
-            elif char.isspace():
-                pass  # Skip leading whitespace
-            else:
-                self._emit_error_token(f"Unexpected character '{char}' at start")
-        
-        elif self.state == "METHOD":
-            if char.isalpha():
-                self.current_token += char
-            elif char == ' ':
-                self._emit_token(TokenType.METHOD)
-                self.state = "URI_START"
-            else:
-                self._emit_error_token(f"Invalid character '{char}' in method")
-        
-        elif self.state == "URI_START":
-            if char == ' ':
-                pass  # Skip spaces
-            elif char == '/':
-                self.state = "URI"
-                self.current_token = char
-            else:
-                self._emit_error_token(f"URI must start with '/'")
-        
-        elif self.state == "URI":
-            if char == ' ':
-                self._emit_token(TokenType.URI)
-                self.state = "VERSION_START"
-            elif char in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~:/?#[]@!$&'()*+,;=%":
-                self.current_token += char
-            else:
-                self._emit_error_token(f"Invalid character '{char}' in URI")
-        
-        elif self.state == "VERSION_START":
-            if char == ' ':
-                pass  # Skip spaces
-            elif char == 'H':
-                self.state = "VERSION"
-                self.current_token = char
-            else:
-                self._emit_error_token(f"HTTP version must start with 'H'")
-        
-        elif self.state == "VERSION":
-            if char == '\n':
-                self._emit_token(TokenType.HTTP_VERSION)
-                self._emit_token(TokenType.CRLF, "\n")
-                self.state = "HEADER_START"
-            elif char in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789/.":
-                self.current_token += char
-            else:
-                self._emit_error_token(f"Invalid character '{char}' in HTTP version")
-        
-        elif self.state == "HEADER_START":
-            if char == '\n':
-                self._emit_token(TokenType.CRLF, "\n")
-                self.state = "BODY_START"
-            elif char.isalpha() or char == '-':
-                self.state = "HEADER_NAME"
-                self.current_token = char
-            elif char.isspace():
-                pass  # Skip whitespace
-            else:
-                self._emit_error_token(f"Invalid start of header '{char}'")
-        
-        elif self.state == "HEADER_NAME":
-            if char == ':':
-                self._emit_token(TokenType.HEADER_NAME)
-                self._emit_token(TokenType.COLON, ":")
-                self.state = "HEADER_VALUE_START"
-            elif char.isalnum() or char in '-_':
-                self.current_token += char
-            else:
-                self._emit_error_token(f"Invalid character '{char}' in header name")
-        
-        elif self.state == "HEADER_VALUE_START":
-            if char == ' ':
-                pass  # Skip leading spaces in header value
-            elif char == '\n':
-                self._emit_token(TokenType.HEADER_VALUE, "")
-                self._emit_token(TokenType.CRLF, "\n")
-                self.state = "HEADER_START"
-            else:
-                self.state = "HEADER_VALUE"
-                self.current_token = char
-        
-        elif self.state == "HEADER_VALUE":
-            if char == '\n':
-                self._emit_token(TokenType.HEADER_VALUE)
-                self._emit_token(TokenType.CRLF, "\n")
-                self.state = "HEADER_START"
-            else:
-                self.current_token += char
-        
-        elif self.state == "BODY_START":
-            self.state = "BODY"
-            self.current_token = char
-        
-        elif self.state == "BODY":
-            self.current_token += char
+    @property
+    def tokens(self) -> List[Token]:
+        """Materialize the scanned tokens as Token objects."""
+        errors = self.errors
+        return [
+            Token(token_type, value, position, line, column, errors.get(i))
+            for i, (token_type, value, position, line, column) in enumerate(
+                zip(self.types, self.values, self.positions, self.lines, self.columns))
+        ]
     
-    def _emit_token(self, token_type: Optional[TokenType] = None, value: Optional[str] = None):
-        """Emit a token with current or specified value."""
-        token_value = value if value is not None else self.current_token
-        token_type_str = token_type.value if token_type else "UNKNOWN"
-        
-        self.tokens.append({
-            'type': token_type_str,
-            'value': token_value,
-            'position': self.position - len(token_value),
-            'line': self.line,
-            'column': self.column - len(token_value)
-        })
-        self.current_token = ""
-    
-    def _emit_error_token(self, error_message: str):
-        """Emit an error token."""
-        self.tokens.append({
-            'type': TokenType.INVALID.value,
-            'value': self.current_token,
-            'error': error_message,
-            'position': self.position,
-            'line': self.line,
-            'column': self.column
-        })
-        self.current_token = ""
-        self.state = "START"  # Reset to start state for error recovery
-    
-    def _update_position(self, char: str):
-        """Update position tracking."""
-        self.position += 1
-        if char == '\n':
-            self.line += 1
-            self.column = 1
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert the scanned tokens to their JSON-serializable dictionary form."""
+        tokens = [
+            {'type': token_type, 'value': value, 'position': position, 'line': line, 'column': column}
+            for token_type, value, position, line, column in zip(
+                self.types, self.values, self.positions, self.lines, self.columns)
+        ]
+        for i, message in self.errors.items():
+            tokens[i]['error'] = message
+        return tokens
+    
+    def _scan_request_line(self, text: str) -> Optional[int]:
+        """Scan the request line; return the offset of the header section or None."""
+        if not text.strip():
+            return None
+        
+        match = self._REQUEST_LINE_RE.match(text)
+        if not match:
+            offset = len(text) - len(text.lstrip())
+            self._emit_error(f"Unexpected character '{text[offset]}' at start", offset)
+            return None
+        
+        self._newlines(text, 0, match.start('METHOD'))
+        for group in ('METHOD', 'URI', 'HTTP_VERSION'):
+            if match.group(group) is not None:
+                self._emit(TokenType[group], match.group(group), match.start(group))
+        
+        end = match.end()
+        if match.group('HTTP_VERSION') is None:
+            # Trailing spaces are skipped while waiting for the next component
+            while end < len(text) and text[end] == ' ':
+                end += 1
+        if end == len(text):
+            return None
+        
+        char = text[end]
+        if match.group('HTTP_VERSION') is not None:
+            eol = end + 1 if char == '\n' else end + 2 if text.startswith('\r\n', end) else None
+            if eol is not None:
+                self._emit(TokenType.CRLF, '\n', end)
+                self._newlines(text, end, eol)
+                return eol
+        
+        if match.group('HTTP_VERSION') is not None:
+            message = f"Invalid character '{char}' in HTTP version"
+        elif match.group('URI') is not None:
+            message = ("HTTP version must start with 'H'" if text[end - 1] == ' '
+                       else f"Invalid character '{char}' in URI")
+        elif text[end - 1] == ' ':
+            message = "URI must start with '/'"
         else:
-            self.column += 1
+            message = f"Invalid character '{char}' in method"
+        self._emit_error(message, end)
+        return None
+    
+    def _scan_headers(self, text: str, position: int) -> Optional[int]:
+        """Scan header lines; return the offset of the message body or None."""
+        length = len(text)
+        while position < length:
+            match = self._HEADER_LINE_RE.match(text, position)
+            if not match:
+                offset = len(text) - len(text[position:].lstrip())
+                if offset < length:
+                    self._emit_error(f"Invalid start of header '{text[offset]}'", offset)
+                return None
+            
+            if match.group('CRLF') is not None:
+                self._emit(TokenType.CRLF, '\n', match.start('CRLF'))
+                self._newlines(text, position, match.end())
+                return match.end()
+            
+            end = match.end()
+            self._emit(TokenType.HEADER_NAME, match.group('HEADER_NAME'), match.start('HEADER_NAME'))
+            if match.group('COLON') is None:
+                if end < length:
+                    self._emit_error(f"Invalid character '{text[end]}' in header name", end)
+                return None
+            
+            self._emit(TokenType.COLON, ':', match.start('COLON'))
+            value = match.group('HEADER_VALUE')
+            if match.group('EOL') is None:
+                if value:
+                    self._emit(TokenType.HEADER_VALUE, value, match.start('HEADER_VALUE'))
+                return None
+            
+            self._emit(TokenType.HEADER_VALUE, value, match.start('HEADER_VALUE'))
+            self._emit(TokenType.CRLF, '\n', match.start('EOL'))
+            self._newlines(text, position, end)
+            position = end
+        
+        return None
+    
+    def _emit(self, token_type: TokenType, value: str, position: int):
+        """Emit a token starting at the given offset."""
+        self.types.append(token_type.value)
+        self.values.append(value)
+        self.positions.append(position)
+        self.lines.append(self.line)
+        self.columns.append(position - self.line_start + 1)
+    
+    def _emit_error(self, error_message: str, position: int):
+        """Emit an error token at the given offset."""
+        self.errors[len(self.types)] = error_message
+        self._emit(TokenType.INVALID, '', position)
+    
+    def _newlines(self, text: str, start: int, end: int):
+        """Advance line tracking over text[start:end]."""
+        count = text.count('\n', start, end)
+        if count:
+            self.line += count
+            self.line_start = text.rindex('\n', start, end) + 1
+
+# Method properties (RFC 7231 section 4.2)
+_SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE'})
+_IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'})
+_CACHEABLE_METHODS = frozenset({'GET', 'HEAD', 'POST'})
+
+# URI character classes (RFC 3986 section 2)
+_URI_MAX_LENGTH = 8000  # RFC 7230 recommendation
+_URI_RESERVED_CHARS = frozenset(':/?#[]@')
+_URI_UNRESERVED_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+# Semantic validation rules shared by all parser instances
+_SEMANTIC_RULES = {
+    'method_validation': {
+        'safe_methods': _SAFE_METHODS,
+        'idempotent_methods': _IDEMPOTENT_METHODS,
+        'cacheable_methods': _CACHEABLE_METHODS,
+    },
+    'uri_validation': {
+        'max_length': _URI_MAX_LENGTH,
+        'allowed_schemes': frozenset({'http', 'https', 'ftp', 'file'}),
+        'reserved_chars': _URI_RESERVED_CHARS,
+        'unreserved_chars': _URI_UNRESERVED_CHARS
+    },
+    'header_validation': {
+        'required_headers': {
+            'GET': (),
+            'POST': ('Content-Type', 'Content-Length'),
+            'PUT': ('Content-Type', 'Content-Length'),
+            'DELETE': ()
+        },
+        'forbidden_headers': {
+            'TRACE': ('Content-Length', 'Transfer-Encoding')
+        }
+    }
+}
+
+# Enhanced CFG grammar rules (RFC 7230) in NLTK CFG notation
+GRAMMAR_RULES = """
+    HTTPMessage -> RequestLine Headers MessageBody
+    HTTPMessage -> RequestLine Headers
+    HTTPMessage -> RequestLine
+    
+    RequestLine -> Method SP RequestTarget SP HTTPVersion CRLF
+    
+    Method -> "GET" | "POST" | "PUT" | "DELETE" | "HEAD" | "OPTIONS" | "PATCH" | "TRACE" | "CONNECT"
+    
+    RequestTarget -> OriginForm | AbsoluteForm | AuthorityForm | AsteriskForm
+    OriginForm -> "/" PathAbempty QueryString
+    OriginForm -> "/" PathAbempty
+    OriginForm -> "/"
+    AbsoluteForm -> Scheme "://" Authority PathAbempty QueryString
+    AbsoluteForm -> Scheme "://" Authority PathAbempty
+    AuthorityForm -> Authority
+    AsteriskForm -> "*"
+    
+    PathAbempty -> PathSegments
+    PathAbempty -> ""
+    PathSegments -> PathSegment "/" PathSegments
+    PathSegments -> PathSegment
+    PathSegment -> PChar PChars
+    PathSegment -> PChar
+    PathSegment -> ""
+    
+    QueryString -> "?" QueryParams
+    QueryParams -> QueryParam "&" QueryParams
+    QueryParams -> QueryParam
+    QueryParam -> PChar PChars "=" PChar PChars
+    QueryParam -> PChar PChars
+    
+    Scheme -> "http" | "https" | "ftp" | "file"
+    Authority -> Host Port
+    Authority -> Host
+    Host -> IPAddress | DomainName
+    Port -> ":" Digits
+    
+    HTTPVersion -> "HTTP/1.0" | "HTTP/1.1" | "HTTP/2.0" | "HTTP/3.0"
+    
+    Headers -> HeaderField Headers
+    Headers -> HeaderField
+    Headers -> ""
+    
+    HeaderField -> FieldName ":" OWS FieldValue OWS CRLF
+    FieldName -> Token
+    FieldValue -> FieldContent
+    FieldContent -> VChar VChars
+    FieldContent -> VChar
+    FieldContent -> ""
+    
+    Token -> TChar TChars
+    Token -> TChar
+    TChar -> Alpha | Digit | "!" | "#" | "$" | "%" | "&" | "'" | "*" | "+" | "-" | "." | "^" | "_" | "`" | "|" | "~"
+    TChars -> TChar TChars
+    TChars -> TChar
+    
+    PChar -> Alpha | Digit | "-" | "." | "_" | "~" | ":" | "@" | "!" | "$" | "&" | "'" | "(" | ")" | "*" | "+" | "," | ";" | "="
+    PChars -> PChar PChars
+    PChars -> PChar
+    
+    VChar -> Alpha | Digit | "!" | '"' | "#" | "$" | "%" | "&" | "'" | "(" | ")" | "*" | "+" | "," | "-" | "." | "/" | ":" | ";" | "<" | "=" | ">" | "?" | "@" | "[" | "\\" | "]" | "^" | "_" | "`" | "{" | "|" | "}" | "~"
+    VChars -> VChar VChars
+    VChars -> VChar
+    
+    Alpha -> "a" | "b" | "c" | "d" | "e" | "f" | "g" | "h" | "i" | "j" | "k" | "l" | "m" | "n" | "o" | "p" | "q" | "r" | "s" | "t" | "u" | "v" | "w" | "x" | "y" | "z" | "A" | "B" | "C" | "D" | "E" | "F" | "G" | "H" | "I" | "J" | "K" | "L" | "M" | "N" | "O" | "P" | "Q" | "R" | "S" | "T" | "U" | "V" | "W" | "X" | "Y" | "Z"
+    Digit -> "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+    Digits -> Digit Digits
+    Digits -> Digit
+    
+    SP -> " "
+    CRLF -> "\\n"
+    OWS -> SP OWS
+    OWS -> ""
+    
+    MessageBody -> BodyContent
+    BodyContent -> VChar VChars
+    BodyContent -> VChar
+    BodyContent -> ""
+    
+    IPAddress -> IPv4Address | IPv6Address
+    IPv4Address -> Octet "." Octet "." Octet "." Octet
+    Octet -> Digit Digit Digit
+    Octet -> Digit Digit
+    Octet -> Digit
+    IPv6Address -> "[" IPv6Addr "]"
+    IPv6Addr -> HexDigit HexDigits
+    HexDigit -> Digit | "a" | "b" | "c" | "d" | "e" | "f" | "A" | "B" | "C" | "D" | "E" | "F"
+    HexDigits -> HexDigit HexDigits
+    HexDigits -> HexDigit
+    
+    DomainName -> Label "." DomainName
+    DomainName -> Label
+    Label -> Alpha AlphaNum
+    Label -> Alpha
+    AlphaNum -> Alpha | Digit | "-"
+"""
+
+# Token-level grammar used by the chart parser: terminals are lexer token
+# classes, except METHOD and HTTP_VERSION tokens which match by value
+TOKEN_GRAMMAR_RULES = """
+    HTTPMessage -> RequestLine | RequestLine "CRLF"
+    HTTPMessage -> RequestLine "CRLF" Headers | RequestLine "CRLF" Headers LastField | RequestLine "CRLF" LastField
+    HTTPMessage -> RequestLine "CRLF" Headers EmptyLine | RequestLine "CRLF" EmptyLine
+    
+    RequestLine -> Method RequestTarget HTTPVersion
+    Method -> "GET" | "POST" | "PUT" | "DELETE" | "HEAD" | "OPTIONS" | "PATCH" | "TRACE" | "CONNECT"
+    RequestTarget -> "URI"
+    HTTPVersion -> "HTTP/1.0" | "HTTP/1.1" | "HTTP/2.0" | "HTTP/3.0"
+    
+    Headers -> HeaderField "CRLF" | HeaderField "CRLF" Headers
+    LastField -> HeaderField
+    HeaderField -> FieldName "COLON" FieldValue
+    FieldName -> "HEADER_NAME"
+    FieldValue -> "HEADER_VALUE"
+    
+    EmptyLine -> "CRLF" | "CRLF" MessageBody
+    MessageBody -> "MESSAGE_BODY"
+"""
+
+# Token types whose value, rather than their type, is the chart parser terminal
+_VALUE_TERMINAL_TYPES = frozenset({'METHOD', 'HTTP_VERSION'})
+
+# Structured summary of the main productions, shared by every validation result
+ENHANCED_GRAMMAR_RULES = (
+    {
+        'lhs': 'HTTPMessage',
+        'rhs': 'RequestLine Headers MessageBody',
+        'rule': 'HTTPMessage → RequestLine Headers MessageBody',
+        'description': 'Complete HTTP message with headers and body'
+    },
+    {
+        'lhs': 'RequestLine',
+        'rhs': 'Method SP RequestTarget SP HTTPVersion CRLF',
+        'rule': 'RequestLine → Method SP RequestTarget SP HTTPVersion CRLF',
+        'description': 'HTTP request line structure (RFC 7230)'
+    },
+    {
+        'lhs': 'Method',
+        'rhs': 'GET | POST | PUT | DELETE | HEAD | OPTIONS | PATCH | TRACE | CONNECT',
+        'rule': 'Method → GET | POST | PUT | DELETE | HEAD | OPTIONS | PATCH | TRACE | CONNECT',
+        'description': 'Supported HTTP methods'
+    },
+    {
+        'lhs': 'RequestTarget',
+        'rhs': 'OriginForm | AbsoluteForm | AuthorityForm | AsteriskForm',
+        'rule': 'RequestTarget → OriginForm | AbsoluteForm | AuthorityForm | AsteriskForm',
+        'description': 'Four forms of request target (RFC 7230)'
+    },
+    {
+        'lhs': 'HTTPVersion',
+        'rhs': 'HTTP/1.0 | HTTP/1.1 | HTTP/2.0 | HTTP/3.0',
+        'rule': 'HTTPVersion → HTTP/1.0 | HTTP/1.1 | HTTP/2.0 | HTTP/3.0',
+        'description': 'Supported HTTP protocol versions'
+    },
+    {
+        'lhs': 'HeaderField',
+        'rhs': 'FieldName ":" OWS FieldValue OWS CRLF',
+        'rule': 'HeaderField → FieldName ":" OWS FieldValue OWS CRLF',
+        'description': 'HTTP header field structure'
+    }
+)
+
+# Guards one-time compilation of the shared grammar objects
+_grammar_lock = threading.Lock()
 
 class AdvancedHTTPRequestCFGParser:
     """
@@ -264,153 +490,70 @@ class AdvancedHTTPRequestCFGParser:
     field-value = *(field-content / obs-fold)
     """
     
+    # Compiled grammar objects shared by all instances, built on first use
+    _GRAMMAR: Optional[CFG] = None
+    _PARSER: Optional[ChartParser] = None
+    _compiled = False
+    
+    # Pre-flight check: a request must open with a known method and a space
+    _REQUEST_PREFIX_RE = re.compile(r"\s*(?:" + "|".join(sorted(VALID_METHODS)) + ") ")
+    
     def __init__(self):
         """Initialize the advanced CFG parser."""
-        self.lexical_analyzer = LexicalAnalyzer()
         self._init_grammar()
         self._init_semantic_rules()
     
+    @classmethod
+    def _compile_grammar(cls):
+        """Compile the token-level grammar and chart parser once per process."""
+        if cls._compiled:
+            return
+        
+        with _grammar_lock:
+            if cls._compiled:
+                return
+            try:
+                cls._GRAMMAR = CFG.fromstring(TOKEN_GRAMMAR_RULES)
+                cls._PARSER = ChartParser(cls._GRAMMAR)
+            except Exception as e:
+                print(f"Error initializing advanced grammar: {e}")
+            cls._compiled = True
+    
     def _init_grammar(self):
-        """Initialize the enhanced CFG grammar rules."""
-        self.grammar_rules = """
-            HTTPMessage -> RequestLine Headers MessageBody
-            HTTPMessage -> RequestLine Headers
-            HTTPMessage -> RequestLine
-            
-            RequestLine -> Method SP RequestTarget SP HTTPVersion CRLF
-            
-            Method -> "GET" | "POST" | "PUT" | "DELETE" | "HEAD" | "OPTIONS" | "PATCH" | "TRACE" | "CONNECT"
-            
-            RequestTarget -> OriginForm | AbsoluteForm | AuthorityForm | AsteriskForm
-            OriginForm -> "/" PathAbempty QueryString
-            OriginForm -> "/" PathAbempty
-            OriginForm -> "/"
-            AbsoluteForm -> Scheme "://" Authority PathAbempty QueryString
-            AbsoluteForm -> Scheme "://" Authority PathAbempty
-            AuthorityForm -> Authority
-            AsteriskForm -> "*"
-            
-            PathAbempty -> PathSegments
-            PathAbempty -> ""
-            PathSegments -> PathSegment "/" PathSegments
-            PathSegments -> PathSegment
-            PathSegment -> PChar PChars
-            PathSegment -> PChar
-            PathSegment -> ""
-            
-            QueryString -> "?" QueryParams
-            QueryParams -> QueryParam "&" QueryParams
-            QueryParams -> QueryParam
-            QueryParam -> PChar PChars "=" PChar PChars
-            QueryParam -> PChar PChars
-            
-            Scheme -> "http" | "https" | "ftp" | "file"
-            Authority -> Host Port
-            Authority -> Host
-            Host -> IPAddress | DomainName
-            Port -> ":" Digits
-            
-            HTTPVersion -> "HTTP/1.0" | "HTTP/1.1" | "HTTP/2.0" | "HTTP/3.0"
-            
-            Headers -> HeaderField Headers
-            Headers -> HeaderField
-            Headers -> ""
-            
-            HeaderField -> FieldName ":" OWS FieldValue OWS CRLF
-            FieldName -> Token
-            FieldValue -> FieldContent
-            FieldContent -> VChar VChars
-            FieldContent -> VChar
-            FieldContent -> ""
-            
-            Token -> TChar TChars
-            Token -> TChar
-            TChar -> Alpha | Digit | "!" | "#" | "$" | "%" | "&" | "'" | "*" | "+" | "-" | "." | "^" | "_" | "`" | "|" | "~"
-            TChars -> TChar TChars
-            TChars -> TChar
-            
-            PChar -> Alpha | Digit | "-" | "." | "_" | "~" | ":" | "@" | "!" | "$" | "&" | "'" | "(" | ")" | "*" | "+" | "," | ";" | "="
-            PChars -> PChar PChars
-            PChars -> PChar
-            
-            VChar -> Alpha | Digit | "!" | '"' | "#" | "$" | "%" | "&" | "'" | "(" | ")" | "*" | "+" | "," | "-" | "." | "/" | ":" | ";" | "<" | "=" | ">" | "?" | "@" | "[" | "\\" | "]" | "^" | "_" | "`" | "{" | "|" | "}" | "~"
-            VChars -> VChar VChars
-            VChars -> VChar
-            
-            Alpha -> "a" | "b" | "c" | "d" | "e" | "f" | "g" | "h" | "i" | "j" | "k" | "l" | "m" | "n" | "o" | "p" | "q" | "r" | "s" | "t" | "u" | "v" | "w" | "x" | "y" | "z" | "A" | "B" | "C" | "D" | "E" | "F" | "G" | "H" | "I" | "J" | "K" | "L" | "M" | "N" | "O" | "P" | "Q" | "R" | "S" | "T" | "U" | "V" | "W" | "X" | "Y" | "Z"
-            Digit -> "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
-            Digits -> Digit Digits
-            Digits -> Digit
-            
-            SP -> " "
-            CRLF -> "\\n"
-            OWS -> SP OWS
-            OWS -> ""
-            
-            MessageBody -> BodyContent
-            BodyContent -> VChar VChars
-            BodyContent -> VChar
-            BodyContent -> ""
-            
-            IPAddress -> IPv4Address | IPv6Address
-            IPv4Address -> Octet "." Octet "." Octet "." Octet
-            Octet -> Digit Digit Digit
-            Octet -> Digit Digit
-            Octet -> Digit
-            IPv6Address -> "[" IPv6Addr "]"
-            IPv6Addr -> HexDigit HexDigits
-            HexDigit -> Digit | "a" | "b" | "c" | "d" | "e" | "f" | "A" | "B" | "C" | "D" | "E" | "F"
-            HexDigits -> HexDigit HexDigits
-            HexDigits -> HexDigit
-            
-            DomainName -> Label "." DomainName
-            DomainName -> Label
-            Label -> Alpha AlphaNum
-            Label -> Alpha
-            AlphaNum -> Alpha | Digit | "-"
         """
+        Initialize the enhanced CFG grammar rules.
         
-        try:
-            self.grammar = CFG.fromstring(self.grammar_rules)
-            self.parser = ChartParser(self.grammar)
-        except Exception as e:
-            print(f"Error initializing advanced grammar: {e}")
-            self.grammar = None
-            self.parser = None
+        The character-level rules are kept for documentation and display only;
+        validation is performed by the hand-written recursive-descent parser in
+        `_parse_rfc7230`, which mirrors these productions on the token stream.
+        The chart parser used for diagnostics is built from the token-level
+        TOKEN_GRAMMAR_RULES.
+        """
+        cls = type(self)
+        cls._compile_grammar()
+        
+        self.grammar_rules = GRAMMAR_RULES
+        self.grammar = cls._GRAMMAR
+        self.parser = cls._PARSER
+        
+        self.valid_methods = VALID_METHODS
+        self.valid_versions = VALID_VERSIONS
     
     def _init_semantic_rules(self):
         """Initialize semantic validation rules."""
-        self.semantic_rules = {
-            'method_validation': {
-                'safe_methods': {'GET', 'HEAD', 'OPTIONS', 'TRACE'},
-                'idempotent_methods': {'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'},
-                'cacheable_methods': {'GET', 'HEAD', 'POST'},
-            },
-            'uri_validation': {
-                'max_length': 8000,  # RFC 7230 recommendation
-                'allowed_schemes': {'http', 'https', 'ftp', 'file'},
-                'reserved_chars': ':/?#[]@',
-                'unreserved_chars': 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~'
-            },
-            'header_validation': {
-                'required_headers': {
-                    'GET': [],
-                    'POST': ['Content-Type', 'Content-Length'],
-                    'PUT': ['Content-Type', 'Content-Length'],
-                    'DELETE': []
-                },
-                'forbidden_headers': {
-                    'TRACE': ['Content-Length', 'Transfer-Encoding']
-                }
-            }
-        }
+        self.semantic_rules = _SEMANTIC_RULES
     
-    def validate_request(self, request_text: str) -> Dict[str, Any]:
+    def validate_request(self, request_text: str, full_diagnostics: bool = False) -> Dict[str, Any]:
         """
         Validate a complete HTTP request using advanced CFG parsing.
         
+        Inputs that do not start with a known method are rejected before
+        lexing. Well-formed requests are parsed by `_parse_rfc7230` only; the
+        chart parser is consulted for rejected requests when requested.
+        
         Args:
             request_text (str): Complete HTTP request text
+            full_diagnostics (bool): Run the chart parser on syntax errors
             
         Returns:
             Dict[str, Any]: Comprehensive validation result
@@ -426,40 +569,45 @@ class AdvancedHTTPRequestCFGParser:
             'grammar_rules': self.get_enhanced_grammar_rules(),
             'lexical_analysis': {},
             'network_analysis': {},
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         }
         
+        # Fast path: reject anything that cannot be an HTTP request line
+        if not self._REQUEST_PREFIX_RE.match(request_text):
+            result['errors'].append("Request must start with an HTTP method followed by a space")
+            return result
+        
         try:
             # Step 1: Lexical Analysis using FSA
-            tokens = self.lexical_analyzer.tokenize(request_text)
-            result['tokens'] = tokens
-            result['lexical_analysis'] = self._analyze_lexical_structure(tokens)
+            # A fresh analyzer per call keeps concurrent validations independent
+            lexer = LexicalAnalyzer()
+            lexer.scan(request_text)
+            index = self._index_tokens(lexer)
+            result['tokens'] = lexer.to_dicts()
+            result['lexical_analysis'] = self._analyze_lexical_structure(lexer, index)
             
             # Check for lexical errors
-            lexical_errors = [token for token in tokens if token['type'] == 'INVALID']
-            if lexical_errors:
-                result['errors'].extend([f"Lexical error: {token['error']}" for token in lexical_errors])
+            if index['type_counts']['INVALID']:
+                result['errors'].extend([f"Lexical error: {message}" for message in lexer.errors.values()])
                 return result
             
-            # Step 2: Syntactic Analysis using CFG
-            simplified_tokens = [token['value'] for token in tokens if token['type'] != 'CRLF']
-            
-            if self.parser:
-                try:
-                    parse_trees = list(self.parser.parse(simplified_tokens))
-                    if parse_trees:
-                        result['is_valid'] = True
-                        result['parse_trees'] = [self._tree_to_dict(tree) for tree in parse_trees]
-                    else:
-                        result['errors'].extend(self._analyze_parsing_errors(simplified_tokens))
-                except Exception as e:
-                    result['errors'].append(f"Parsing error: {str(e)}")
+            # Step 2: Syntactic Analysis using recursive descent over the CFG
+            parse_tree, syntax_errors = self._parse_rfc7230(lexer.types, lexer.values)
+            if parse_tree:
+                result['is_valid'] = True
+                result['parse_trees'] = [parse_tree]
+            else:
+                result['errors'].extend(syntax_errors)
+                if full_diagnostics and self.parser:
+                    chart_trees, chart_errors = self._chart_parse(lexer.types, lexer.values)
+                    result['parse_trees'] = chart_trees
+                    result['errors'].extend(chart_errors)
             
             # Step 3: Semantic Analysis
-            result['semantic_analysis'] = self._perform_semantic_analysis(tokens)
+            result['semantic_analysis'] = self._perform_semantic_analysis(index)
             
             # Step 4: Network Protocol Analysis
-            result['network_analysis'] = self._perform_network_analysis(tokens)
+            result['network_analysis'] = self._perform_network_analysis(index)
             
             # Check for semantic warnings
             if result['semantic_analysis'].get('warnings'):
@@ -470,19 +618,173 @@ class AdvancedHTTPRequestCFGParser:
         
         return result
     
-    def _analyze_lexical_structure(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _chart_parse(self, types: List[str], values: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Run the shared token-level chart parser for diagnostics."""
+        terminals = [value if token_type in _VALUE_TERMINAL_TYPES else token_type
+                     for token_type, value in zip(types, values)]
+        
+        try:
+            parse_trees = list(self.parser.parse(terminals))
+        except Exception as e:
+            return [], [f"Parsing error: {str(e)}"]
+        
+        if not parse_trees:
+            return [], self._analyze_parsing_errors(terminals)
+        return [self._tree_to_dict(tree) for tree in parse_trees], []
+    
+    def _parse_rfc7230(self, types: List[str], values: List[str]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Parse the token stream with a recursive-descent parser for RFC 7230.
+        
+        HTTP-message = request-line *(header-field CRLF) CRLF [message-body]
+        
+        Args:
+            types (List[str]): Token types produced by the lexical analyzer
+            values (List[str]): Token values, parallel to `types`
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[str]]: Parse tree (or None) and syntax errors
+        """
+        if not types:
+            return None, ["Empty token sequence"]
+        
+        pos = 0
+        
+        def leaf(label: str, value: str) -> Dict[str, Any]:
+            return {'label': label, 'children': [{'label': value, 'children': []}]}
+        
+        def peek(token_type: str) -> bool:
+            return pos < len(types) and types[pos] == token_type
+        
+        # request-line = method SP request-target SP HTTP-version CRLF
+        if not peek('METHOD'):
+            return None, ["Request line must start with an HTTP method"]
+        method = values[pos]
+        if method not in VALID_METHODS:
+            return None, [f"Unsupported HTTP method '{method}'"]
+        pos += 1
+        
+        if not peek('URI'):
+            return None, ["Incomplete HTTP request. Minimum: METHOD URI VERSION"]
+        uri = values[pos]
+        pos += 1
+        
+        if not peek('HTTP_VERSION'):
+            return None, ["Incomplete HTTP request. Minimum: METHOD URI VERSION"]
+        version = values[pos]
+        if version not in VALID_VERSIONS:
+            return None, [f"Unsupported HTTP version '{version}'"]
+        pos += 1
+        
+        request_line = {
+            'label': 'RequestLine',
+            'children': [
+                leaf('Method', method),
+                leaf('SP', ' '),
+                leaf('RequestTarget', uri),
+                leaf('SP', ' '),
+                leaf('HTTPVersion', version)
+            ]
+        }
+        message = {'label': 'HTTPMessage', 'children': [request_line]}
+        
+        if not peek('CRLF'):
+            if pos < len(types):
+                return None, [f"Expected CRLF after request line, found {types[pos]}"]
+            return message, []
+        request_line['children'].append(leaf('CRLF', '\\n'))
+        pos += 1
+        
+        # *(header-field CRLF)
+        headers = {'label': 'Headers', 'children': []}
+        while peek('HEADER_NAME'):
+            name = values[pos]
+            pos += 1
+            if not peek('COLON'):
+                return None, [f"Expected ':' after header name '{name}'"]
+            pos += 1
+            if not peek('HEADER_VALUE'):
+                return None, [f"Missing value for header '{name}'"]
+            value = values[pos]
+            pos += 1
+            
+            field = {
+                'label': 'HeaderField',
+                'children': [leaf('FieldName', name), leaf('":"', ':'), leaf('FieldValue', value)]
+            }
+            headers['children'].append(field)
+            if peek('CRLF'):
+                field['children'].append(leaf('CRLF', '\\n'))
+                pos += 1
+            elif pos < len(types):
+                return None, [f"Expected CRLF after header '{name}', found {types[pos]}"]
+        
+        if headers['children']:
+            message['children'].append(headers)
+        
+        # CRLF [message-body]
+        if peek('CRLF'):
+            message['children'].append(leaf('CRLF', '\\n'))
+            pos += 1
+            if peek('MESSAGE_BODY'):
+                message['children'].append(leaf('MessageBody', values[pos]))
+                pos += 1
+        
+        if pos < len(types):
+            return None, [f"Unexpected {types[pos]} token '{values[pos]}'"]
+        
+        return message, []
+    
+    def _index_tokens(self, lexer: LexicalAnalyzer) -> Dict[str, Any]:
+        """
+        Collect the components needed by every analysis in a single token pass.
+        
+        Args:
+            lexer (LexicalAnalyzer): Analyzer holding the scanned token columns
+            
+        Returns:
+            Dict[str, Any]: First METHOD/URI/HTTP_VERSION/MESSAGE_BODY value,
+            headers keyed by lowercased name, and per-type token counts
+        """
+        index = {
+            'method': None,
+            'uri': None,
+            'version': None,
+            'body': None,
+            'headers': {},
+            'type_counts': Counter()
+        }
+        first_of_type = {'METHOD': 'method', 'URI': 'uri', 'HTTP_VERSION': 'version', 'MESSAGE_BODY': 'body'}
+        type_counts = index['type_counts']
+        headers = index['headers']
+        current_header = None
+        
+        for token_type, value in zip(lexer.types, lexer.values):
+            type_counts[token_type] += 1
+            if token_type == 'HEADER_NAME':
+                current_header = value.lower()
+            elif token_type == 'HEADER_VALUE':
+                if current_header:
+                    headers[current_header] = value
+                    current_header = None
+            elif token_type in first_of_type and index[first_of_type[token_type]] is None:
+                index[first_of_type[token_type]] = value
+        
+        return index
+    
+    def _analyze_lexical_structure(self, lexer: LexicalAnalyzer, index: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the lexical structure of the tokens."""
-        token_types = [token['type'] for token in tokens]
+        type_counts = index['type_counts']
         
         return {
-            'total_tokens': len(tokens),
-            'token_distribution': {token_type: token_types.count(token_type) for token_type in set(token_types)},
-            'has_method': 'METHOD' in token_types,
-            'has_uri': 'URI' in token_types,
-            'has_version': 'HTTP_VERSION' in token_types,
-            'has_headers': 'HEADER_NAME' in token_types,
-            'has_body': 'MESSAGE_BODY' in token_types,
-            'structure_valid': self._check_token_sequence(token_types)
+            'total_tokens': len(lexer.types),
+            'token_distribution': dict(type_counts),
+            'has_method': 'METHOD' in type_counts,
+            'has_uri': 'URI' in type_counts,
+            'has_version': 'HTTP_VERSION' in type_counts,
+            'has_headers': 'HEADER_NAME' in type_counts,
+            'has_body': 'MESSAGE_BODY' in type_counts,
+            'structure_valid': self._check_token_sequence(lexer.types)
         }
     
     def _check_token_sequence(self, token_types: List[str]) -> bool:
@@ -491,12 +793,13 @@ class AdvancedHTTPRequestCFGParser:
         if len(token_types) < 3:
             return False
         
+        leading_types = token_types[:5]
         return (token_types[0] == 'METHOD' and 
-                'URI' in token_types[:5] and 
-                'HTTP_VERSION' in token_types[:5])
+                'URI' in leading_types and 
+                'HTTP_VERSION' in leading_types)
     
-    def _perform_semantic_analysis(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Perform semantic analysis on the parsed tokens."""
+    def _perform_semantic_analysis(self, index: Dict[str, Any]) -> Dict[str, Any]:
+        """Perform semantic analysis on the indexed tokens."""
         analysis = {
             'method_analysis': {},
             'uri_analysis': {},
@@ -505,22 +808,35 @@ class AdvancedHTTPRequestCFGParser:
             'warnings': []
         }
         
-        # Extract key components
-        method_token = next((t for t in tokens if t['type'] == 'METHOD'), None)
-        uri_token = next((t for t in tokens if t['type'] == 'URI'), None)
-        header_tokens = [(t for t in tokens if t['type'] == 'HEADER_NAME')]
+        method = index['method']
+        uri = index['uri']
+        headers = index['headers']
         
-        if method_token:
-            method = method_token['value']
+        if method:
             analysis['method_analysis'] = {
                 'method': method,
-                'is_safe': method in self.semantic_rules['method_validation']['safe_methods'],
-                'is_idempotent': method in self.semantic_rules['method_validation']['idempotent_methods'],
-                'is_cacheable': method in self.semantic_rules['method_validation']['cacheable_methods']
+                'is_safe': method in _SAFE_METHODS,
+                'is_idempotent': method in _IDEMPOTENT_METHODS,
+                'is_cacheable': method in _CACHEABLE_METHODS
+            }
+            
+            header_rules = _SEMANTIC_RULES['header_validation']
+            missing = [name for name in header_rules['required_headers'].get(method, ())
+                       if name.lower() not in headers]
+            forbidden = [name for name in header_rules['forbidden_headers'].get(method, ())
+                         if name.lower() in headers]
+            analysis['header_analysis'] = {
+                'header_count': len(headers),
+                'has_host': 'host' in headers,
+                'missing_required': missing,
+                'forbidden_present': forbidden
             }
+            for name in missing:
+                analysis['warnings'].append(f"{method} request is missing required header: {name}")
+            for name in forbidden:
+                analysis['warnings'].append(f"{method} request must not include header: {name}")
         
-        if uri_token:
-            uri = uri_token['value']
+        if uri:
             analysis['uri_analysis'] = {
                 'uri': uri,
                 'length': len(uri),
@@ -530,29 +846,27 @@ class AdvancedHTTPRequestCFGParser:
                 'path_segments': uri.split('/')[1:] if uri.startswith('/') else []
             }
             
-            if len(uri) > self.semantic_rules['uri_validation']['max_length']:
+            if len(uri) > _URI_MAX_LENGTH:
                 analysis['warnings'].append(f"URI length ({len(uri)}) exceeds recommended maximum")
         
         return analysis
     
-    def _perform_network_analysis(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _perform_network_analysis(self, index: Dict[str, Any]) -> Dict[str, Any]:
         """Perform network protocol analysis."""
         return {
-            'http_version_analysis': self._analyze_http_version(tokens),
-            'connection_analysis': self._analyze_connection_headers(tokens),
-            'cache_analysis': self._analyze_cache_headers(tokens),
-            'content_analysis': self._analyze_content_headers(tokens)
+            'http_version_analysis': self._analyze_http_version(index),
+            'connection_analysis': self._analyze_connection_headers(index),
+            'cache_analysis': self._analyze_cache_headers(index),
+            'content_analysis': self._analyze_content_headers(index)
         }
     
-    def _analyze_http_version(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_http_version(self, index: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze HTTP version implications."""
-        version_token = next((t for t in tokens if t['type'] == 'HTTP_VERSION'), None)
+        version = index['version']
         
-        if not version_token:
+        if not version:
             return {'error': 'No HTTP version found'}
         
-        version = version_token['value']
-        
         return {
             'version': version,
             'supports_persistent_connections': version in ['HTTP/1.1', 'HTTP/2.0', 'HTTP/3.0'],
@@ -562,20 +876,10 @@ class AdvancedHTTPRequestCFGParser:
             'default_connection': 'keep-alive' if version == 'HTTP/1.1' else 'close'
         }
     
-    def _analyze_connection_headers(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_connection_headers(self, index: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze connection-related headers."""
         header_analysis = {}
-        
-        # Extract header name-value pairs
-        headers = {}
-        current_header = None
-        
-        for token in tokens:
-            if token['type'] == 'HEADER_NAME':
-                current_header = token['value'].lower()
-            elif token['type'] == 'HEADER_VALUE' and current_header:
-                headers[current_header] = token['value']
-                current_header = None
+        headers = index['headers']
         
         # Analyze connection headers
         connection_value = headers.get('connection', '').lower()
@@ -589,25 +893,49 @@ class AdvancedHTTPRequestCFGParser:
         
         return header_analysis
     
-    def _analyze_cache_headers(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_cache_headers(self, index: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze cache-related headers."""
-        # Implementation for cache header analysis
-        return {'cache_control': 'not_implemented'}
+        headers = index['headers']
+        cache_control = headers.get('cache-control', '').lower()
+        directives = [d.strip() for d in cache_control.split(',') if d.strip()]
+        
+        return {
+            'cache_control': cache_control or None,
+            'directives': directives,
+            'no_cache': 'no-cache' in directives or headers.get('pragma', '').lower() == 'no-cache',
+            'no_store': 'no-store' in directives,
+            'conditional': 'if-modified-since' in headers or 'if-none-match' in headers
+        }
     
-    def _analyze_content_headers(self, tokens: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_content_headers(self, index: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze content-related headers."""
-        # Implementation for content header analysis
-        return {'content_type': 'not_implemented'}
+        headers = index['headers']
+        content_length = headers.get('content-length')
+        body = index['body'] or ''
+        
+        return {
+            'content_type': headers.get('content-type'),
+            'content_length': content_length,
+            'transfer_encoding': headers.get('transfer-encoding'),
+            'has_body': bool(body),
+            'length_matches_body': (content_length.strip() == str(len(body.encode('utf-8')))
+                                    if content_length is not None else None)
+        }
     
     def _tree_to_dict(self, tree) -> Dict[str, Any]:
-        """Convert NLTK Tree to dictionary format."""
-        if hasattr(tree, 'label'):
-            return {
-                'label': str(tree.label()),
-                'children': [self._tree_to_dict(child) for child in tree]
-            }
-        else:
-            return {'label': str(tree), 'children': []}
+        """Convert NLTK Tree to dictionary format without recursing per level."""
+        root: List[Dict[str, Any]] = []
+        stack = [(tree, root)]
+        while stack:
+            node, siblings = stack.pop()
+            if hasattr(node, 'label'):
+                children: List[Dict[str, Any]] = []
+                siblings.append({'label': str(node.label()), 'children': children})
+                # Reversed so the leftmost child is popped (and appended) first
+                stack.extend((child, children) for child in reversed(node))
+            else:
+                siblings.append({'label': str(node), 'children': []})
+        return root[0]
     
     def _analyze_parsing_errors(self, tokens: List[str]) -> List[str]:
         """Analyze parsing errors and provide meaningful feedback."""
@@ -626,65 +954,26 @@ class AdvancedHTTPRequestCFGParser:
         
         return errors
     
-    def get_enhanced_grammar_rules(self) -> List[Dict[str, str]]:
-        """Get the enhanced grammar rules in structured format."""
-        return [
-            {
-                'lhs': 'HTTPMessage',
-                'rhs': 'RequestLine Headers MessageBody',
-                'rule': 'HTTPMessage → RequestLine Headers MessageBody',
-                'description': 'Complete HTTP message with headers and body'
-            },
-            {
-                'lhs': 'RequestLine',
-                'rhs': 'Method SP RequestTarget SP HTTPVersion CRLF',
-                'rule': 'RequestLine → Method SP RequestTarget SP HTTPVersion CRLF',
-                'description': 'HTTP request line structure (RFC 7230)'
-            },
-            {
-                'lhs': 'Method',
-                'rhs': 'GET | POST | PUT | DELETE | HEAD | OPTIONS | PATCH | TRACE | CONNECT',
-                'rule': 'Method → GET | POST | PUT | DELETE | HEAD | OPTIONS | PATCH | TRACE | CONNECT',
-                'description': 'Supported HTTP methods'
-            },
-            {
-                'lhs': 'RequestTarget',
-                'rhs': 'OriginForm | AbsoluteForm | AuthorityForm | AsteriskForm',
-                'rule': 'RequestTarget → OriginForm | AbsoluteForm | AuthorityForm | AsteriskForm',
-                'description': 'Four forms of request target (RFC 7230)'
-            },
-            {
-                'lhs': 'HTTPVersion',
-                'rhs': 'HTTP/1.0 | HTTP/1.1 | HTTP/2.0 | HTTP/3.0',
-                'rule': 'HTTPVersion → HTTP/1.0 | HTTP/1.1 | HTTP/2.0 | HTTP/3.0',
-                'description': 'Supported HTTP protocol versions'
-            },
-            {
-                'lhs': 'HeaderField',
-                'rhs': 'FieldName ":" OWS FieldValue OWS CRLF',
-                'rule': 'HeaderField → FieldName ":" OWS FieldValue OWS CRLF',
-                'description': 'HTTP header field structure'
-            }
-        ]
+    @classmethod
+    def get_enhanced_grammar_rules(cls) -> Tuple[Dict[str, str], ...]:
+        """Get the enhanced grammar rules in structured format (shared, read-only)."""
+        return ENHANCED_GRAMMAR_RULES
 
-# Initialize NLTK data
-def initialize_nltk():
-    """Download required NLTK data packages."""
-    try:
-        import ssl
-        try:
-            _create_unverified_https_context = ssl._create_unverified_context
-        except AttributeError:
-            pass
-        else:
-            ssl._create_default_https_context = _create_unverified_https_context
-        
-        nltk.download('punkt', quiet=True)
-        nltk.download('averaged_perceptron_tagger', quiet=True)
-        return True
-    except Exception as e:
-        print(f"Warning: Could not download NLTK data: {e}")
-        return False
 
-# Initialize NLTK when module is imported
-initialize_nltk()
\ No newline at end of file
+@lru_cache(maxsize=1024)
+def validate_request_cached(request_text: str) -> MappingProxyType:
+    """
+    Validate a request, reusing the result for repeated identical request text.
+    
+    Intended for benchmark and replay workloads. The cached result is shared
+    between callers, so it is returned as a read-only mapping; copy it with
+    dict() before modifying or serializing it. Its timestamp is that of the
+    first validation.
+    
+    Args:
+        request_text (str): Raw HTTP request text
+        
+    Returns:
+        MappingProxyType: Read-only view of the validation result
+    """
+    return MappingProxyType(AdvancedHTTPRequestCFGParser().validate_request(request_text))
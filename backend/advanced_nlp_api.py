@@ -6,51 +6,140 @@ including summarization, query handling, and document classification.
 """
 
 from flask import Flask, request, jsonify, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 import os
 import json
 import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 import threading
+import hashlib
+import itertools
+from collections import Counter, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-import traceback
-from collections import defaultdict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 # Import our new NLP modules
 from advanced_summarization import AdvancedTextSummarizer, SummarizationMethod, SummarizationType
 from intelligent_query_handler import IntelligentQueryHandler
-from document_classifier import DocumentClassifier, ClassificationMethod
+from document_classifier import DocumentClassifier, ClassificationMethod, DocumentCategory
+from time_utils import iso_now
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson, including numpy scalars."""
+    
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode('utf-8')
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.OPTIONS),
+            mimetype=self.mimetype
+        )
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # Configuration
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'advanced-nlp-secret-key')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max request size
 
-# Enable CORS with specific settings
-CORS(app, 
-     origins=['http://localhost:3000', 'http://127.0.0.1:3000'],
-     supports_credentials=True,
-     allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
-     methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
+# Enable CORS with specific settings for direct cross-origin access (the dev
+# frontend on :3000). Deployments whose reverse proxy serves the API same-origin
+# or adds the CORS headers itself set CORS_AT_EDGE=1 to skip the per-response hook.
+if os.environ.get('CORS_AT_EDGE', '').lower() not in ('1', 'true', 'yes'):
+    CORS(app, 
+         origins=['http://localhost:3000', 'http://127.0.0.1:3000'],
+         supports_credentials=True,
+         allow_headers=['Content-Type', 'Authorization', 'X-Requested-With'],
+         methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'])
+
+# Simple rate limiting using memory store: key -> (tokens, last refill time)
+rate_limit_store: Dict[str, tuple] = {}
+RATE_LIMIT_SWEEP_INTERVAL = 300  # seconds; an idle bucket this old is full again and can be dropped
+_RATE_LIMIT_SHARDS = 32
+_rate_limit_locks = tuple(threading.Lock() for _ in range(_RATE_LIMIT_SHARDS))
+_rate_limit_sweep_lock = threading.Lock()
+_last_rate_limit_sweep = time.monotonic()
 
-# Simple rate limiting using memory store
-rate_limit_store = defaultdict(list)
+def _sweep_rate_limit_store(now: float) -> None:
+    """Drop buckets that have not seen a request within the sweep interval."""
+    global _last_rate_limit_sweep
+    if not _rate_limit_sweep_lock.acquire(blocking=False):
+        return
+    try:
+        _last_rate_limit_sweep = now
+        for key, (_, last) in list(rate_limit_store.items()):
+            if now - last >= RATE_LIMIT_SWEEP_INTERVAL:
+                rate_limit_store.pop(key, None)
+    finally:
+        _rate_limit_sweep_lock.release()
+
+# Shared fixed-window counter for multi-process deployments: INCR and EXPIRE in
+# one round trip. Window keys are named by window index, so each starts at zero.
+_RATE_LIMIT_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+def _init_redis_rate_limit():
+    """Register the rate-limit script on a pooled Redis client when REDIS_URL is set."""
+    url = os.environ.get('REDIS_URL')
+    if not url or redis is None:
+        return None
+    pool = redis.ConnectionPool.from_url(url, max_connections=64, socket_keepalive=True)
+    # register_script runs the script with EVALSHA, loading it on first use
+    return redis.Redis(connection_pool=pool).register_script(_RATE_LIMIT_LUA)
+
+redis_rate_limit = _init_redis_rate_limit()
 
 def check_rate_limit(key: str, limit: int, window: int = 60) -> bool:
-    """Simple rate limiting implementation."""
-    now = time.time()
-    # Clean old entries
-    rate_limit_store[key] = [t for t in rate_limit_store[key] if now - t < window]
+    """
+    Rate limit `key` to `limit` requests per `window` seconds.
     
-    if len(rate_limit_store[key]) >= limit:
-        return False
+    Uses the shared Redis counter when configured, otherwise (or if Redis is
+    unreachable) an in-process token bucket with O(1) work per key.
+    """
+    if redis_rate_limit is not None:
+        window_key = f"ratelimit:{key}:{int(time.time() // window)}"
+        try:
+            return redis_rate_limit(keys=[window_key], args=[window]) <= limit
+        except redis.RedisError as e:
+            print(f"Error checking Redis rate limit, using in-process limit: {e}")
+    
+    now = time.monotonic()
+    if now - _last_rate_limit_sweep >= RATE_LIMIT_SWEEP_INTERVAL:
+        _sweep_rate_limit_store(now)
     
-    rate_limit_store[key].append(now)
-    return True
+    with _rate_limit_locks[hash(key) % _RATE_LIMIT_SHARDS]:
+        tokens, last = rate_limit_store.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - last) * limit / window)
+        
+        if tokens < 1:
+            rate_limit_store[key] = (tokens, now)
+            return False
+        
+        rate_limit_store[key] = (tokens - 1, now)
+        return True
 
 def rate_limit(limit_per_minute: int = 10):
     """Decorator for rate limiting."""
@@ -71,25 +160,193 @@ def rate_limit(limit_per_minute: int = 10):
         return wrapper
     return decorator
 
-# Initialize NLP modules
+# Enum members by value, so request parameters are validated with a dict lookup
+_SUMMARIZATION_METHODS = {method.value: method for method in SummarizationMethod}
+_SUMMARIZATION_TYPES = {stype.value: stype for stype in SummarizationType}
+_CLASSIFICATION_METHODS = {method.value: method for method in ClassificationMethod}
+SUMMARIZATION_METHOD_VALUES = list(_SUMMARIZATION_METHODS)
+SUMMARIZATION_TYPE_VALUES = list(_SUMMARIZATION_TYPES)
+CLASSIFICATION_METHOD_VALUES = list(_CLASSIFICATION_METHODS)
+DOCUMENT_CATEGORY_VALUES = [category.value for category in DocumentCategory]
+
+# Descriptions of the categories a document can be assigned to
+CATEGORY_DESCRIPTIONS = {
+    DocumentCategory.TECHNICAL_DOCUMENTATION.value: 'Technical specifications and documentation',
+    DocumentCategory.RESEARCH_PAPER.value: 'Academic research papers and studies',
+    DocumentCategory.TUTORIAL.value: 'Step-by-step tutorials and guides',
+    DocumentCategory.API_DOCUMENTATION.value: 'API reference and documentation',
+    DocumentCategory.SPECIFICATION.value: 'Technical specifications and standards',
+    DocumentCategory.USER_GUIDE.value: 'User manuals and guides',
+    DocumentCategory.FAQ.value: 'Frequently asked questions',
+    DocumentCategory.BLOG_POST.value: 'Blog articles and posts'
+}
+
+def _enum_member(members: Dict[str, Any], value: Any) -> Optional[Any]:
+    """Return the enum member for `value`, or None if it is not a known value."""
+    return members.get(value) if isinstance(value, str) else None
+
+# Initialize NLP modules. After construction they only hold read-only resources
+# (stop word sets, lemmatizers, compiled patterns), so one instance of each is
+# shared by all request threads rather than pooled.
 text_summarizer = AdvancedTextSummarizer()
 query_handler = IntelligentQueryHandler()
 document_classifier = DocumentClassifier()
 
+def _warm_up_nlp_modules() -> None:
+    """Load NLTK's lazily initialised WordNet corpus before request threads share it."""
+    try:
+        text_summarizer.lemmatizer.lemmatize('warmup')
+    except LookupError as e:
+        print(f"Warning: could not preload WordNet: {e}")
+
+_warm_up_nlp_modules()
+
+class ResponseCache:
+    """Thread-safe LRU cache with a time-to-live for serialized endpoint responses."""
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Fingerprint the request inputs that determine a response."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond maxsize."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# The NLP pipelines are deterministic in their inputs, so repeated requests are
+# answered from here. Cached responses keep their original timestamps.
+response_cache = ResponseCache()
+
 # Thread pool for async processing
-executor = ThreadPoolExecutor(max_workers=4)
+executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+
+# Futures for jobs submitted with "async": true, kept for ten minutes
+job_store = ResponseCache(maxsize=1000, ttl=600)
+
+def submit_job(func, *args):
+    """Run an endpoint's work on the executor and answer 202 with a job id to poll."""
+    job_id = uuid.uuid4().hex
+    job_store.set(job_id, executor.submit(func, *args))
+    return jsonify({
+        'job_id': job_id,
+        'status': 'pending',
+        'status_url': f'/api/v2/jobs/{job_id}'
+    }), 202
 
 # Request tracking
-active_requests = {}
 request_stats = {
-    'total_requests': 0,
-    'successful_requests': 0,
-    'failed_requests': 0,
-    'avg_response_time': 0.0,
-    'endpoints_usage': {},
     'start_time': datetime.now()
 }
 
+# Per-request counters are sharded so request threads rarely contend on a lock;
+# each thread is pinned round-robin to one shard and /stats merges them on demand.
+_STATS_SHARDS = 16
+_stats_shards = tuple(
+    {
+        'lock': threading.Lock(),
+        'total_requests': 0,
+        'successful_requests': 0,
+        'failed_requests': 0,
+        'response_time_total': 0.0,
+        'endpoints_usage': Counter()
+    }
+    for _ in range(_STATS_SHARDS)
+)
+_stats_local = threading.local()
+_stats_shard_counter = itertools.count()
+
+# Request IDs only need to be unique within this process for log correlation
+_request_counter = itertools.count(1)
+_pid = os.getpid()
+
+def _reset_request_ids() -> None:
+    """Give a forked worker its own pid and counter, so preloaded workers never share IDs."""
+    global _request_counter, _pid
+    _request_counter = itertools.count(1)
+    _pid = os.getpid()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+def _stats_shard() -> Dict[str, Any]:
+    """Return the statistics shard assigned to the current thread."""
+    shard = getattr(_stats_local, 'shard', None)
+    if shard is None:
+        shard = _stats_local.shard = _stats_shards[next(_stats_shard_counter) % _STATS_SHARDS]
+    return shard
+
+def collect_request_stats() -> Dict[str, Any]:
+    """Merge the statistics shards into a single snapshot."""
+    totals = {
+        'total_requests': 0,
+        'successful_requests': 0,
+        'failed_requests': 0,
+        'response_time_total': 0.0,
+        'endpoints_usage': Counter()
+    }
+    for shard in _stats_shards:
+        with shard['lock']:
+            totals['total_requests'] += shard['total_requests']
+            totals['successful_requests'] += shard['successful_requests']
+            totals['failed_requests'] += shard['failed_requests']
+            totals['response_time_total'] += shard['response_time_total']
+            totals['endpoints_usage'].update(shard['endpoints_usage'])
+    
+    completed = totals['successful_requests'] + totals['failed_requests']
+    totals['avg_response_time'] = totals['response_time_total'] / completed if completed else 0.0
+    totals['endpoints_usage'] = dict(totals['endpoints_usage'])
+    return totals
+
+class RequestGuard:
+    """Counts a request as active from __enter__ until __exit__."""
+    _lock = threading.Lock()
+    _active = 0
+    
+    def __enter__(self):
+        with RequestGuard._lock:
+            RequestGuard._active += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        with RequestGuard._lock:
+            RequestGuard._active -= 1
+        return False
+    
+    @classmethod
+    def active_count(cls) -> int:
+        """Number of requests currently in flight."""
+        return cls._active
+
+# Endpoints left out of the request statistics
+_UNTRACKED_ENDPOINTS = frozenset({'get_job'})
+
 class APIError(Exception):
     """Custom API error class."""
     def __init__(self, message: str, status_code: int = 400, payload: Optional[Dict] = None):
@@ -102,19 +359,19 @@ class APIError(Exception):
 def before_request():
     """Execute before each request."""
     g.start_time = time.time()
-    g.request_id = str(uuid.uuid4())
+    g.request_id = f"{next(_request_counter):016x}-{_pid:x}"
     
-    # Track request
-    request_stats['total_requests'] += 1
+    # Track request; clients poll async jobs repeatedly, so polls are not counted
     endpoint = request.endpoint or 'unknown'
-    request_stats['endpoints_usage'][endpoint] = request_stats['endpoints_usage'].get(endpoint, 0) + 1
+    g.track_stats = endpoint not in _UNTRACKED_ENDPOINTS
+    if g.track_stats:
+        shard = _stats_shard()
+        with shard['lock']:
+            shard['total_requests'] += 1
+            shard['endpoints_usage'][endpoint] += 1
     
-    # Add to active requests
-    active_requests[g.request_id] = {
-        'endpoint': endpoint,
-        'start_time': g.start_time,
-        'remote_addr': request.remote_addr
-    }
+    # Released in teardown_request, which runs even if the request errors out
+    g.request_guard = RequestGuard().__enter__()
 
 @app.after_request
 def after_request(response):
@@ -122,19 +379,15 @@ def after_request(response):
     # Calculate response time
     response_time = time.time() - g.start_time
     
-    # Update statistics
-    if response.status_code < 400:
-        request_stats['successful_requests'] += 1
-    else:
-        request_stats['failed_requests'] += 1
-    
-    # Update average response time
-    total_requests = request_stats['total_requests']
-    current_avg = request_stats['avg_response_time']
-    request_stats['avg_response_time'] = (current_avg * (total_requests - 1) + response_time) / total_requests
-    
-    # Remove from active requests
-    active_requests.pop(g.request_id, None)
+    # Update statistics; the average is derived from the running total in /stats
+    if g.track_stats:
+        shard = _stats_shard()
+        with shard['lock']:
+            if response.status_code < 400:
+                shard['successful_requests'] += 1
+            else:
+                shard['failed_requests'] += 1
+            shard['response_time_total'] += response_time
     
     # Add response headers
     response.headers['X-Request-ID'] = g.request_id
@@ -143,6 +396,13 @@ def after_request(response):
     
     return response
 
+@app.teardown_request
+def teardown_request(exc):
+    """Release the active-request guard."""
+    guard = g.pop('request_guard', None)
+    if guard is not None:
+        guard.__exit__(None, None, None)
+
 @app.errorhandler(APIError)
 def handle_api_error(error):
     """Handle custom API errors."""
@@ -150,7 +410,7 @@ def handle_api_error(error):
         'error': error.message,
         'status_code': error.status_code,
         'request_id': getattr(g, 'request_id', 'unknown'),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_now()
     }
     
     if error.payload:
@@ -170,11 +430,20 @@ def handle_large_request(error):
 @app.errorhandler(Exception)
 def handle_general_error(error):
     """Handle general exceptions."""
+    if isinstance(error, HTTPException):
+        # Malformed JSON, unknown routes and the like keep their own status code
+        return jsonify({
+            'error': error.description,
+            'status_code': error.code,
+            'request_id': getattr(g, 'request_id', 'unknown'),
+            'timestamp': iso_now()
+        }), error.code
+    
     return jsonify({
         'error': 'Internal server error occurred',
         'status_code': 500,
         'request_id': getattr(g, 'request_id', 'unknown'),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_now()
     }), 500
 
 def validate_request_data(required_fields: List[str], data: Dict[str, Any]) -> None:
@@ -188,6 +457,17 @@ def validate_request_data(required_fields: List[str], data: Dict[str, Any]) -> N
             payload={'missing_fields': missing_fields}
         )
 
+# Worst-case JSON encoding of one character (a surrogate pair as two \uXXXX
+# escapes), and allowance for the other fields of a request body
+_MAX_JSON_BYTES_PER_CHAR = 12
+_JSON_ENVELOPE_BYTES = 64 * 1024
+
+def check_content_length(max_text_chars: int) -> None:
+    """Reject a body too large to hold valid text input before decoding it."""
+    limit = max_text_chars * _MAX_JSON_BYTES_PER_CHAR + _JSON_ENVELOPE_BYTES
+    if (request.content_length or 0) > limit:
+        raise APIError(f"Request body exceeds maximum size of {limit} bytes", status_code=413)
+
 def validate_text_input(text: str, max_length: int = 50000, min_length: int = 10) -> None:
     """Validate text input parameters."""
     if not isinstance(text, str):
@@ -199,10 +479,54 @@ def validate_text_input(text: str, max_length: int = 50000, min_length: int = 10
     if len(text) > max_length:
         raise APIError(f"Text exceeds maximum length of {max_length} characters", status_code=400)
 
+def _encode_static_json(payload: Dict[str, Any]) -> bytes:
+    """Serialize a constant response body once, at import time."""
+    return app.json.dumps(payload).encode('utf-8')
+
+def _static_json_response(body: bytes):
+    """Build a JSON response from a pre-serialized body."""
+    return app.response_class(body, mimetype=app.json.mimetype)
+
 # ===========================================
 # SUMMARIZATION ENDPOINTS
 # ===========================================
 
+def _summarize(text: str, method: SummarizationMethod, summary_type: SummarizationType,
+               summary_length: int, compression_ratio: Optional[float]) -> Dict[str, Any]:
+    """Summarize text and build the JSON response payload, consulting the response cache."""
+    cache_key = ResponseCache.make_key('summarize', text, method.value, summary_type.value,
+                                       summary_length, compression_ratio)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Perform summarization
+    result = text_summarizer.summarize(
+        text=text,
+        method=method,
+        summary_type=summary_type,
+        summary_length=summary_length,
+        compression_ratio=compression_ratio
+    )
+    
+    # Convert result to JSON-serializable format
+    response_data = {
+        'summary': result.summary,
+        'method': result.method.value,
+        'summary_type': result.summary_type.value,
+        'compression_ratio': result.compression_ratio,
+        'statistics': result.statistics,
+        'key_phrases': result.key_phrases,
+        'processing_time': result.processing_time,
+        'timestamp': result.timestamp,
+        'sentence_count': len(result.sentence_scores),
+        'original_length': len(result.original_text.split()),
+        'summary_length': len(result.summary.split())
+    }
+    response_cache.set(cache_key, response_data)
+    
+    return response_data
+
 @app.route('/api/v2/summarization/summarize', methods=['POST'])
 @rate_limit(10)
 def summarize_text():
@@ -215,10 +539,12 @@ def summarize_text():
         "method": "tf_idf",  // Optional: frequency_based, tf_idf, textrank, lsa, luhn, edmundson
         "summary_type": "extractive",  // Optional: extractive, abstractive, hybrid
         "summary_length": 3,  // Optional: number of sentences
-        "compression_ratio": 0.3  // Optional: alternative to summary_length
+        "compression_ratio": 0.3,  // Optional: alternative to summary_length
+        "async": false  // Optional: return 202 with a job id instead of waiting
     }
     """
     try:
+        check_content_length(50000)
         data = request.get_json()
         validate_request_data(['text'], data)
         
@@ -231,59 +557,89 @@ def summarize_text():
         summary_length = data.get('summary_length', 3)
         compression_ratio = data.get('compression_ratio')
         
-        try:
-            method = SummarizationMethod(method_str)
-            summary_type = SummarizationType(summary_type_str)
-        except ValueError as e:
-            raise APIError(f"Invalid parameter value: {str(e)}", status_code=400)
-        
-        # Perform summarization
-        result = text_summarizer.summarize(
-            text=text,
-            method=method,
-            summary_type=summary_type,
-            summary_length=summary_length,
-            compression_ratio=compression_ratio
-        )
+        method = _enum_member(_SUMMARIZATION_METHODS, method_str)
+        if method is None:
+            raise APIError(f"Invalid parameter value: {method_str!r} is not a valid SummarizationMethod", status_code=400)
+        summary_type = _enum_member(_SUMMARIZATION_TYPES, summary_type_str)
+        if summary_type is None:
+            raise APIError(f"Invalid parameter value: {summary_type_str!r} is not a valid SummarizationType", status_code=400)
         
-        # Convert result to JSON-serializable format
-        response_data = {
-            'summary': result.summary,
-            'method': result.method.value,
-            'summary_type': result.summary_type.value,
-            'compression_ratio': result.compression_ratio,
-            'statistics': result.statistics,
-            'key_phrases': result.key_phrases,
-            'processing_time': result.processing_time,
-            'timestamp': result.timestamp,
-            'sentence_count': len(result.sentence_scores),
-            'original_length': len(result.original_text.split()),
-            'summary_length': len(result.summary.split())
-        }
+        if data.get('async'):
+            return submit_job(_summarize, text, method, summary_type, summary_length, compression_ratio)
         
-        return jsonify(response_data)
+        return jsonify(_summarize(text, method, summary_type, summary_length, compression_ratio))
         
     except APIError:
         raise
-    except Exception as e:
+    except (ValueError, TypeError, LookupError) as e:
         raise APIError(f"Summarization failed: {str(e)}", status_code=500)
 
+_SUMMARIZATION_METHODS_JSON = _encode_static_json({
+    'methods': SUMMARIZATION_METHOD_VALUES,
+    'summary_types': SUMMARIZATION_TYPE_VALUES,
+    'default_method': 'tf_idf',
+    'default_summary_type': 'extractive',
+    'max_text_length': 50000,
+    'min_text_length': 10
+})
+
 @app.route('/api/v2/summarization/methods', methods=['GET'])
 def get_summarization_methods():
     """Get available summarization methods and types."""
-    return jsonify({
-        'methods': [method.value for method in SummarizationMethod],
-        'summary_types': [stype.value for stype in SummarizationType],
-        'default_method': 'tf_idf',
-        'default_summary_type': 'extractive',
-        'max_text_length': 50000,
-        'min_text_length': 10
-    })
+    return _static_json_response(_SUMMARIZATION_METHODS_JSON)
 
 # ===========================================
 # QUERY HANDLING ENDPOINTS
 # ===========================================
 
+def _process_query(query: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Process a query and build the JSON response payload, consulting the response cache."""
+    cache_key = ResponseCache.make_key('query', query, json.dumps(context, sort_keys=True, default=str))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Process query
+    result = query_handler.process_query(query, context)
+    
+    # Convert to JSON-serializable format
+    response_data = {
+        'query_analysis': {
+            'original_query': result.query_analysis.original_query,
+            'cleaned_query': result.query_analysis.cleaned_query,
+            'query_type': result.query_analysis.query_type.value,
+            'intent': {
+                'intent': result.query_analysis.intent.intent.value,
+                'confidence': result.query_analysis.intent.confidence,
+                'reasoning': result.query_analysis.intent.reasoning,
+                'parameters': result.query_analysis.intent.parameters
+            },
+            'entities': [
+                {
+                    'text': entity.text,
+                    'entity_type': entity.entity_type.value,
+                    'confidence': entity.confidence,
+                    'start_pos': entity.start_pos,
+                    'end_pos': entity.end_pos
+                } for entity in result.query_analysis.entities
+            ],
+            'keywords': result.query_analysis.keywords,
+            'sentiment': result.query_analysis.sentiment,
+            'complexity_score': result.query_analysis.complexity_score,
+            'language': result.query_analysis.language
+        },
+        'response_text': result.response_text,
+        'confidence': result.confidence,
+        'sources': result.sources,
+        'suggestions': result.suggestions,
+        'follow_up_questions': result.follow_up_questions,
+        'processing_time': result.processing_time,
+        'metadata': result.metadata
+    }
+    response_cache.set(cache_key, response_data)
+    
+    return response_data
+
 @app.route('/api/v2/query/process', methods=['POST'])
 @rate_limit(20)
 def process_query():
@@ -293,10 +649,12 @@ def process_query():
     Expected JSON payload:
     {
         "query": "What is a context-free grammar?",
-        "context": {}  // Optional context information
+        "context": {},  // Optional context information
+        "async": false  // Optional: return 202 with a job id instead of waiting
     }
     """
     try:
+        check_content_length(1000)
         data = request.get_json()
         validate_request_data(['query'], data)
         
@@ -305,49 +663,14 @@ def process_query():
         
         validate_text_input(query, max_length=1000, min_length=3)
         
-        # Process query
-        result = query_handler.process_query(query, context)
+        if data.get('async'):
+            return submit_job(_process_query, query, context)
         
-        # Convert to JSON-serializable format
-        response_data = {
-            'query_analysis': {
-                'original_query': result.query_analysis.original_query,
-                'cleaned_query': result.query_analysis.cleaned_query,
-                'query_type': result.query_analysis.query_type.value,
-                'intent': {
-                    'intent': result.query_analysis.intent.intent.value,
-                    'confidence': result.query_analysis.intent.confidence,
-                    'reasoning': result.query_analysis.intent.reasoning,
-                    'parameters': result.query_analysis.intent.parameters
-                },
-                'entities': [
-                    {
-                        'text': entity.text,
-                        'entity_type': entity.entity_type.value,
-                        'confidence': entity.confidence,
-                        'start_pos': entity.start_pos,
-                        'end_pos': entity.end_pos
-                    } for entity in result.query_analysis.entities
-                ],
-                'keywords': result.query_analysis.keywords,
-                'sentiment': result.query_analysis.sentiment,
-                'complexity_score': result.query_analysis.complexity_score,
-                'language': result.query_analysis.language
-            },
-            'response_text': result.response_text,
-            'confidence': result.confidence,
-            'sources': result.sources,
-            'suggestions': result.suggestions,
-            'follow_up_questions': result.follow_up_questions,
-            'processing_time': result.processing_time,
-            'metadata': result.metadata
-        }
-        
-        return jsonify(response_data)
+        return jsonify(_process_query(query, context))
         
     except APIError:
         raise
-    except Exception as e:
+    except (ValueError, TypeError, LookupError) as e:
         raise APIError(f"Query processing failed: {str(e)}", status_code=500)
 
 @app.route('/api/v2/query/analyze', methods=['POST'])
@@ -355,6 +678,7 @@ def process_query():
 def analyze_query():
     """Analyze query without generating response (faster analysis)."""
     try:
+        check_content_length(1000)
         data = request.get_json()
         validate_request_data(['query'], data)
         
@@ -385,13 +709,38 @@ def analyze_query():
         
     except APIError:
         raise
-    except Exception as e:
+    except (ValueError, TypeError, LookupError) as e:
         raise APIError(f"Query analysis failed: {str(e)}", status_code=500)
 
 # ===========================================
 # DOCUMENT CLASSIFICATION ENDPOINTS
 # ===========================================
 
+def _classify(text: str, method: ClassificationMethod) -> Dict[str, Any]:
+    """Classify a document and build the JSON response payload, consulting the response cache."""
+    cache_key = ResponseCache.make_key('classify', text, method.value)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Classify document
+    result = document_classifier.classify(text, method)
+    
+    response_data = {
+        'predicted_category': result.predicted_category.value,
+        'confidence': result.confidence,
+        'probability_distribution': {
+            category.value: prob for category, prob in result.probability_distribution.items()
+        },
+        'method_used': result.method_used.value,
+        'reasoning': result.reasoning,
+        'processing_time': result.processing_time,
+        'timestamp': result.timestamp
+    }
+    response_cache.set(cache_key, response_data)
+    
+    return response_data
+
 @app.route('/api/v2/classification/classify', methods=['POST'])
 @rate_limit(15)
 def classify_document():
@@ -401,10 +750,12 @@ def classify_document():
     Expected JSON payload:
     {
         "text": "Document text to classify",
-        "method": "rule_based"  // Optional: rule_based, naive_bayes, ensemble
+        "method": "rule_based",  // Optional: rule_based, naive_bayes, ensemble
+        "async": false  // Optional: return 202 with a job id instead of waiting
     }
     """
     try:
+        check_content_length(50000)
         data = request.get_json()
         validate_request_data(['text'], data)
         
@@ -413,58 +764,88 @@ def classify_document():
         
         method_str = data.get('method', 'rule_based')
         
-        try:
-            method = ClassificationMethod(method_str)
-        except ValueError:
+        method = _enum_member(_CLASSIFICATION_METHODS, method_str)
+        if method is None:
             raise APIError(f"Invalid classification method: {method_str}", status_code=400)
         
-        # Classify document
-        result = document_classifier.classify(text, method)
+        if data.get('async'):
+            return submit_job(_classify, text, method)
         
-        response_data = {
-            'predicted_category': result.predicted_category.value,
-            'confidence': result.confidence,
-            'probability_distribution': {
-                category.value: prob for category, prob in result.probability_distribution.items()
-            },
-            'method_used': result.method_used.value,
-            'reasoning': result.reasoning,
-            'processing_time': result.processing_time,
-            'timestamp': result.timestamp
-        }
-        
-        return jsonify(response_data)
+        return jsonify(_classify(text, method))
         
     except APIError:
         raise
-    except Exception as e:
+    except (ValueError, TypeError, LookupError) as e:
         raise APIError(f"Document classification failed: {str(e)}", status_code=500)
 
+_CLASSIFICATION_CATEGORIES_JSON = _encode_static_json({
+    'categories': DOCUMENT_CATEGORY_VALUES,
+    'methods': CLASSIFICATION_METHOD_VALUES,
+    'default_method': 'rule_based',
+    'category_descriptions': CATEGORY_DESCRIPTIONS
+})
+
 @app.route('/api/v2/classification/categories', methods=['GET'])
 def get_classification_categories():
     """Get available document categories and classification methods."""
-    from document_classifier import DocumentCategory
-    
-    return jsonify({
-        'categories': [category.value for category in DocumentCategory],
-        'methods': [method.value for method in ClassificationMethod],
-        'default_method': 'rule_based',
-        'category_descriptions': {
-            'technical_documentation': 'Technical specifications and documentation',
-            'research_paper': 'Academic research papers and studies',
-            'tutorial': 'Step-by-step tutorials and guides',
-            'api_documentation': 'API reference and documentation',
-            'specification': 'Technical specifications and standards',
-            'user_guide': 'User manuals and guides',
-            'faq': 'Frequently asked questions',
-            'blog_post': 'Blog articles and posts'
-        }
-    })
+    return _static_json_response(_CLASSIFICATION_CATEGORIES_JSON)
 
 # ===========================================
 # BATCH PROCESSING ENDPOINTS
 # ===========================================
 
+def _run_batch_operation(text: str, operation: str, options: Dict[str, Any],
+                         words: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run one batch operation on a document and return its entries for the document's results."""
+    try:
+        if operation == 'summarize':
+            sum_options = options.get('summarization', {})
+            method = SummarizationMethod(sum_options.get('method', 'tf_idf'))
+            summary_length = sum_options.get('summary_length', 3)
+            
+            result = text_summarizer.summarize(text, method=method, summary_length=summary_length, words=words)
+            return {'summarization': {
+                'summary': result.summary,
+                'compression_ratio': result.compression_ratio,
+                'method': result.method.value
+            }}
+        
+        elif operation == 'classify':
+            class_options = options.get('classification', {})
+            method = ClassificationMethod(class_options.get('method', 'rule_based'))
+            
+            result = document_classifier.classify(text, method, words=words)
+            return {'classification': {
+                'category': result.predicted_category.value,
+                'confidence': result.confidence,
+                'method': result.method_used.value
+            }}
+        
+        elif operation == 'query_analysis':
+            analysis = query_handler.analyze_query(text)
+            return {'query_analysis': {
+                'query_type': analysis.query_type.value,
+                'intent': analysis.intent.intent.value,
+                'keywords': analysis.keywords[:5]
+            }}
+        
+    except Exception as e:
+        return {operation: {'error': str(e)}}
+    
+    return {}
+
+def _run_batch_document(text: str, operations: List[str], options: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Run every requested operation on one distinct text, keyed by operation."""
+    words = None
+    if 'summarize' in operations and 'classify' in operations:
+        # Both tokenize the text into the same content words; do it once
+        try:
+            words = text_summarizer.content_words(text)
+        except LookupError:
+            words = None
+    
+    return {operation: _run_batch_operation(text, operation, options, words) for operation in operations}
+
 @app.route('/api/v2/batch/process', methods=['POST'])
 @rate_limit(5)
 def batch_process():
@@ -484,6 +865,7 @@ def batch_process():
     }
     """
     try:
+        check_content_length(10 * 50000)
         data = request.get_json()
         validate_request_data(['documents'], data)
         
@@ -496,70 +878,74 @@ def batch_process():
         if len(documents) > 10:
             raise APIError("Maximum 10 documents allowed per batch", status_code=400)
         
-        results = []
-        
         for doc in documents:
             if not isinstance(doc, dict) or 'text' not in doc or 'operations' not in doc:
                 raise APIError("Each document must have 'text' and 'operations' fields", status_code=400)
-            
-            doc_id = doc.get('id', str(uuid.uuid4()))
-            text = doc['text']
-            operations = doc['operations']
-            
-            validate_text_input(text)
-            
-            doc_result = {'id': doc_id, 'results': {}}
-            
-            # Process each operation
-            for operation in operations:
-                try:
-                    if operation == 'summarize':
-                        sum_options = options.get('summarization', {})
-                        method = SummarizationMethod(sum_options.get('method', 'tf_idf'))
-                        summary_length = sum_options.get('summary_length', 3)
-                        
-                        result = text_summarizer.summarize(text, method=method, summary_length=summary_length)
-                        doc_result['results']['summarization'] = {
-                            'summary': result.summary,
-                            'compression_ratio': result.compression_ratio,
-                            'method': result.method.value
-                        }
-                    
-                    elif operation == 'classify':
-                        class_options = options.get('classification', {})
-                        method = ClassificationMethod(class_options.get('method', 'rule_based'))
-                        
-                        result = document_classifier.classify(text, method)
-                        doc_result['results']['classification'] = {
-                            'category': result.predicted_category.value,
-                            'confidence': result.confidence,
-                            'method': result.method_used.value
-                        }
-                    
-                    elif operation == 'query_analysis':
-                        analysis = query_handler.analyze_query(text)
-                        doc_result['results']['query_analysis'] = {
-                            'query_type': analysis.query_type.value,
-                            'intent': analysis.intent.intent.value,
-                            'keywords': analysis.keywords[:5]
-                        }
-                    
-                except Exception as e:
-                    doc_result['results'][operation] = {'error': str(e)}
-            
+            validate_text_input(doc['text'])
+        
+        # Submit one task per distinct text covering every operation requested
+        # for it, then assemble the results in document order
+        operations_by_text: Dict[str, List[str]] = {}
+        for doc in documents:
+            text_operations = operations_by_text.setdefault(doc['text'], [])
+            for operation in doc['operations']:
+                if operation not in text_operations:
+                    text_operations.append(operation)
+        
+        futures = {
+            text: executor.submit(_run_batch_document, text, text_operations, options)
+            for text, text_operations in operations_by_text.items()
+        }
+        
+        results = []
+        for doc in documents:
+            text_results = futures[doc['text']].result()
+            doc_result = {'id': doc.get('id', str(uuid.uuid4())), 'results': {}}
+            for operation in doc['operations']:
+                doc_result['results'].update(text_results[operation])
             results.append(doc_result)
         
         return jsonify({
             'batch_results': results,
             'total_documents': len(documents),
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_now()
         })
         
     except APIError:
         raise
-    except Exception as e:
+    except (ValueError, TypeError, LookupError) as e:
         raise APIError(f"Batch processing failed: {str(e)}", status_code=500)
 
+# ===========================================
+# JOB ENDPOINTS
+# ===========================================
+
+@app.route('/api/v2/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status, and once finished the result, of an async job."""
+    future = job_store.get(job_id)
+    if future is None:
+        raise APIError(f"Unknown or expired job: {job_id}", status_code=404)
+    
+    if not future.done():
+        return jsonify({'job_id': job_id, 'status': 'pending'}), 202
+    
+    # A failed job answers like the synchronous endpoint would have
+    error = future.exception()
+    if error is not None:
+        status_code = error.status_code if isinstance(error, APIError) else 500
+        message = error.message if isinstance(error, APIError) else str(error)
+        return jsonify({
+            'job_id': job_id,
+            'status': 'failed',
+            'error': message,
+            'status_code': status_code,
+            'request_id': g.request_id,
+            'timestamp': iso_now()
+        }), status_code
+    
+    return jsonify({'job_id': job_id, 'status': 'completed', 'result': future.result()})
+
 # ===========================================
 # SYSTEM ENDPOINTS
 # ===========================================
@@ -576,24 +962,25 @@ def health_check():
             'document_classification': 'active'
         },
         'uptime': str(datetime.now() - request_stats['start_time']),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_now()
     })
 
 @app.route('/api/v2/stats', methods=['GET'])
 def get_stats():
     """Get API usage statistics."""
     uptime = datetime.now() - request_stats['start_time']
+    stats = collect_request_stats()
     
     return jsonify({
         'statistics': {
             'uptime_seconds': uptime.total_seconds(),
-            'total_requests': request_stats['total_requests'],
-            'successful_requests': request_stats['successful_requests'],
-            'failed_requests': request_stats['failed_requests'],
-            'success_rate': request_stats['successful_requests'] / max(request_stats['total_requests'], 1) * 100,
-            'average_response_time': request_stats['avg_response_time'],
-            'active_requests': len(active_requests),
-            'endpoints_usage': request_stats['endpoints_usage']
+            'total_requests': stats['total_requests'],
+            'successful_requests': stats['successful_requests'],
+            'failed_requests': stats['failed_requests'],
+            'success_rate': stats['successful_requests'] / max(stats['total_requests'], 1) * 100,
+            'average_response_time': stats['avg_response_time'],
+            'active_requests': RequestGuard.active_count(),
+            'endpoints_usage': stats['endpoints_usage']
         },
         'limits': {
             'max_text_length': 50000,
@@ -605,43 +992,47 @@ def get_stats():
                 'batch_processing': '5 per minute'
             }
         },
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_now()
     })
 
+_CAPABILITIES_JSON = _encode_static_json({
+    'version': '2.0',
+    'capabilities': {
+        'text_summarization': {
+            'methods': SUMMARIZATION_METHOD_VALUES,
+            'summary_types': SUMMARIZATION_TYPE_VALUES,
+            'features': ['extractive', 'abstractive', 'hybrid', 'key_phrases', 'statistics']
+        },
+        'query_processing': {
+            'features': ['intent_detection', 'entity_extraction', 'sentiment_analysis', 'keyword_extraction'],
+            'supported_languages': ['en'],
+            'query_types': ['question', 'command', 'search', 'comparison', 'definition']
+        },
+        'document_classification': {
+            'methods': CLASSIFICATION_METHOD_VALUES,
+            'categories': list(CATEGORY_DESCRIPTIONS),
+            'features': ['rule_based', 'naive_bayes', 'ensemble']
+        },
+        'batch_processing': {
+            'max_documents': 10,
+            'supported_operations': ['summarize', 'classify', 'query_analysis']
+        }
+    },
+    'endpoints': {
+        'summarization': ['/api/v2/summarization/summarize', '/api/v2/summarization/methods'],
+        'query_handling': ['/api/v2/query/process', '/api/v2/query/analyze'],
+        'classification': ['/api/v2/classification/classify', '/api/v2/classification/categories'],
+        'batch': ['/api/v2/batch/process'],
+        'jobs': ['/api/v2/jobs/<job_id>'],
+        'system': ['/api/v2/health', '/api/v2/stats', '/api/v2/capabilities']
+    }
+})
+
 @app.route('/api/v2/capabilities', methods=['GET'])
 def get_capabilities():
     """Get detailed API capabilities."""
-    return jsonify({
-        'version': '2.0',
-        'capabilities': {
-            'text_summarization': {
-                'methods': [method.value for method in SummarizationMethod],
-                'summary_types': [stype.value for stype in SummarizationType],
-                'features': ['extractive', 'abstractive', 'hybrid', 'key_phrases', 'statistics']
-            },
-            'query_processing': {
-                'features': ['intent_detection', 'entity_extraction', 'sentiment_analysis', 'keyword_extraction'],
-                'supported_languages': ['en'],
-                'query_types': ['question', 'command', 'search', 'comparison', 'definition']
-            },
-            'document_classification': {
-                'methods': [method.value for method in ClassificationMethod],
-                'categories': ['technical_documentation', 'research_paper', 'tutorial', 'api_documentation', 'specification', 'user_guide', 'faq', 'blog_post'],
-                'features': ['rule_based', 'naive_bayes', 'ensemble']
-            },
-            'batch_processing': {
-                'max_documents': 10,
-                'supported_operations': ['summarize', 'classify', 'query_analysis']
-            }
-        },
-        'endpoints': {
-            'summarization': ['/api/v2/summarization/summarize', '/api/v2/summarization/methods'],
-            'query_handling': ['/api/v2/query/process', '/api/v2/query/analyze'],
-            'classification': ['/api/v2/classification/classify', '/api/v2/classification/categories'],
-            'batch': ['/api/v2/batch/process'],
-            'system': ['/api/v2/health', '/api/v2/stats', '/api/v2/capabilities']
-        }
-    })
+    return _static_json_response(_CAPABILITIES_JSON)
+
 
 if __name__ == '__main__':
     print("🚀 Starting Advanced NLP API Server v2.0...")
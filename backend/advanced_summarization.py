@@ -6,29 +6,71 @@ capabilities with multiple algorithms and approaches.
 """
 
 import re
+import heapq
 import nltk
 import numpy as np
+from scipy import sparse
 from typing import Dict, List, Any, Optional, Tuple
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import math
+from functools import lru_cache
 from dataclasses import dataclass
 from enum import Enum
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-    nltk.download('wordnet', quiet=True)
-except:
-    pass
-
 from nltk.corpus import stopwords
 from nltk.tokenize import sent_tokenize, word_tokenize
 from nltk.stem import WordNetLemmatizer
 from nltk.tag import pos_tag
 
+# NLTK data packages the summarizer needs, with the resource path of each
+_NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'wordnet': 'corpora/wordnet',
+}
+_nltk_data_checked = False
+
+def _ensure_nltk_data() -> None:
+    """Download missing NLTK data packages, checking only on the first call."""
+    global _nltk_data_checked
+    if _nltk_data_checked:
+        return
+    
+    for package, resource in _NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            try:
+                nltk.download(package, quiet=True)
+            except Exception as e:
+                print(f"Warning: Could not download NLTK package {package}: {e}")
+    _nltk_data_checked = True
+
+# Text cleanup patterns used by _preprocess_text
+_WS_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'[^\w\s.!?;]')
+
+# Word tokens of a preprocessed sentence, which only has word characters,
+# whitespace and .!?; left. Dotted tokens such as 3.5 or e.g stay whole, as
+# with word_tokenize, so the isalnum filter drops them instead of their pieces
+_WORD_RE = re.compile(r'\w+(?:\.\w+)*')
+
+# Runs of vowels, one per syllable in _count_syllables
+_VOWEL_RUN_RE = re.compile(r'[aeiouy]+')
+
+@lru_cache(maxsize=50000)
+def _syllable_count(word: str) -> int:
+    """Count syllables in a lowercased word; cached since word frequencies are heavily skewed."""
+    syllable_count = len(_VOWEL_RUN_RE.findall(word))
+    
+    # Handle silent 'e'
+    if word.endswith('e'):
+        syllable_count -= 1
+    
+    return max(1, syllable_count)
+
 class SummarizationType(Enum):
     EXTRACTIVE = "extractive"
     ABSTRACTIVE = "abstractive"
@@ -66,19 +108,40 @@ class SummaryResult:
     processing_time: float
     timestamp: str
 
+@dataclass
+class TextAnalysis:
+    """Sentences of a text with their tokens, computed once per summary."""
+    sentences: List[str]
+    sentence_words: List[List[str]]  # lowercased alphanumeric tokens
+    sentence_tokens: List[List[str]]  # sentence_words without stop words
+    sentence_lemmas: List[List[str]]  # lemmatized sentence_tokens
+    sentence_lemma_sets: List[frozenset]  # distinct sentence_lemmas
+    lemma_vocabulary: Dict[str, int]  # lemma -> id, in order of first occurrence
+    lemma_ids: np.ndarray  # int32 ids of all sentence_lemmas, concatenated
+    sentence_offsets: np.ndarray  # start of each sentence in lemma_ids, plus the end
+    token_ids: np.ndarray  # int32 ids of all sentence_tokens, aligned with lemma_ids
+    token_counts: np.ndarray  # occurrences of each token id in words
+    words: List[str]  # content_words() of the whole text
+    word_freq: Counter  # frequency of each entry in words
+    total_tokens: int  # len(words)
+
 class AdvancedTextSummarizer:
     """Advanced text summarization with multiple algorithms."""
     
     def __init__(self):
+        _ensure_nltk_data()
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
+        # Repeated words skip the WordNet morphy lookup
+        self._lemmatize = lru_cache(maxsize=100000)(self.lemmatizer.lemmatize)
         self.sentence_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
         
     def summarize(self, text: str, 
                  method: SummarizationMethod = SummarizationMethod.TF_IDF,
                  summary_type: SummarizationType = SummarizationType.EXTRACTIVE,
                  summary_length: int = 3,
-                 compression_ratio: Optional[float] = None) -> SummaryResult:
+                 compression_ratio: Optional[float] = None,
+                 words: Optional[List[str]] = None) -> SummaryResult:
         """
         Generate summary using specified method and type.
         
@@ -88,11 +151,13 @@ class AdvancedTextSummarizer:
             summary_type: Type of summarization (extractive/abstractive/hybrid)
             summary_length: Number of sentences in summary (if compression_ratio not provided)
             compression_ratio: Ratio of summary length to original (0.0-1.0)
+            words: Precomputed content_words(text), when the caller already has them
         """
         start_time = datetime.now()
         
-        # Preprocess text
-        sentences = self._preprocess_text(text)
+        # Preprocess and tokenize text once for all scoring methods
+        analysis = self._analyze(text, words)
+        sentences = analysis.sentences
         
         if not sentences:
             raise ValueError("No valid sentences found in input text")
@@ -105,33 +170,33 @@ class AdvancedTextSummarizer:
         
         # Generate summary based on method
         if method == SummarizationMethod.FREQUENCY_BASED:
-            sentence_scores = self._frequency_based_scoring(sentences, text)
+            sentence_scores = self._frequency_based_scoring(analysis, text)
         elif method == SummarizationMethod.TF_IDF:
-            sentence_scores = self._tfidf_scoring(sentences, text)
+            sentence_scores = self._tfidf_scoring(analysis, text)
         elif method == SummarizationMethod.TEXTRANK:
-            sentence_scores = self._textrank_scoring(sentences, text)
+            sentence_scores = self._textrank_scoring(analysis, text)
         elif method == SummarizationMethod.LSA:
-            sentence_scores = self._lsa_scoring(sentences, text)
+            sentence_scores = self._lsa_scoring(analysis, text)
         elif method == SummarizationMethod.LUHN:
-            sentence_scores = self._luhn_scoring(sentences, text)
+            sentence_scores = self._luhn_scoring(analysis, text)
         elif method == SummarizationMethod.EDMUNDSON:
-            sentence_scores = self._edmundson_scoring(sentences, text)
+            sentence_scores = self._edmundson_scoring(analysis, text)
         else:
             raise ValueError(f"Unsupported summarization method: {method}")
         
         # Select top sentences
         top_sentences = self._select_top_sentences(sentence_scores, summary_length)
         
+        # Extract key phrases
+        key_phrases = self._extract_key_phrases(text, analysis.words)
+        
         # Generate final summary
         if summary_type == SummarizationType.EXTRACTIVE:
             summary = self._generate_extractive_summary(top_sentences)
         elif summary_type == SummarizationType.ABSTRACTIVE:
-            summary = self._generate_abstractive_summary(top_sentences, text)
+            summary = self._generate_abstractive_summary(top_sentences, key_phrases)
         else:  # HYBRID
-            summary = self._generate_hybrid_summary(top_sentences, text)
-        
-        # Extract key phrases
-        key_phrases = self._extract_key_phrases(text)
+            summary = self._generate_hybrid_summary(top_sentences, key_phrases)
         
         # Calculate statistics
         processing_time = (datetime.now() - start_time).total_seconds()
@@ -160,40 +225,124 @@ class AdvancedTextSummarizer:
             timestamp=datetime.now().isoformat()
         )
     
+    def summarize_batch(self, texts: List[str],
+                        method: SummarizationMethod = SummarizationMethod.TF_IDF,
+                        summary_type: SummarizationType = SummarizationType.EXTRACTIVE,
+                        summary_length: int = 3,
+                        compression_ratio: Optional[float] = None,
+                        max_workers: Optional[int] = None) -> List[SummaryResult]:
+        """
+        Summarize several texts with the same settings.
+        
+        Args:
+            texts: Input texts to summarize
+            method: Summarization algorithm to use
+            summary_type: Type of summarization (extractive/abstractive/hybrid)
+            summary_length: Number of sentences in each summary (if compression_ratio not provided)
+            compression_ratio: Ratio of summary length to original (0.0-1.0)
+            max_workers: Threads to spread the texts over; by default they run in order on the calling thread
+        
+        Returns:
+            One SummaryResult per text, in the order of texts
+        """
+        def summarize_one(text: str) -> SummaryResult:
+            return self.summarize(text, method=method, summary_type=summary_type,
+                                  summary_length=summary_length, compression_ratio=compression_ratio)
+        
+        if not max_workers or len(texts) < 2:
+            return [summarize_one(text) for text in texts]
+        
+        # WordNet loads lazily on first use and its loader is not thread-safe
+        self.lemmatizer.lemmatize('warmup')
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(summarize_one, texts))
+    
     def _preprocess_text(self, text: str) -> List[str]:
         """Preprocess text and extract sentences."""
         # Clean text
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'[^\w\s\.\!\?\;]', '', text)
+        text = _WS_RE.sub(' ', text.strip())
+        text = _PUNCT_RE.sub('', text)
         
-        # Tokenize sentences
-        sentences = sent_tokenize(text)
+        # Tokenize sentences with the Punkt model loaded in __init__
+        sentences = self.sentence_tokenizer.tokenize(text)
         
         # Filter out very short sentences
         sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
         
         return sentences
     
-    def _frequency_based_scoring(self, sentences: List[str], text: str) -> List[SentenceScore]:
+    def _analyze(self, text: str, words: Optional[List[str]] = None) -> TextAnalysis:
+        """Split text into sentences and tokenize the text and each sentence once."""
+        sentences = self._preprocess_text(text)
+        if words is None:
+            words = self.content_words(text)
+        
+        sentence_words = []
+        sentence_tokens = []
+        sentence_lemmas = []
+        lemma_vocabulary = {}
+        lemma_ids = []
+        token_vocabulary = {}
+        token_ids = []
+        sentence_offsets = [0]
+        for sentence in sentences:
+            alnum_words = [word for word in _WORD_RE.findall(sentence.lower()) if word.isalnum()]
+            tokens = [word for word in alnum_words if word not in self.stop_words]
+            lemmas = [self._lemmatize(word) for word in tokens]
+            sentence_words.append(alnum_words)
+            sentence_tokens.append(tokens)
+            sentence_lemmas.append(lemmas)
+            lemma_ids.extend(lemma_vocabulary.setdefault(lemma, len(lemma_vocabulary)) for lemma in lemmas)
+            token_ids.extend(token_vocabulary.setdefault(token, len(token_vocabulary)) for token in tokens)
+            sentence_offsets.append(len(lemma_ids))
+        
+        word_ids = [token_vocabulary.setdefault(word, len(token_vocabulary)) for word in words]
+        
+        return TextAnalysis(
+            sentences=sentences,
+            sentence_words=sentence_words,
+            sentence_tokens=sentence_tokens,
+            sentence_lemmas=sentence_lemmas,
+            sentence_lemma_sets=[frozenset(lemmas) for lemmas in sentence_lemmas],
+            lemma_vocabulary=lemma_vocabulary,
+            lemma_ids=np.array(lemma_ids, dtype=np.int32),
+            sentence_offsets=np.array(sentence_offsets, dtype=np.int32),
+            token_ids=np.array(token_ids, dtype=np.int32),
+            token_counts=np.bincount(np.array(word_ids, dtype=np.int32), minlength=len(token_vocabulary)),
+            words=words,
+            word_freq=Counter(words),
+            total_tokens=len(words)
+        )
+    
+    def _term_count_matrix(self, analysis: TextAnalysis) -> Tuple[sparse.csr_matrix, List[str]]:
+        """Build a sparse sentence x lemma vocabulary matrix of lemma counts."""
+        vocabulary = list(analysis.lemma_vocabulary)
+        
+        # The lemma ids and sentence offsets are already CSR indices and indptr;
+        # summing duplicates turns repeated lemmas into counts
+        matrix = sparse.csr_matrix(
+            (np.ones(len(analysis.lemma_ids)), analysis.lemma_ids, analysis.sentence_offsets),
+            shape=(len(analysis.sentences), len(vocabulary)), copy=True
+        )
+        matrix.sum_duplicates()
+        
+        return matrix, vocabulary
+    
+    def _frequency_based_scoring(self, analysis: TextAnalysis, text: str) -> List[SentenceScore]:
         """Score sentences based on word frequency."""
-        # Calculate word frequencies
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
-        word_freq = Counter(words)
+        word_freq = analysis.word_freq
+        
+        # Mean text-wide frequency of each sentence's tokens; prefix sums give
+        # every sentence total at once and stay correct for empty sentences
+        offsets = analysis.sentence_offsets
+        cumulative = np.concatenate(([0], np.cumsum(analysis.token_counts[analysis.token_ids])))
+        scores = (cumulative[offsets[1:]] - cumulative[offsets[:-1]]) / np.maximum(np.diff(offsets), 1)
         
         sentence_scores = []
-        for i, sentence in enumerate(sentences):
-            sentence_words = word_tokenize(sentence.lower())
-            sentence_words = [word for word in sentence_words if word.isalnum() and word not in self.stop_words]
-            
-            if not sentence_words:
-                score = 0.0
-            else:
-                score = sum(word_freq[word] for word in sentence_words) / len(sentence_words)
-            
+        for i, (sentence, sentence_words) in enumerate(zip(analysis.sentences, analysis.sentence_tokens)):
             sentence_scores.append(SentenceScore(
                 sentence=sentence,
-                score=score,
+                score=float(scores[i]),
                 position=i,
                 length=len(sentence_words),
                 keywords_count=len(sentence_words),
@@ -202,140 +351,116 @@ class AdvancedTextSummarizer:
         
         return sentence_scores
     
-    def _tfidf_scoring(self, sentences: List[str], text: str) -> List[SentenceScore]:
+    def _tfidf_scoring(self, analysis: TextAnalysis, text: str) -> List[SentenceScore]:
         """Score sentences using TF-IDF algorithm."""
-        # Create vocabulary
-        all_words = []
-        sentence_words = []
+        sentences = analysis.sentences
+        sentence_words = analysis.sentence_lemmas
+        tf_idf_matrix, vocabulary = self._term_count_matrix(analysis)
         
-        for sentence in sentences:
-            words = word_tokenize(sentence.lower())
-            words = [self.lemmatizer.lemmatize(word) for word in words 
-                    if word.isalnum() and word not in self.stop_words]
-            sentence_words.append(words)
-            all_words.extend(words)
-        
-        vocabulary = list(set(all_words))
-        word_to_idx = {word: i for i, word in enumerate(vocabulary)}
-        
-        # Calculate TF-IDF matrix
-        tf_idf_matrix = []
-        for words in sentence_words:
-            tf_idf_vector = [0.0] * len(vocabulary)
-            word_count = len(words)
-            
-            for word in words:
-                if word in word_to_idx:
-                    # Term Frequency
-                    tf = words.count(word) / word_count
-                    
-                    # Document Frequency
-                    df = sum(1 for sent_words in sentence_words if word in sent_words)
-                    
-                    # Inverse Document Frequency
-                    idf = math.log(len(sentences) / df) if df > 0 else 0
-                    
-                    # TF-IDF Score
-                    tf_idf_vector[word_to_idx[word]] = tf * idf
-            
-            tf_idf_matrix.append(tf_idf_vector)
+        # Term Frequency
+        lengths = np.diff(analysis.sentence_offsets).astype(float)
+        tf_idf_matrix.data /= np.repeat(lengths, np.diff(tf_idf_matrix.indptr))
+        
+        # Inverse Document Frequency, from the number of sentences containing each word
+        df = np.bincount(tf_idf_matrix.indices, minlength=len(vocabulary))
+        idf = np.log(len(sentences) / np.maximum(df, 1))
         
-        # Score sentences
+        # TF-IDF Score
+        tf_idf_matrix.data *= idf[tf_idf_matrix.indices]
+        
+        if vocabulary:
+            scores = np.asarray(tf_idf_matrix.sum(axis=1)).ravel() / len(vocabulary)
+        else:
+            scores = np.zeros(len(sentences))
+        
+        # Score sentences, keeping only each sentence's nonzero weights
         sentence_scores = []
-        for i, (sentence, tf_idf_vector) in enumerate(zip(sentences, tf_idf_matrix)):
-            score = sum(tf_idf_vector) / len(tf_idf_vector) if tf_idf_vector else 0.0
-            
+        indptr, indices, data = tf_idf_matrix.indptr, tf_idf_matrix.indices, tf_idf_matrix.data
+        for i, sentence in enumerate(sentences):
+            weights = {
+                vocabulary[j]: float(weight)
+                for j, weight in zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]])
+                if weight > 0
+            }
             sentence_scores.append(SentenceScore(
                 sentence=sentence,
-                score=score,
+                score=float(scores[i]),
                 position=i,
                 length=len(sentence_words[i]),
-                keywords_count=len([x for x in tf_idf_vector if x > 0]),
-                metadata={'tf_idf_vector': tf_idf_vector}
+                keywords_count=len(weights),
+                metadata={'tf_idf_vector': weights}
             ))
         
         return sentence_scores
     
-    def _textrank_scoring(self, sentences: List[str], text: str) -> List[SentenceScore]:
+    def _textrank_scoring(self, analysis: TextAnalysis, text: str,
+                          top_neighbours: int = 5) -> List[SentenceScore]:
         """Score sentences using TextRank algorithm."""
         # Create similarity matrix
-        similarity_matrix = self._calculate_sentence_similarity_matrix(sentences)
+        similarity_matrix = self._calculate_sentence_similarity_matrix(analysis.sentence_lemma_sets)
         
         # Apply PageRank algorithm
         pagerank_scores = self._pagerank(similarity_matrix)
         
+        indptr, indices, data = similarity_matrix.indptr, similarity_matrix.indices, similarity_matrix.data
+        
         sentence_scores = []
-        for i, (sentence, score) in enumerate(zip(sentences, pagerank_scores)):
-            words = word_tokenize(sentence.lower())
-            words = [word for word in words if word.isalnum() and word not in self.stop_words]
-            
+        for i, (sentence, words, score) in enumerate(zip(analysis.sentences, analysis.sentence_tokens, pagerank_scores)):
+            # Most similar sentences first
+            start, end = indptr[i], indptr[i + 1]
+            neighbours = start + np.argsort(-data[start:end], kind='stable')[:top_neighbours]
             sentence_scores.append(SentenceScore(
                 sentence=sentence,
-                score=score,
+                score=float(score),
                 position=i,
                 length=len(words),
                 keywords_count=len(words),
-                metadata={'similarity_scores': similarity_matrix[i].tolist()}
+                metadata={'similarity_scores': {int(indices[j]): float(data[j]) for j in neighbours}}
             ))
         
         return sentence_scores
     
-    def _lsa_scoring(self, sentences: List[str], text: str) -> List[SentenceScore]:
+    def _lsa_scoring(self, analysis: TextAnalysis, text: str, topics: int = 3) -> List[SentenceScore]:
         """Score sentences using Latent Semantic Analysis."""
-        # This is a simplified LSA implementation
-        # In a real system, you'd use libraries like sklearn or gensim
+        sentences = analysis.sentences
+        sentence_words = analysis.sentence_lemmas
         
         # Create term-document matrix
-        all_words = []
-        sentence_words = []
-        
-        for sentence in sentences:
-            words = word_tokenize(sentence.lower())
-            words = [self.lemmatizer.lemmatize(word) for word in words 
-                    if word.isalnum() and word not in self.stop_words]
-            sentence_words.append(words)
-            all_words.extend(words)
-        
-        vocabulary = list(set(all_words))
-        
-        # Create term-document matrix
-        term_doc_matrix = []
-        for words in sentence_words:
-            vector = [words.count(word) for word in vocabulary]
-            term_doc_matrix.append(vector)
+        term_doc_matrix, vocabulary = self._term_count_matrix(analysis)
+        
+        # Project sentences onto the strongest latent topics and score each one
+        # by the length of its topic-weighted vector
+        if vocabulary:
+            u, sigma, _ = np.linalg.svd(term_doc_matrix.toarray(), full_matrices=False)
+            k = max(1, min(topics, len(sentences) - 1, len(sigma)))
+            scores = np.linalg.norm(u[:, :k] * sigma[:k], axis=1)
+        else:
+            scores = np.zeros(len(sentences))
         
-        # Simple scoring based on term importance
         sentence_scores = []
-        for i, (sentence, vector) in enumerate(zip(sentences, term_doc_matrix)):
-            score = sum(vector) / len(vector) if vector else 0.0
-            
+        for i, sentence in enumerate(sentences):
+            term_counts = dict(Counter(sentence_words[i]))
             sentence_scores.append(SentenceScore(
                 sentence=sentence,
-                score=score,
+                score=float(scores[i]),
                 position=i,
                 length=len(sentence_words[i]),
-                keywords_count=len([x for x in vector if x > 0]),
-                metadata={'term_vector': vector}
+                keywords_count=len(term_counts),
+                metadata={'term_vector': term_counts}
             ))
         
         return sentence_scores
     
-    def _luhn_scoring(self, sentences: List[str], text: str) -> List[SentenceScore]:
+    def _luhn_scoring(self, analysis: TextAnalysis, text: str) -> List[SentenceScore]:
         """Score sentences using Luhn's algorithm."""
-        # Calculate word frequencies
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
-        word_freq = Counter(words)
+        word_freq = analysis.word_freq
         
         # Define significant words (high frequency)
-        avg_freq = sum(word_freq.values()) / len(word_freq)
+        avg_freq = analysis.total_tokens / len(word_freq)
         significant_words = set(word for word, freq in word_freq.items() if freq > avg_freq)
         
         sentence_scores = []
-        for i, sentence in enumerate(sentences):
-            sentence_words = word_tokenize(sentence.lower())
-            sentence_words = [word for word in sentence_words if word.isalnum()]
-            
+        for i, (sentence, sentence_words) in enumerate(zip(analysis.sentences, analysis.sentence_words)):
             # Find clusters of significant words
             score = self._calculate_luhn_score(sentence_words, significant_words)
             
@@ -350,15 +475,12 @@ class AdvancedTextSummarizer:
         
         return sentence_scores
     
-    def _edmundson_scoring(self, sentences: List[str], text: str) -> List[SentenceScore]:
+    def _edmundson_scoring(self, analysis: TextAnalysis, text: str) -> List[SentenceScore]:
         """Score sentences using Edmundson's method."""
         sentence_scores = []
-        total_sentences = len(sentences)
+        total_sentences = len(analysis.sentences)
         
-        for i, sentence in enumerate(sentences):
-            words = word_tokenize(sentence.lower())
-            words = [word for word in words if word.isalnum() and word not in self.stop_words]
-            
+        for i, (sentence, words) in enumerate(zip(analysis.sentences, analysis.sentence_tokens)):
             # Position score (beginning and end sentences are important)
             position_score = 1.0 if i < 3 or i >= total_sentences - 3 else 0.5
             
@@ -389,92 +511,107 @@ class AdvancedTextSummarizer:
         
         return sentence_scores
     
-    def _calculate_sentence_similarity_matrix(self, sentences: List[str]) -> np.ndarray:
-        """Calculate similarity matrix between sentences."""
-        n = len(sentences)
-        similarity_matrix = np.zeros((n, n))
+    def _calculate_sentence_similarity_matrix(self, sentence_lemma_sets: List[frozenset],
+                                              max_neighbours: int = 20) -> sparse.csr_matrix:
+        """
+        Calculate Jaccard similarity matrix between sentences' lemma sets.
         
-        # Preprocess sentences
-        sentence_words = []
-        for sentence in sentences:
-            words = word_tokenize(sentence.lower())
-            words = [self.lemmatizer.lemmatize(word) for word in words 
-                    if word.isalnum() and word not in self.stop_words]
-            sentence_words.append(set(words))
-        
-        # Calculate Jaccard similarity
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    intersection = sentence_words[i].intersection(sentence_words[j])
-                    union = sentence_words[i].union(sentence_words[j])
-                    similarity = len(intersection) / len(union) if union else 0.0
-                    similarity_matrix[i][j] = similarity
-        
-        return similarity_matrix
+        Only pairs sharing a lemma are stored, and each row keeps its
+        max_neighbours most similar sentences, so long documents produce an
+        O(n * max_neighbours) graph instead of a dense n x n matrix.
+        """
+        n = len(sentence_lemma_sets)
+        
+        # Binary sentence x word membership matrix
+        vocabulary = {}
+        rows = []
+        cols = []
+        for i, words in enumerate(sentence_lemma_sets):
+            for word in words:
+                rows.append(i)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+        membership = sparse.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=(n, len(vocabulary)))
+        
+        # Intersection sizes of every pair of distinct sentences sharing a lemma
+        intersection = (membership @ membership.T).tocoo()
+        off_diagonal = intersection.row != intersection.col
+        rows = intersection.row[off_diagonal]
+        cols = intersection.col[off_diagonal]
+        shared = intersection.data[off_diagonal]
+        
+        # Calculate Jaccard similarity: |A & B| / (|A| + |B| - |A & B|)
+        sizes = np.array([len(words) for words in sentence_lemma_sets], dtype=float)
+        similarity = shared / (sizes[rows] + sizes[cols] - shared)
+        
+        # Drop the weakest edges of sentences with too many neighbours
+        order = np.lexsort((cols, rows))
+        rows, cols, similarity = rows[order], cols[order], similarity[order]
+        row_starts = np.searchsorted(rows, np.arange(n + 1))
+        keep = np.ones(len(similarity), dtype=bool)
+        for i in np.flatnonzero(np.diff(row_starts) > max_neighbours):
+            start, end = row_starts[i], row_starts[i + 1]
+            weakest = np.argsort(-similarity[start:end], kind='stable')[max_neighbours:]
+            keep[start + weakest] = False
+        
+        return sparse.csr_matrix((similarity[keep], (rows[keep], cols[keep])), shape=(n, n))
     
-    def _pagerank(self, similarity_matrix: np.ndarray, damping: float = 0.85, 
-                 max_iter: int = 100, tolerance: float = 1e-6) -> List[float]:
+    def _pagerank(self, similarity_matrix: sparse.csr_matrix, damping: float = 0.85, 
+                 max_iter: int = 100, tolerance: float = 1e-6) -> np.ndarray:
         """Apply PageRank algorithm to similarity matrix."""
-        n = len(similarity_matrix)
+        n = similarity_matrix.shape[0]
         scores = np.ones(n) / n
         
+        # Column-normalize so every sentence hands out its whole score to its
+        # neighbours; sentences without any neighbours keep a zero column
+        column_sums = np.asarray(similarity_matrix.sum(axis=0)).ravel()
+        transition = sparse.csr_matrix(similarity_matrix) @ sparse.diags(1 / np.where(column_sums > 0, column_sums, 1))
+        
         for _ in range(max_iter):
-            new_scores = np.zeros(n)
-            
-            for i in range(n):
-                for j in range(n):
-                    if similarity_matrix[j][i] > 0:
-                        new_scores[i] += similarity_matrix[j][i] * scores[j]
-                
-                new_scores[i] = (1 - damping) / n + damping * new_scores[i]
-            
-            if np.allclose(scores, new_scores, atol=tolerance):
-                break
-            
+            new_scores = (1 - damping) / n + damping * (transition @ scores)
+            converged = np.abs(new_scores - scores).sum() < tolerance
             scores = new_scores
+            if converged:
+                break
         
-        return scores.tolist()
+        return scores
     
-    def _calculate_luhn_score(self, words: List[str], significant_words: set) -> float:
-        """Calculate Luhn score for a sentence."""
-        if not words:
-            return 0.0
+    def _calculate_luhn_score(self, words: List[str], significant_words: set,
+                              max_gap: int = 4) -> float:
+        """
+        Calculate Luhn score for a sentence.
         
-        # Find clusters of significant words
-        clusters = []
-        current_cluster = []
+        A cluster is a span that starts and ends with significant words and has at
+        most max_gap insignificant words between consecutive significant ones. It
+        scores significant_count ** 2 / span_length; the sentence scores its best
+        cluster.
+        """
+        max_score = 0.0
+        start = last = -1
+        count = 0
         
-        for word in words:
-            if word in significant_words:
-                current_cluster.append(word)
+        for i, word in enumerate(words):
+            if word not in significant_words:
+                continue
+            
+            if count and i - last - 1 <= max_gap:
+                count += 1
             else:
-                if current_cluster:
-                    clusters.append(current_cluster)
-                    current_cluster = []
-        
-        if current_cluster:
-            clusters.append(current_cluster)
-        
-        if not clusters:
-            return 0.0
+                if count:
+                    max_score = max(max_score, count ** 2 / (last - start + 1))
+                start = i
+                count = 1
+            last = i
         
-        # Score based on cluster density
-        max_score = 0.0
-        for cluster in clusters:
-            cluster_score = len(cluster) ** 2 / len(cluster)  # Simplified scoring
-            max_score = max(max_score, cluster_score)
+        if count:
+            max_score = max(max_score, count ** 2 / (last - start + 1))
         
         return max_score
     
     def _select_top_sentences(self, sentence_scores: List[SentenceScore], 
                             summary_length: int) -> List[SentenceScore]:
         """Select top sentences for summary."""
-        # Sort by score (descending)
-        sorted_sentences = sorted(sentence_scores, key=lambda x: x.score, reverse=True)
-        
-        # Select top sentences
-        selected = sorted_sentences[:summary_length]
+        # Select top sentences by score; ties keep document order like a stable sort
+        selected = heapq.nlargest(summary_length, sentence_scores, key=lambda x: x.score)
         
         # Sort by original position to maintain coherence
         selected.sort(key=lambda x: x.position)
@@ -486,14 +623,11 @@ class AdvancedTextSummarizer:
         return ' '.join(sentence.sentence for sentence in sentences)
     
     def _generate_abstractive_summary(self, sentences: List[SentenceScore], 
-                                    original_text: str) -> str:
+                                    key_phrases: List[str]) -> str:
         """Generate abstractive summary (simplified implementation)."""
         # This is a simplified abstractive summarization
         # In a real system, you'd use neural networks or other advanced NLP techniques
         
-        # Extract key concepts and generate new sentences
-        key_phrases = self._extract_key_phrases(original_text)
-        
         # For now, return a modified extractive summary
         extractive_summary = self._generate_extractive_summary(sentences)
         
@@ -506,13 +640,11 @@ class AdvancedTextSummarizer:
         return summary
     
     def _generate_hybrid_summary(self, sentences: List[SentenceScore], 
-                                original_text: str) -> str:
+                                key_phrases: List[str]) -> str:
         """Generate hybrid summary combining extractive and abstractive approaches."""
         extractive_part = self._generate_extractive_summary(sentences)
         
         # Add abstractive elements
-        key_phrases = self._extract_key_phrases(original_text)
-        
         if key_phrases:
             hybrid_summary = f"{extractive_part} This text primarily discusses {', '.join(key_phrases[:2])}."
         else:
@@ -520,10 +652,14 @@ class AdvancedTextSummarizer:
         
         return hybrid_summary
     
-    def _extract_key_phrases(self, text: str) -> List[str]:
+    def content_words(self, text: str) -> List[str]:
+        """Lowercased word tokens of text, without punctuation and stop words."""
+        return [word for word in word_tokenize(text.lower()) if word.isalnum() and word not in self.stop_words]
+    
+    def _extract_key_phrases(self, text: str, words: Optional[List[str]] = None) -> List[str]:
         """Extract key phrases from text."""
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
+        if words is None:
+            words = self.content_words(text)
         
         # Use POS tagging to find noun phrases
         pos_tags = pos_tag(words)
@@ -551,7 +687,7 @@ class AdvancedTextSummarizer:
         """Calculate readability score (simplified Flesch Reading Ease)."""
         sentences = sent_tokenize(text)
         words = word_tokenize(text)
-        syllables = sum(self._count_syllables(word) for word in words)
+        syllables = sum(map(self._count_syllables, words))
         
         if not sentences or not words:
             return 0.0
@@ -562,22 +698,7 @@ class AdvancedTextSummarizer:
     
     def _count_syllables(self, word: str) -> int:
         """Count syllables in a word (simplified)."""
-        word = word.lower()
-        vowels = 'aeiouy'
-        syllable_count = 0
-        previous_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not previous_was_vowel:
-                syllable_count += 1
-            previous_was_vowel = is_vowel
-        
-        # Handle silent 'e'
-        if word.endswith('e'):
-            syllable_count -= 1
-        
-        return max(1, syllable_count)
+        return _syllable_count(word.lower())
     
     def _calculate_coherence(self, sentences: List[SentenceScore]) -> float:
         """Calculate coherence score for selected sentences."""
@@ -8,13 +8,27 @@ This module provides comprehensive visualization capabilities for:
 4. Educational diagrams for FLA and networking concepts
 """
 
+import copy
+import hashlib
 import json
+import math
 import re
-from typing import Dict, List, Any, Optional, Tuple, Union
+import threading
+import numpy as np
+from array import array
+from collections import OrderedDict
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Dict, List, Any, ClassVar, Mapping, Optional, Sequence, Tuple, Union
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, asdict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class VisualizationType(Enum):
     PARSE_TREE = "parse_tree"
     DERIVATION_STEPS = "derivation_steps"
@@ -31,23 +45,31 @@ class NodeType(Enum):
     ROOT = "root"
     PRODUCTION = "production"
 
-@dataclass
+# NodeType -> value, avoiding the enum's .value property lookup per tree node
+_NODE_TYPE_VALUES = {node_type: node_type.value for node_type in NodeType}
+
+@dataclass(slots=True)
 class TreeNode:
     """Represents a node in a parse tree."""
     id: str
     label: str
     node_type: NodeType
-    children: List['TreeNode']
+    children: Sequence['TreeNode']
     parent_id: Optional[str] = None
     production_rule: Optional[str] = None
     position: Optional[Tuple[int, int]] = None
     metadata: Optional[Dict[str, Any]] = None
+    
+    def freeze(self) -> 'TreeNode':
+        """Turn the children lists of this subtree into tuples once it is fully built."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node.children = tuple(node.children)
+            stack.extend(node.children)
+        return self
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
-
-@dataclass
+@dataclass(slots=True)
 class DerivationStep:
     """Represents a step in CFG derivation."""
     step_number: int
@@ -58,7 +80,7 @@ class DerivationStep:
     position: int
     explanation: str
 
-@dataclass
+@dataclass(slots=True)
 class StateTransition:
     """Represents a state transition in automaton."""
     from_state: str
@@ -67,7 +89,7 @@ class StateTransition:
     stack_operation: Optional[str] = None
     output: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class ProtocolLayer:
     """Represents a network protocol layer."""
     name: str
@@ -77,43 +99,230 @@ class ProtocolLayer:
     layer_number: int
     encapsulation_overhead: int
 
+# Read-only color tables shared by every visualizer
+_COLOR_SCHEME = MappingProxyType({
+    'terminal': '#4CAF50',
+    'non_terminal': '#2196F3',
+    'root': '#FF9800',
+    'production': '#9C27B0',
+    'physical': '#795548',
+    'data_link': '#607D8B',
+    'network': '#3F51B5',
+    'transport': '#009688',
+    'application': '#F44336'
+})
+
+_STATE_COLORS = MappingProxyType({
+    'start': '#4CAF50',
+    'accept': '#F44336',
+    'normal': '#2196F3'
+})
+
+_NETWORK_NODE_COLORS = MappingProxyType({
+    'source': '#4CAF50',
+    'destination': '#F44336',
+    'router': '#FF9800'
+})
+
+_LAYER_NUMBER = attrgetter('layer_number')
+
 class AdvancedVisualizer:
     """Advanced visualization generator for FLA and networking concepts."""
     
+    # Number of parse tree payloads kept for repeated requests
+    VIZ_CACHE_SIZE = 64
+    
+    # Derivations of very large or ambiguous trees are cut off after this many steps
+    MAX_DERIVATION_STEPS = 10_000
+    
+    # Read-only settings shared by all instances
+    color_scheme: ClassVar[Mapping[str, str]] = _COLOR_SCHEME
+    layout_settings: ClassVar[Mapping[str, int]] = MappingProxyType({
+        'node_spacing': 80,
+        'level_spacing': 100,
+        'font_size': 12,
+        'arrow_size': 8
+    })
+    
+    # Generator method used by generate_batch for each visualization type
+    _DISPATCH: ClassVar[Mapping[VisualizationType, str]] = MappingProxyType({
+        VisualizationType.PARSE_TREE: 'generate_parse_tree_visualization',
+        VisualizationType.FSA_DIAGRAM: 'generate_fsa_visualization',
+        VisualizationType.PROTOCOL_STACK: 'generate_protocol_stack_visualization',
+        VisualizationType.PACKET_FLOW: 'generate_packet_flow_visualization'
+    })
+    
     def __init__(self):
-        self.color_scheme = {
-            'terminal': '#4CAF50',
-            'non_terminal': '#2196F3',
-            'root': '#FF9800',
-            'production': '#9C27B0',
-            'physical': '#795548',
-            'data_link': '#607D8B',
-            'network': '#3F51B5',
-            'transport': '#009688',
-            'application': '#F44336'
-        }
-        self.layout_settings = {
-            'node_spacing': 80,
-            'level_spacing': 100,
-            'font_size': 12,
-            'arrow_size': 8
-        }
+        self._viz_cache: OrderedDict = OrderedDict()
+        self._viz_cache_lock = threading.Lock()
     
     def generate_parse_tree_visualization(self, parse_tree: TreeNode, 
                                         grammar_rules: Dict[str, List[str]]) -> Dict[str, Any]:
-        """Generate visualization data for parse tree."""
+        """Generate visualization data for parse tree.
+        
+        Payloads are cached by a fingerprint of the tree and grammar, so a
+        repeated request returns a shallow copy of the earlier result. Its
+        nodes, edges, derivation steps and grammar info are shared with the
+        cache, and node metadata with the tree, so callers must not modify
+        them in place.
+        """
+        key = self._fingerprint_parse_tree(parse_tree, grammar_rules)
+        with self._viz_cache_lock:
+            cached = self._viz_cache.get(key)
+            if cached is not None:
+                self._viz_cache.move_to_end(key)
+                return copy.copy(cached)
+        
+        payload = self._build_parse_tree_payload(parse_tree, grammar_rules)
+        
+        with self._viz_cache_lock:
+            self._viz_cache[key] = payload
+            self._viz_cache.move_to_end(key)
+            while len(self._viz_cache) > self.VIZ_CACHE_SIZE:
+                self._viz_cache.popitem(last=False)
+        return copy.copy(payload)
+    
+    @staticmethod
+    def _fingerprint_parse_tree(parse_tree: TreeNode, grammar_rules: Dict[str, List[str]]) -> bytes:
+        """Digest everything about a tree and grammar that shapes the payload.
+        
+        Each node contributes one joined string and the digest runs once over
+        all of them. Metadata and rules go in by repr, which is cheaper than
+        canonical JSON; the same content in a different key order only costs
+        a cache miss.
+        """
+        parts = []
+        add_part = parts.append
+        stack = [parse_tree]
+        while stack:
+            node = stack.pop()
+            children = node.children
+            metadata = node.metadata
+            add_part(f"{node.id}\0{node.label}\0{node.node_type.value}\0{node.production_rule}\0"
+                     f"{repr(metadata) if metadata else ''}\0{len(children)}")
+            stack.extend(reversed(children))
+        add_part(repr(grammar_rules))
+        return hashlib.blake2b('\1'.join(parts).encode('utf-8'), digest_size=16).digest()
+    
+    def _build_parse_tree_payload(self, parse_tree: TreeNode,
+                                  grammar_rules: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Build the parse tree visualization payload in a single walk.
+        
+        Nodes are numbered in pre-order as they are visited. Each visit emits
+        the node and its incoming edge, records its symbol, places leaves at
+        the next free x and, while still inside the derivation, applies its
+        production to the sentential form. Parent x coordinates depend on
+        their children and are filled in afterwards from the index arrays.
+        """
+        node_spacing = self.layout_settings['node_spacing']
+        level_spacing = self.layout_settings['level_spacing']
+        color_get = self.color_scheme.get
+        
         nodes = []
         edges = []
-        positions = {}
+        derivation_steps = []
+        add_node = nodes.append
+        add_edge = edges.append
+        xs = array('i')
+        ys = array('i')
+        last_children = array('i')
+        # Insertion-ordered so symbols come out in tree order on every run
+        terminals = {}
+        non_terminals = {}
         
-        # Calculate positions using a tree layout algorithm
-        self._calculate_tree_positions(parse_tree, positions, 0, 0)
+        # Leftmost derivation: every node visited before the current one has
+        # already been expanded, so a node's offset in the sentential form is
+        # the length of the symbols left unexpanded so far
+        current_string = parse_tree.label
+        offset = 0
+        next_x = 0
+        max_steps = self.MAX_DERIVATION_STEPS
+        expanded = set()
+        truncated = False
         
-        # Generate nodes and edges
-        self._traverse_tree_for_visualization(parse_tree, nodes, edges, positions)
+        # Frames are (node, parent index, parent id, still deriving)
+        stack = [(parse_tree, -1, None, True)]
+        while stack:
+            node, parent, parent_id, deriving = stack.pop()
+            index = len(nodes)
+            children = node.children
+            
+            if parent >= 0:
+                ys.append(ys[parent] + level_spacing)
+                # Siblings are numbered left to right, so the last one wins
+                last_children[parent] = index
+                # Each non-root node has one incoming edge, numbered in pre-order
+                add_edge({
+                    'id': index - 1,
+                    'source': parent_id,
+                    'target': node.id,
+                    'type': 'tree_edge'
+                })
+            else:
+                ys.append(0)
+            last_children.append(-1)
+            
+            if children:
+                xs.append(0)
+            else:
+                xs.append(next_x)
+                next_x += node_spacing
+            
+            kind = node.node_type
+            node_type = _NODE_TYPE_VALUES[kind]
+            add_node({
+                'id': node.id,
+                'label': node.label,
+                'type': node_type,
+                'position': None,
+                'color': color_get(node_type, '#999'),
+                'production_rule': node.production_rule,
+                'metadata': node.metadata if node.metadata is not None else {}
+            })
+            
+            # Enum members are singletons, so identity checks suffice
+            if kind is NodeType.TERMINAL:
+                terminals[node.label] = None
+            elif kind is NodeType.NON_TERMINAL:
+                non_terminals[node.label] = None
+            
+            if deriving and not truncated:
+                if children and node.production_rule and id(node) not in expanded:
+                    if len(derivation_steps) >= max_steps:
+                        truncated = True
+                    else:
+                        expanded.add(id(node))
+                        replacement = ' '.join(child.label for child in children)
+                        derivation_steps.append(DerivationStep(
+                            step_number=len(derivation_steps) + 1,
+                            current_string=current_string,
+                            applied_rule=node.production_rule,
+                            replaced_symbol=node.label,
+                            replacement=replacement,
+                            position=offset,
+                            explanation=f"Apply rule: {node.production_rule}"
+                        ))
+                        current_string = (current_string[:offset] + replacement +
+                                          current_string[offset + len(node.label):])
+                else:
+                    # The symbol stays as is and its subtree is not derived;
+                    # a subtree shared with an earlier parent is derived once
+                    offset += len(node.label) + 1
+                    deriving = False
+            
+            stack.extend((child, index, node.id, deriving) for child in reversed(children))
         
-        # Generate derivation steps
-        derivation_steps = self._generate_derivation_steps(parse_tree, grammar_rules)
+        # Position parents in the middle of their children; walking backwards
+        # places every child before its parent
+        for index in range(len(nodes) - 1, -1, -1):
+            last_child = last_children[index]
+            if last_child >= 0:
+                xs[index] = (xs[index + 1] + xs[last_child]) // 2
+        for node_data, x, y in zip(nodes, xs, ys):
+            node_data['position'] = (x, y)
+        
+        terminals = list(terminals)
+        non_terminals = list(non_terminals)
         
         return {
             'type': VisualizationType.PARSE_TREE.value,
@@ -121,15 +330,16 @@ class AdvancedVisualizer:
             'nodes': nodes,
             'edges': edges,
             'derivation_steps': [asdict(step) for step in derivation_steps],
+            'derivation_truncated': truncated,
             'grammar_info': {
                 'rules': grammar_rules,
-                'terminals': self._extract_terminals(parse_tree),
-                'non_terminals': self._extract_non_terminals(parse_tree)
+                'terminals': terminals,
+                'non_terminals': non_terminals
             },
             'layout': {
-                'width': max(pos[0] for pos in positions.values()) + 200,
-                'height': max(pos[1] for pos in positions.values()) + 200,
-                'root_position': positions.get(parse_tree.id, (0, 0))
+                'width': max(xs) + 200,
+                'height': max(ys) + 200,
+                'root_position': (xs[0], ys[0])
             },
             'interaction': {
                 'expandable_nodes': True,
@@ -138,6 +348,34 @@ class AdvancedVisualizer:
             }
         }
     
+    def generate_batch(self, requests: List[Tuple[VisualizationType, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Generate several visualizations in one call.
+        
+        Each request pairs a visualization type with the keyword arguments of
+        its generator. The result can be sent as a single frame via serialize.
+        """
+        dispatch = self._DISPATCH
+        payloads = []
+        for viz_type, kwargs in requests:
+            method_name = dispatch.get(viz_type)
+            if method_name is None:
+                raise ValueError(f"Unsupported visualization type: {viz_type}")
+            payloads.append(getattr(self, method_name)(**kwargs))
+        return payloads
+    
+    @staticmethod
+    def serialize(payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bytes:
+        """Encode a visualization payload as JSON behind a 4-byte big-endian length prefix.
+        
+        The prefix lets a receiver read one whole frame off a stream without
+        trial-parsing. Uses orjson when available.
+        """
+        if orjson is not None:
+            body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        else:
+            body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return len(body).to_bytes(4, 'big') + body
+    
     def generate_fsa_visualization(self, states: List[str], 
                                  transitions: List[StateTransition],
                                  alphabet: List[str],
@@ -146,6 +384,7 @@ class AdvancedVisualizer:
         """Generate FSA diagram visualization."""
         nodes = []
         edges = []
+        positions = self._calculate_circular_positions(len(states), 200)
         
         # Generate state nodes
         for i, state in enumerate(states):
@@ -154,20 +393,24 @@ class AdvancedVisualizer:
                 'id': state,
                 'label': state,
                 'type': node_type,
-                'position': self._calculate_circular_position(i, len(states), 200),
+                'position': positions[i],
                 'color': self._get_state_color(node_type),
                 'size': 30,
                 'border_width': 3 if node_type in ['start', 'accept'] else 1
             })
         
-        # Generate transition edges
-        for transition in transitions:
-            edges.append({
-                'id': f"{transition.from_state}_{transition.to_state}_{transition.input_symbol}",
-                'source': transition.from_state,
-                'target': transition.to_state,
-                'label': transition.input_symbol,
-                'curved': True if transition.from_state == transition.to_state else False,
+        # Generate transition edges; self-loops are drawn curved
+        add_edge = edges.append
+        for edge_id, transition in enumerate(transitions):
+            source = transition.from_state
+            target = transition.to_state
+            symbol = transition.input_symbol
+            add_edge({
+                'id': edge_id,
+                'source': source,
+                'target': target,
+                'label': symbol,
+                'curved': source == target,
                 'arrow_type': 'triangle',
                 'color': '#666'
             })
@@ -197,8 +440,11 @@ class AdvancedVisualizer:
         """Generate network protocol stack visualization."""
         layer_boxes = []
         total_height = 0
+        color_get = self.color_scheme.get
         
-        for i, layer in enumerate(sorted(layers, key=lambda x: x.layer_number, reverse=True)):
+        # Highest layer is drawn on top
+        ordered_layers = sorted(layers, key=_LAYER_NUMBER, reverse=True)
+        for i, layer in enumerate(ordered_layers):
             box_height = 60 + (len(layer.headers) * 20)
             layer_boxes.append({
                 'id': f"layer_{layer.layer_number}",
@@ -211,7 +457,7 @@ class AdvancedVisualizer:
                     'width': 400,
                     'height': box_height
                 },
-                'color': self.color_scheme.get(layer.name.lower(), '#999'),
+                'color': color_get(layer.name.lower(), '#999'),
                 'payload_size': layer.payload_size,
                 'overhead': layer.encapsulation_overhead
             })
@@ -219,13 +465,15 @@ class AdvancedVisualizer:
         
         # Generate encapsulation flow
         encapsulation_steps = []
+        running_size = 0
         for i, layer in enumerate(layers):
+            running_size += layer.payload_size + layer.encapsulation_overhead
             encapsulation_steps.append({
                 'step': i + 1,
                 'layer': layer.name,
                 'action': f"Add {layer.protocol} header",
                 'size_added': layer.encapsulation_overhead,
-                'total_size': sum(l.payload_size + l.encapsulation_overhead for l in layers[:i+1])
+                'total_size': running_size
             })
         
         return {
@@ -233,7 +481,7 @@ class AdvancedVisualizer:
             'title': 'Network Protocol Stack',
             'layers': layer_boxes,
             'encapsulation_flow': encapsulation_steps,
-            'total_size': sum(l.payload_size + l.encapsulation_overhead for l in layers),
+            'total_size': running_size,
             'layout': {
                 'width': 500,
                 'height': total_height + 40
@@ -352,108 +600,15 @@ class AdvancedVisualizer:
             ]
         }
     
-    def _calculate_tree_positions(self, node: TreeNode, positions: Dict[str, Tuple[int, int]], 
-                                x: int, y: int, level: int = 0) -> int:
-        """Calculate positions for tree layout."""
-        if not node.children:
-            positions[node.id] = (x, y)
-            return x + self.layout_settings['node_spacing']
-        
-        # Calculate positions for children first
-        child_x = x
-        for child in node.children:
-            child_x = self._calculate_tree_positions(child, positions, child_x, 
-                                                   y + self.layout_settings['level_spacing'], level + 1)
-        
-        # Position parent in the middle of children
-        if node.children:
-            first_child_x = positions[node.children[0].id][0]
-            last_child_x = positions[node.children[-1].id][0]
-            parent_x = (first_child_x + last_child_x) // 2
-        else:
-            parent_x = x
-        
-        positions[node.id] = (parent_x, y)
-        return child_x
-    
-    def _traverse_tree_for_visualization(self, node: TreeNode, nodes: List[Dict], 
-                                       edges: List[Dict], positions: Dict[str, Tuple[int, int]]):
-        """Traverse tree and generate visualization nodes and edges."""
-        position = positions.get(node.id, (0, 0))
-        
-        nodes.append({
-            'id': node.id,
-            'label': node.label,
-            'type': node.node_type.value,
-            'position': position,
-            'color': self.color_scheme.get(node.node_type.value, '#999'),
-            'production_rule': node.production_rule,
-            'metadata': node.metadata
-        })
-        
-        for child in node.children:
-            edges.append({
-                'id': f"{node.id}_{child.id}",
-                'source': node.id,
-                'target': child.id,
-                'type': 'tree_edge'
-            })
-            self._traverse_tree_for_visualization(child, nodes, edges, positions)
-    
-    def _generate_derivation_steps(self, parse_tree: TreeNode, 
-                                 grammar_rules: Dict[str, List[str]]) -> List[DerivationStep]:
-        """Generate step-by-step derivation from parse tree."""
-        steps = []
-        current_string = parse_tree.label
-        step_count = 0
-        
-        def traverse_for_derivation(node: TreeNode, current: str, steps_list: List[DerivationStep]):
-            nonlocal step_count
-            
-            if node.children and node.production_rule:
-                step_count += 1
-                replacement = ' '.join(child.label for child in node.children)
-                position = current.find(node.label)
-                
-                new_string = current[:position] + replacement + current[position + len(node.label):]
-                
-                steps_list.append(DerivationStep(
-                    step_number=step_count,
-                    current_string=current,
-                    applied_rule=node.production_rule,
-                    replaced_symbol=node.label,
-                    replacement=replacement,
-                    position=position,
-                    explanation=f"Apply rule: {node.production_rule}"
-                ))
-                
-                for child in node.children:
-                    traverse_for_derivation(child, new_string, steps_list)
-        
-        traverse_for_derivation(parse_tree, current_string, steps)
-        return steps
-    
-    def _extract_terminals(self, node: TreeNode) -> List[str]:
-        """Extract terminal symbols from parse tree."""
-        terminals = []
-        if node.node_type == NodeType.TERMINAL:
-            terminals.append(node.label)
-        for child in node.children:
-            terminals.extend(self._extract_terminals(child))
-        return list(set(terminals))
-    
-    def _extract_non_terminals(self, node: TreeNode) -> List[str]:
-        """Extract non-terminal symbols from parse tree."""
-        non_terminals = []
-        if node.node_type == NodeType.NON_TERMINAL:
-            non_terminals.append(node.label)
-        for child in node.children:
-            non_terminals.extend(self._extract_non_terminals(child))
-        return list(set(non_terminals))
+    def _calculate_circular_positions(self, total: int, radius: int) -> List[Tuple[int, int]]:
+        """Calculate positions of all nodes of a circular layout at once."""
+        angles = 2 * np.pi * np.arange(total) / total
+        xs = (radius * np.cos(angles)).astype(int) + radius + 50
+        ys = (radius * np.sin(angles)).astype(int) + radius + 50
+        return list(zip(xs.tolist(), ys.tolist()))
     
     def _calculate_circular_position(self, index: int, total: int, radius: int) -> Tuple[int, int]:
         """Calculate position for circular layout."""
-        import math
         angle = 2 * math.pi * index / total
         x = int(radius * math.cos(angle)) + radius + 50
         y = int(radius * math.sin(angle)) + radius + 50
@@ -461,21 +616,11 @@ class AdvancedVisualizer:
     
     def _get_state_color(self, state_type: str) -> str:
         """Get color for FSA state type."""
-        colors = {
-            'start': '#4CAF50',
-            'accept': '#F44336',
-            'normal': '#2196F3'
-        }
-        return colors.get(state_type, '#999')
+        return _STATE_COLORS.get(state_type, '#999')
     
     def _get_node_color(self, node_type: str) -> str:
         """Get color for network node type."""
-        colors = {
-            'source': '#4CAF50',
-            'destination': '#F44336',
-            'router': '#FF9800'
-        }
-        return colors.get(node_type, '#999')
+        return _NETWORK_NODE_COLORS.get(node_type, '#999')
     
     def _generate_integration_points(self, cfg_data: Dict[str, Any], 
                                    network_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -7,14 +7,23 @@ for validating HTTP requests, managing analytics, and serving the frontend.
 
 from flask import Flask, request, jsonify, session
 from flask_cors import CORS
+from sqlalchemy import case, func, insert, select
 from werkzeug.exceptions import BadRequest
+import hmac
 import os
+import queue
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Tuple
 import json
 
 from cfg_parser import HTTPRequestCFGParser
-from models import db, RequestLog, ErrorPattern, UserSession, init_db, get_analytics_summary
+from models import (db, RequestLog, ErrorPattern, UserSession, init_db, get_analytics_summary,
+                    record_error_occurrences, utc_cutoff)
 
 app = Flask(__name__)
 
@@ -23,6 +32,22 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///cfg_validator.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SQLALCHEMY_ECHO'] = False
+# Maintenance endpoints such as /api/cache/clear stay disabled unless set
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
+
+# Reuse pooled connections instead of opening one per request. SQLite
+# connections are shared across worker threads; its pool is left to SQLAlchemy.
+if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'connect_args': {'check_same_thread': False}
+    }
+else:
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DATABASE_POOL_SIZE', 6)),
+        'max_overflow': int(os.environ.get('DATABASE_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': True,
+        'pool_recycle': 1800
+    }
 
 # Enable CORS for frontend communication
 CORS(app, supports_credentials=True)
@@ -33,6 +58,52 @@ init_db(app)
 # Initialize the CFG parser
 cfg_parser = HTTPRequestCFGParser()
 
+@lru_cache(maxsize=4096)
+def _cached_validate(request_line: str) -> MappingProxyType:
+    """Validate a stripped request line, sharing the read-only result between repeats."""
+    return MappingProxyType(cfg_parser.validate_request(request_line))
+
+# Dashboard summaries are polled every few seconds; serve them from memory for
+# a short while instead of rescanning request_logs on every poll
+SUMMARY_CACHE_TTL = 30.0
+_summary_cache: Dict[Hashable, Tuple[float, Any]] = {}
+_summary_cache_lock = threading.Lock()
+
+def _cached_summary(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Return the cached value for `key`, recomputing it once it is older than the TTL."""
+    now = time.monotonic()
+    with _summary_cache_lock:
+        entry = _summary_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    
+    value = compute()
+    with _summary_cache_lock:
+        _summary_cache[key] = (now + SUMMARY_CACHE_TTL, value)
+    return value
+
+def _invalidate_summary(key: Hashable) -> None:
+    """Drop a cached summary so the next request recomputes it."""
+    with _summary_cache_lock:
+        _summary_cache.pop(key, None)
+
+def _analytics_summary(days: int) -> Dict[str, Any]:
+    """Analytics summary for the last `days` days, cached for SUMMARY_CACHE_TTL seconds."""
+    return _cached_summary(('analytics', days), lambda: get_analytics_summary(days))
+
+def validate_request_line(request_line: str) -> Dict[str, Any]:
+    """
+    Validate a stripped request line, reusing the parse of repeated lines.
+    
+    Parsing is deterministic, so identical lines (common in pasted logs)
+    are parsed once. Each caller gets its own top-level dict with a fresh
+    timestamp; nested lists are shared with the cache and must not be
+    modified.
+    """
+    result = dict(_cached_validate(request_line))
+    result['timestamp'] = datetime.now().isoformat()
+    return result
+
 def get_session_id():
     """Get or create a session ID for the current user."""
     if 'session_id' not in session:
@@ -41,20 +112,103 @@ def get_session_id():
 
 def get_or_create_user_session():
     """Get or create a user session record."""
-    session_id = get_session_id()
+    return find_or_create_user_session(
+        get_session_id(),
+        request.remote_addr,
+        request.headers.get('User-Agent', '')[:500]
+    )
+
+def find_or_create_user_session(session_id: str, ip_address: str, user_agent: str) -> UserSession:
+    """Get or create the user session record for a known session ID."""
     user_session = UserSession.query.filter_by(session_id=session_id).first()
     
     if not user_session:
         user_session = UserSession(
             session_id=session_id,
-            ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent', '')[:500]
+            ip_address=ip_address,
+            user_agent=user_agent
         )
         db.session.add(user_session)
         db.session.commit()
     
     return user_session
 
+# Logging a validation does not affect its response, so /api/validate hands
+# the database writes to a background writer. The writer starts with the first
+# queued entry, inside the serving process. The queue is bounded: under a load
+# spike, log entries are dropped rather than held in memory.
+LOG_QUEUE_SIZE = 1000
+_log_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_log_writer_lock = threading.Lock()
+_log_writer_started = False
+_dropped_log_entries = 0
+
+def _write_request_log(entry: Dict[str, Any]) -> None:
+    """Store a validated request with its session activity and error counts."""
+    with app.app_context():
+        try:
+            validation_result = entry['validation_result']
+            request_log = RequestLog(
+                request_line=entry['request_line'],
+                is_valid=validation_result['is_valid'],
+                tokens=validation_result['tokens'],
+                parse_trees=validation_result['parse_trees'],
+                errors=validation_result['errors'],
+                ip_address=entry['ip_address'],
+                user_agent=entry['user_agent'],
+                session_id=entry['session_id']
+            )
+            db.session.add(request_log)
+            
+            # Update user session
+            user_session = find_or_create_user_session(
+                entry['session_id'], entry['ip_address'], entry['user_agent']
+            )
+            user_session.update_activity(validation_result['is_valid'])
+            
+            # Update error pattern counts
+            if not validation_result['is_valid']:
+                record_error_occurrences(validation_result['errors'])
+            
+            db.session.commit()
+            _invalidate_summary('stats')
+            
+        except Exception:
+            app.logger.exception("Failed to store request log entry")
+            db.session.rollback()
+
+def _request_log_writer(log_queue: "queue.Queue[Dict[str, Any]]") -> None:
+    """Drain the log queue for the lifetime of the process.
+    
+    A failing entry is logged and skipped, so it never stops the writer.
+    """
+    while True:
+        entry = log_queue.get()
+        try:
+            _write_request_log(entry)
+        except Exception:
+            app.logger.exception("Request log writer failed on an entry")
+        finally:
+            log_queue.task_done()
+
+def _enqueue_request_log(entry: Dict[str, Any]) -> None:
+    """Queue a log entry for the writer, starting the writer on first use."""
+    global _log_writer_started, _dropped_log_entries
+    if not _log_writer_started:
+        with _log_writer_lock:
+            if not _log_writer_started:
+                threading.Thread(target=_request_log_writer, args=(_log_queue,),
+                                 name='request-log-writer', daemon=True).start()
+                _log_writer_started = True
+    
+    try:
+        _log_queue.put_nowait(entry)
+    except queue.Full:
+        with _log_writer_lock:
+            _dropped_log_entries += 1
+            dropped = _dropped_log_entries
+        app.logger.warning("Request log queue full; %d log entries dropped so far", dropped)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -84,45 +238,16 @@ def validate_request():
             return jsonify({'error': 'Empty request_line'}), 400
         
         # Validate the request using CFG parser
-        validation_result = cfg_parser.validate_request(request_line)
+        validation_result = validate_request_line(request_line)
         
-        # Log the request to database
-        try:
-            request_log = RequestLog(
-                request_line=request_line,
-                is_valid=validation_result['is_valid'],
-                tokens=validation_result['tokens'],
-                parse_trees=validation_result['parse_trees'],
-                errors=validation_result['errors'],
-                ip_address=request.remote_addr,
-                user_agent=request.headers.get('User-Agent', '')[:500],
-                session_id=get_session_id()
-            )
-            db.session.add(request_log)
-            
-            # Update user session
-            user_session = get_or_create_user_session()
-            user_session.update_activity(validation_result['is_valid'])
-            
-            # Update error pattern counts
-            if not validation_result['is_valid']:
-                for error_msg in validation_result['errors']:
-                    error_pattern = ErrorPattern.query.filter_by(error_message=error_msg).first()
-                    if error_pattern:
-                        error_pattern.occurrence_count += 1
-                    else:
-                        # Create new error pattern (basic entry)
-                        error_pattern = ErrorPattern(
-                            error_message=error_msg,
-                            description=f"Error: {error_msg}"
-                        )
-                        db.session.add(error_pattern)
-            
-            db.session.commit()
-            
-        except Exception as e:
-            db.session.rollback()
-            print(f"Database error: {e}")
+        # Log the request to database in the background
+        _enqueue_request_log({
+            'request_line': request_line,
+            'validation_result': validation_result,
+            'ip_address': request.remote_addr,
+            'user_agent': request.headers.get('User-Agent', '')[:500],
+            'session_id': get_session_id()
+        })
         
         return jsonify(validation_result)
         
@@ -189,7 +314,7 @@ def get_analytics():
         if days < 1 or days > 365:
             days = 7
         
-        analytics = get_analytics_summary(days)
+        analytics = _analytics_summary(days)
         return jsonify(analytics)
     except Exception as e:
         return jsonify({'error': f'Analytics error: {str(e)}'}), 500
@@ -201,7 +326,7 @@ def get_detailed_analytics():
         days = request.args.get('days', 7, type=int)
         limit = request.args.get('limit', 100, type=int)
         
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff_date = utc_cutoff(timedelta(days=days))
         
         # Get recent logs
         logs = RequestLog.query.filter(
@@ -209,7 +334,7 @@ def get_detailed_analytics():
         ).order_by(RequestLog.timestamp.desc()).limit(limit).all()
         
         # Get analytics summary
-        analytics = get_analytics_summary(days)
+        analytics = _analytics_summary(days)
         
         return jsonify({
             'analytics': analytics,
@@ -252,25 +377,31 @@ def get_session_info():
 def get_stats_summary():
     """Get quick statistics summary."""
     try:
-        total_requests = RequestLog.query.count()
-        valid_requests = RequestLog.query.filter_by(is_valid=True).count()
-        total_sessions = UserSession.query.count()
-        
-        # Recent activity (last 24 hours)
-        recent_cutoff = datetime.utcnow() - timedelta(hours=24)
-        recent_requests = RequestLog.query.filter(RequestLog.timestamp >= recent_cutoff).count()
-        
-        return jsonify({
-            'total_requests': total_requests,
-            'valid_requests': valid_requests,
-            'invalid_requests': total_requests - valid_requests,
-            'success_rate': (valid_requests / total_requests * 100) if total_requests > 0 else 0,
-            'total_sessions': total_sessions,
-            'recent_requests_24h': recent_requests
-        })
+        return jsonify(_cached_summary('stats', _stats_summary))
     except Exception as e:
         return jsonify({'error': f'Stats error: {str(e)}'}), 500
 
+def _stats_summary() -> Dict[str, Any]:
+    """Compute the quick statistics summary."""
+    # Totals, valid requests and recent activity (last 24 hours) in one scan
+    recent_cutoff = utc_cutoff(timedelta(hours=24))
+    counts = db.session.execute(select(
+        func.count(RequestLog.id),
+        func.coalesce(func.sum(case((RequestLog.is_valid, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((RequestLog.timestamp >= recent_cutoff, 1), else_=0)), 0)
+    )).one()
+    total_requests, valid_requests, recent_requests = counts
+    total_sessions = db.session.execute(select(func.count(UserSession.id))).scalar()
+    
+    return {
+        'total_requests': total_requests,
+        'valid_requests': valid_requests,
+        'invalid_requests': total_requests - valid_requests,
+        'success_rate': (valid_requests / total_requests * 100) if total_requests > 0 else 0,
+        'total_sessions': total_sessions,
+        'recent_requests_24h': recent_requests
+    }
+
 @app.route('/api/validate/batch', methods=['POST'])
 def validate_batch():
     """
@@ -294,29 +425,37 @@ def validate_batch():
             return jsonify({'error': 'Maximum 50 requests per batch'}), 400
         
         results = []
+        log_rows = []
+        ip_address = request.remote_addr
+        user_agent = request.headers.get('User-Agent', '')[:500]
+        session_id = get_session_id()
         for req_line in requests_list:
             if isinstance(req_line, str) and req_line.strip():
-                validation_result = cfg_parser.validate_request(req_line.strip())
+                validation_result = validate_request_line(req_line.strip())
                 results.append(validation_result)
                 
                 # Log to database (simplified for batch)
                 try:
-                    request_log = RequestLog(
+                    log_rows.append(RequestLog.as_row(
                         request_line=req_line.strip(),
                         is_valid=validation_result['is_valid'],
                         tokens=validation_result['tokens'],
                         parse_trees=validation_result['parse_trees'],
                         errors=validation_result['errors'],
-                        ip_address=request.remote_addr,
-                        user_agent=request.headers.get('User-Agent', '')[:500],
-                        session_id=get_session_id()
-                    )
-                    db.session.add(request_log)
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                        session_id=session_id
+                    ))
                 except Exception as e:
                     print(f"Error logging batch request: {e}")
         
+        # One executemany for the whole batch instead of a unit-of-work
+        # flush per ORM object
         try:
+            if log_rows:
+                db.session.execute(insert(RequestLog), log_rows)
             db.session.commit()
+            _invalidate_summary('stats')
         except Exception as e:
             db.session.rollback()
             print(f"Error committing batch: {e}")
@@ -329,6 +468,46 @@ def validate_batch():
     except Exception as e:
         return jsonify({'error': f'Batch validation error: {str(e)}'}), 500
 
+@app.route('/api/cache/clear', methods=['POST'])
+def clear_validation_cache():
+    """Drop cached validation results, e.g. after the grammar changes.
+    
+    Requires the configured ADMIN_TOKEN in the X-Admin-Token header; without
+    a configured token the endpoint does not exist.
+    """
+    admin_token = app.config.get('ADMIN_TOKEN')
+    if not admin_token:
+        return jsonify({'error': 'Endpoint not found'}), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode('utf-8'),
+                               admin_token.encode('utf-8')):
+        return jsonify({'error': 'Invalid admin token'}), 403
+    
+    info = _cached_validate.cache_info()
+    _cached_validate.cache_clear()
+    return jsonify({
+        'cleared': info.currsize,
+        'hits': info.hits,
+        'misses': info.misses
+    })
+
+# Simple rule-based responses (mock AI), checked in order; the first keyword
+# found anywhere in the lowercased question wins
+_AI_HELP_RESPONSES = (
+    ('cfg', "CFG (Context-Free Grammar) is a formal grammar where each production rule has a single non-terminal on the left side. In our HTTP validator, we use CFG to define the structure of valid HTTP GET requests."),
+    ('http', "HTTP (HyperText Transfer Protocol) is the foundation of data communication on the web. A GET request retrieves data from a server using the format: GET /path HTTP/version"),
+    ('grammar', "Our grammar defines: RequestLine → GET SP RequestTarget SP HTTPVersion, where SP is a space, RequestTarget can be '/' or '/filename', and HTTPVersion is HTTP/1.0, HTTP/1.1, or HTTP/2.0"),
+    ('error', "Common errors include: missing spaces, invalid HTTP methods (only GET is supported), invalid filenames (only index.html, about.html, contact.html, style.css are allowed), and invalid HTTP versions."),
+    ('example', "Valid examples: 'GET / HTTP/1.1', 'GET /index.html HTTP/2.0'. Invalid examples: 'POST /index.html HTTP/1.1', 'GET index.html HTTP/1.1'")
+)
+
+_AI_HELP_DEFAULT = "I'm here to help with CFG rules and HTTP syntax! You can ask about CFG concepts, HTTP request structure, grammar rules, common errors, or request examples."
+
+_AI_HELP_LINKS = (
+    {'title': 'CFG Grammar Rules', 'url': '/grammar'},
+    {'title': 'Request Examples', 'url': '/examples'},
+    {'title': 'Error Patterns', 'url': '/errors'}
+)
+
 @app.route('/api/ai/help', methods=['POST'])
 def ai_help():
     """
@@ -342,18 +521,8 @@ def ai_help():
         
         question = data['question'].lower().strip()
         
-        # Simple rule-based responses (mock AI)
-        responses = {
-            'cfg': "CFG (Context-Free Grammar) is a formal grammar where each production rule has a single non-terminal on the left side. In our HTTP validator, we use CFG to define the structure of valid HTTP GET requests.",
-            'http': "HTTP (HyperText Transfer Protocol) is the foundation of data communication on the web. A GET request retrieves data from a server using the format: GET /path HTTP/version",
-            'grammar': "Our grammar defines: RequestLine → GET SP RequestTarget SP HTTPVersion, where SP is a space, RequestTarget can be '/' or '/filename', and HTTPVersion is HTTP/1.0, HTTP/1.1, or HTTP/2.0",
-            'error': "Common errors include: missing spaces, invalid HTTP methods (only GET is supported), invalid filenames (only index.html, about.html, contact.html, style.css are allowed), and invalid HTTP versions.",
-            'example': "Valid examples: 'GET / HTTP/1.1', 'GET /index.html HTTP/2.0'. Invalid examples: 'POST /index.html HTTP/1.1', 'GET index.html HTTP/1.1'"
-        }
-        
-        response = "I'm here to help with CFG rules and HTTP syntax! You can ask about CFG concepts, HTTP request structure, grammar rules, common errors, or request examples."
-        
-        for keyword, answer in responses.items():
+        response = _AI_HELP_DEFAULT
+        for keyword, answer in _AI_HELP_RESPONSES:
             if keyword in question:
                 response = answer
                 break
@@ -361,11 +530,7 @@ def ai_help():
         return jsonify({
             'question': data['question'],
             'answer': response,
-            'helpful_links': [
-                {'title': 'CFG Grammar Rules', 'url': '/grammar'},
-                {'title': 'Request Examples', 'url': '/examples'},
-                {'title': 'Error Patterns', 'url': '/errors'}
-            ]
+            'helpful_links': _AI_HELP_LINKS
         })
         
     except Exception as e:
@@ -5,7 +5,6 @@ This module implements a Context-Free Grammar parser specifically designed
 to validate HTTP GET requests according to predefined grammar rules.
 """
 
-import nltk
 from nltk import CFG, ChartParser
 from typing import Dict, List, Any, Optional, Tuple
 import re
@@ -454,25 +453,3 @@ class HTTPRequestCFGParser:
         ]
         
         return examples
-
-# Initialize NLTK data (download required packages)
-def initialize_nltk():
-    """Download required NLTK data packages."""
-    try:
-        import ssl
-        try:
-            _create_unverified_https_context = ssl._create_unverified_context
-        except AttributeError:
-            pass
-        else:
-            ssl._create_default_https_context = _create_unverified_https_context
-        
-        nltk.download('punkt', quiet=True)
-        nltk.download('averaged_perceptron_tagger', quiet=True)
-        return True
-    except Exception as e:
-        print(f"Warning: Could not download NLTK data: {e}")
-        return False
-
-# Initialize NLTK when module is imported
-initialize_nltk()
\ No newline at end of file
@@ -160,6 +160,7 @@ class ComprehensiveAnalysisEngine:
             # Convert parse tree to TreeNode format for visualization
             root_node = self._convert_to_tree_node(cfg_result['parse_tree'])
             if root_node:
+                root_node.freeze()
                 parse_tree_viz = self.visualizer.generate_parse_tree_visualization(
                     root_node, cfg_result.get('grammar_rules', {})
                 )
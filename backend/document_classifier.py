@@ -64,12 +64,17 @@ class DocumentClassifier:
         self.is_trained = False
         
     def classify(self, document_text: str, 
-                method: ClassificationMethod = ClassificationMethod.RULE_BASED) -> ClassificationResult:
-        """Classify a document using the specified method."""
+                method: ClassificationMethod = ClassificationMethod.RULE_BASED,
+                words: Optional[List[str]] = None) -> ClassificationResult:
+        """Classify a document using the specified method.
+        
+        `words` may carry the document's already tokenized content words (lowercased,
+        alphanumeric, stop words removed) to skip tokenizing it again.
+        """
         start_time = datetime.now()
         
         # Extract features
-        features = self._extract_features(document_text)
+        features = self._extract_features(document_text, words)
         
         # Classify based on method
         if method == ClassificationMethod.RULE_BASED:
@@ -92,10 +97,11 @@ class DocumentClassifier:
             timestamp=datetime.now().isoformat()
         )
     
-    def _extract_features(self, text: str) -> Dict[str, Any]:
+    def _extract_features(self, text: str, filtered_words: Optional[List[str]] = None) -> Dict[str, Any]:
         """Extract features from document."""
-        words = word_tokenize(text.lower())
-        filtered_words = [word for word in words if word.isalnum() and word not in self.stop_words]
+        if filtered_words is None:
+            words = word_tokenize(text.lower())
+            filtered_words = [word for word in words if word.isalnum() and word not in self.stop_words]
         
         features = {
             'word_count': Counter(filtered_words),
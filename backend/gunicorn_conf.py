@@ -0,0 +1,31 @@
+"""
+Gunicorn configuration for the CFG-Based HTTP GET Request Validator
+
+Runs the Flask app from wsgi.py on gevent workers, so requests waiting on
+database I/O yield to each other instead of holding a worker each.
+
+Usage:
+    gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# SQLite allows a single writer at a time, so extra processes only queue up
+# on its lock; other databases get the usual (2 x cores) + 1
+if os.environ.get('DATABASE_URL', 'sqlite:///').startswith('sqlite'):
+    _default_workers = 2
+else:
+    _default_workers = 2 * multiprocessing.cpu_count() + 1
+workers = int(os.environ.get('WEB_CONCURRENCY', _default_workers))
+
+worker_class = 'gevent'
+worker_connections = 1000
+keepalive = 5
+timeout = 30
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
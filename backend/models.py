@@ -6,17 +6,34 @@ analytics data, and user interactions.
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.engine import Engine
+from datetime import datetime, timedelta
 import json
+import sqlite3
 from typing import Dict, Any, List, Optional
 
 db = SQLAlchemy()
 
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Let SQLite readers run alongside the writer and keep a larger page cache."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA cache_size=-64000')
+        cursor.close()
+
 class RequestLog(db.Model):
     """
     Model for storing HTTP request validation logs.
     """
     __tablename__ = 'request_logs'
+    __table_args__ = (
+        # Analytics filter on a time window, often together with validity
+        db.Index('ix_reqlog_ts_valid', 'timestamp', 'is_valid'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     request_line = db.Column(db.Text, nullable=False)
@@ -32,14 +49,29 @@ class RequestLog(db.Model):
     def __init__(self, request_line: str, is_valid: bool, tokens: List[str] = None,
                  parse_trees: List[Dict] = None, errors: List[str] = None,
                  ip_address: str = None, user_agent: str = None, session_id: str = None):
-        self.request_line = request_line
-        self.is_valid = is_valid
-        self.tokens = json.dumps(tokens) if tokens else None
-        self.parse_trees = json.dumps(parse_trees) if parse_trees else None
-        self.errors = json.dumps(errors) if errors else None
-        self.ip_address = ip_address
-        self.user_agent = user_agent
-        self.session_id = session_id
+        super().__init__(**self.as_row(request_line, is_valid, tokens, parse_trees, errors,
+                                       ip_address, user_agent, session_id))
+    
+    @staticmethod
+    def as_row(request_line: str, is_valid: bool, tokens: List[str] = None,
+               parse_trees: List[Dict] = None, errors: List[str] = None,
+               ip_address: str = None, user_agent: str = None,
+               session_id: str = None) -> Dict[str, Any]:
+        """
+        Build the column values for a log entry without creating a model instance.
+        
+        Used for bulk inserts; takes the same arguments as the constructor.
+        """
+        return {
+            'request_line': request_line,
+            'is_valid': is_valid,
+            'tokens': json.dumps(tokens) if tokens else None,
+            'parse_trees': json.dumps(parse_trees) if parse_trees else None,
+            'errors': json.dumps(errors) if errors else None,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'session_id': session_id
+        }
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the model to a dictionary for JSON serialization."""
@@ -67,35 +99,42 @@ class RequestLog(db.Model):
         Returns:
             Dict[str, Any]: Statistics dictionary
         """
-        from datetime import timedelta
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff_date = utc_cutoff(timedelta(days=days))
+        in_period = RequestLog.timestamp >= cutoff_date
         
-        logs = RequestLog.query.filter(RequestLog.timestamp >= cutoff_date).all()
+        # Daily breakdown, counted by the database; the totals follow from it
+        day = func.date(RequestLog.timestamp)
+        daily_counts = db.session.execute(
+            select(day, RequestLog.is_valid, func.count(RequestLog.id))
+            .where(in_period)
+            .group_by(day, RequestLog.is_valid)
+            .order_by(day)
+        ).all()
         
-        total_requests = len(logs)
-        valid_requests = sum(1 for log in logs if log.is_valid)
+        total_requests = 0
+        valid_requests = 0
+        daily_stats = {}
+        for date, is_valid, count in daily_counts:
+            total_requests += count
+            if is_valid:
+                valid_requests += count
+            if date is None:
+                continue
+            day_stats = daily_stats.setdefault(str(date), {'valid': 0, 'invalid': 0, 'total': 0})
+            day_stats['total'] += count
+            day_stats['valid' if is_valid else 'invalid'] += count
         invalid_requests = total_requests - valid_requests
         
-        # Error analysis
+        # Error analysis; only the error lists of invalid requests are loaded
         error_counts = {}
-        for log in logs:
-            if not log.is_valid and log.errors:
-                errors = json.loads(log.errors)
-                for error in errors:
-                    error_counts[error] = error_counts.get(error, 0) + 1
-        
-        # Daily breakdown
-        daily_stats = {}
-        for log in logs:
-            date_str = log.timestamp.strftime('%Y-%m-%d')
-            if date_str not in daily_stats:
-                daily_stats[date_str] = {'valid': 0, 'invalid': 0, 'total': 0}
-            
-            daily_stats[date_str]['total'] += 1
-            if log.is_valid:
-                daily_stats[date_str]['valid'] += 1
-            else:
-                daily_stats[date_str]['invalid'] += 1
+        error_lists = db.session.execute(
+            select(RequestLog.errors)
+            .where(in_period, RequestLog.is_valid == False, RequestLog.errors.isnot(None))
+            .order_by(RequestLog.timestamp, RequestLog.id)
+        ).scalars()
+        for errors in error_lists:
+            for error in json.loads(errors):
+                error_counts[error] = error_counts.get(error, 0) + 1
         
         return {
             'total_requests': total_requests,
@@ -112,6 +151,10 @@ class ErrorPattern(db.Model):
     Model for tracking common error patterns and their explanations.
     """
     __tablename__ = 'error_patterns'
+    # error_message is already unique-indexed; this serves the most-frequent listing
+    __table_args__ = (
+        db.Index('ix_errpat_count', db.desc('occurrence_count')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     error_message = db.Column(db.String(500), nullable=False, unique=True)
@@ -203,6 +246,12 @@ def init_db(app):
         # Create all tables
         db.create_all()
         
+        # create_all skips tables that already exist, so add any indexes
+        # declared since an existing database was created
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+        
         # Populate default error patterns
         populate_default_error_patterns()
 
@@ -279,6 +328,58 @@ def populate_default_error_patterns():
         db.session.rollback()
         print(f"Error populating default patterns: {e}")
 
+def utc_cutoff(delta: timedelta):
+    """
+    Get the UTC time `delta` ago for comparing against timestamp columns.
+    
+    On SQLite and PostgreSQL the time is computed by the database in the
+    query itself; other backends get a bound value computed here.
+    
+    Args:
+        delta (timedelta): How far back the cutoff lies
+        
+    Returns:
+        A SQL expression or datetime usable in a filter
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return func.datetime('now', f'-{int(delta.total_seconds())} seconds')
+    if dialect == 'postgresql':
+        return func.timezone('UTC', func.now()) - delta
+    return datetime.utcnow() - delta
+
+def record_error_occurrences(errors: List[str]) -> None:
+    """
+    Count one occurrence of each error message, creating patterns for new ones.
+    
+    Known messages are looked up with a single IN query and incremented with
+    a single UPDATE; unknown ones get a basic pattern in one bulk INSERT.
+    Repeated messages in `errors` count once. Changes are left uncommitted.
+    
+    Args:
+        errors (List[str]): Error messages from one validation
+    """
+    messages = list(dict.fromkeys(errors))
+    if not messages:
+        return
+    
+    known = set(db.session.scalars(
+        select(ErrorPattern.error_message).where(ErrorPattern.error_message.in_(messages))
+    ))
+    if known:
+        db.session.execute(
+            update(ErrorPattern)
+            .where(ErrorPattern.error_message.in_(known))
+            .values(occurrence_count=ErrorPattern.occurrence_count + 1)
+        )
+    
+    new_messages = [message for message in messages if message not in known]
+    if new_messages:
+        db.session.execute(insert(ErrorPattern), [
+            {'error_message': message, 'description': f"Error: {message}"}
+            for message in new_messages
+        ])
+
 def get_analytics_summary(days: int = 30) -> Dict[str, Any]:
     """
     Get a comprehensive analytics summary.
@@ -291,12 +392,8 @@ def get_analytics_summary(days: int = 30) -> Dict[str, Any]:
     """
     stats = RequestLog.get_validation_stats(days)
     
-    # Get top error patterns
-    from datetime import timedelta
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-    recent_logs = RequestLog.query.filter(RequestLog.timestamp >= cutoff_date).all()
-    
     # Get session statistics
+    cutoff_date = utc_cutoff(timedelta(days=days))
     session_count = UserSession.query.filter(UserSession.last_request >= cutoff_date).count()
     avg_requests_per_session = stats['total_requests'] / session_count if session_count > 0 else 0
     
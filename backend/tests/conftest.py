@@ -51,6 +51,12 @@ def cfg_parser():
     from cfg_parser import HTTPRequestCFGParser
     return HTTPRequestCFGParser()
 
+@pytest.fixture
+def advanced_cfg_parser():
+    """Fixture providing an advanced RFC 7230 CFG parser instance."""
+    from advanced_cfg_parser import AdvancedHTTPRequestCFGParser
+    return AdvancedHTTPRequestCFGParser()
+
 @pytest.fixture
 def nfa_engine():
     """Fixture providing an NFA engine instance."""
@@ -81,6 +87,12 @@ def pda_parser():
     from pda_parser import HTTPRequestPDA
     return HTTPRequestPDA()
 
+@pytest.fixture
+def visualizer():
+    """Fixture providing an advanced visualizer instance."""
+    from advanced_visualizer import AdvancedVisualizer
+    return AdvancedVisualizer()
+
 @pytest.fixture
 def valid_requests():
     """Fixture providing valid HTTP request test data."""
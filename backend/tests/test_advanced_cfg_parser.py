@@ -0,0 +1,202 @@
+"""
+Test suite for the Advanced CFG Parser module.
+
+Tests the FSA lexical analyzer and the RFC 7230 recursive-descent parser,
+including multi-method requests, header fields and message bodies.
+"""
+
+import pytest
+import sys
+import os
+
+# Add backend to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from advanced_cfg_parser import LexicalAnalyzer, validate_request_cached
+
+
+FULL_REQUEST = (
+    "POST /api/users HTTP/1.1\r\n"
+    "Host: example.com\r\n"
+    "Content-Type: application/json\r\n"
+    "Connection: keep-alive\r\n"
+    "\r\n"
+    '{"name": "test"}'
+)
+
+
+class TestLexicalAnalyzer:
+    """Test cases for the FSA-based lexical analyzer."""
+    
+    def test_request_line_tokens(self):
+        """Test tokenization of a bare request line."""
+        tokens = LexicalAnalyzer().tokenize("GET /index.html HTTP/1.1")
+        assert [t.type for t in tokens] == ['METHOD', 'URI', 'HTTP_VERSION']
+        assert [t.value for t in tokens] == ['GET', '/index.html', 'HTTP/1.1']
+        
+    def test_full_request_tokens(self):
+        """Test tokenization of headers and message body."""
+        tokens = LexicalAnalyzer().tokenize(FULL_REQUEST)
+        types = [t.type for t in tokens]
+        assert types.count('HEADER_NAME') == 3
+        assert types.count('HEADER_VALUE') == 3
+        assert types[-1] == 'MESSAGE_BODY'
+        assert tokens[-1].value == '{"name": "test"}'
+        
+    def test_column_storage(self):
+        """Test token columns stay parallel and match the materialized tokens."""
+        lexer = LexicalAnalyzer()
+        tokens = lexer.tokenize(FULL_REQUEST)
+        assert lexer.types == [t.type for t in tokens]
+        assert lexer.values == [t.value for t in tokens]
+        assert [d['type'] for d in lexer.to_dicts()] == lexer.types
+        
+    def test_invalid_character(self):
+        """Test invalid characters produce INVALID tokens."""
+        tokens = LexicalAnalyzer().tokenize("GET index.html HTTP/1.1")
+        assert any(t.type == 'INVALID' for t in tokens)
+
+
+class TestAdvancedCFGParser:
+    """Test cases for the RFC 7230 request parser."""
+    
+    @pytest.mark.parametrize("request_text", [
+        "GET / HTTP/1.1",
+        "HEAD /index.html HTTP/1.0",
+        "DELETE /api/users/1 HTTP/2.0\nHost: example.com",
+        FULL_REQUEST,
+    ])
+    def test_valid_requests(self, advanced_cfg_parser, request_text):
+        """Test well-formed requests are accepted."""
+        result = advanced_cfg_parser.validate_request(request_text)
+        assert result['is_valid'] == True, result['errors']
+        assert result['errors'] == []
+        assert len(result['parse_trees']) == 1
+        
+    @pytest.mark.parametrize("request_text", [
+        "",
+        "GET",
+        "GET /",
+        "FETCH / HTTP/1.1",
+        "GET / HTTP/1.5",
+        "GET index.html HTTP/1.1",
+        "GET / HTTP/1.1\nHost",
+    ])
+    def test_invalid_requests(self, advanced_cfg_parser, request_text):
+        """Test malformed requests are rejected with errors."""
+        result = advanced_cfg_parser.validate_request(request_text)
+        assert result['is_valid'] == False
+        assert len(result['errors']) > 0
+        
+    def test_parse_tree_structure(self, advanced_cfg_parser, test_helpers):
+        """Test the parse tree mirrors the RFC 7230 productions."""
+        result = advanced_cfg_parser.validate_request(FULL_REQUEST)
+        tree = result['parse_trees'][0]
+        test_helpers.assert_parse_tree_structure(tree)
+        
+        assert tree['label'] == 'HTTPMessage'
+        labels = [child['label'] for child in tree['children']]
+        assert labels == ['RequestLine', 'Headers', 'CRLF', 'MessageBody']
+        
+        headers = tree['children'][1]['children']
+        assert [h['children'][0]['children'][0]['label'] for h in headers] == \
+            ['Host', 'Content-Type', 'Connection']
+        
+    def test_semantic_and_network_analysis(self, advanced_cfg_parser):
+        """Test semantic and network analysis of a full request."""
+        result = advanced_cfg_parser.validate_request(FULL_REQUEST)
+        
+        method_analysis = result['semantic_analysis']['method_analysis']
+        assert method_analysis['method'] == 'POST'
+        assert method_analysis['is_safe'] == False
+        
+        network = result['network_analysis']
+        assert network['http_version_analysis']['version'] == 'HTTP/1.1'
+        assert network['connection_analysis']['connection_header']['keep_alive'] == True
+        assert network['content_analysis']['content_type'] == 'application/json'
+        assert network['content_analysis']['has_body'] == True
+        
+    def test_header_requirements(self, advanced_cfg_parser):
+        """Test required and forbidden header checks per method."""
+        result = advanced_cfg_parser.validate_request(FULL_REQUEST)
+        header_analysis = result['semantic_analysis']['header_analysis']
+        assert header_analysis['has_host'] == True
+        assert header_analysis['missing_required'] == ['Content-Length']
+        assert any('Content-Length' in w for w in result['warnings'])
+        
+        result = advanced_cfg_parser.validate_request("TRACE / HTTP/1.1\nContent-Length: 0")
+        assert result['semantic_analysis']['header_analysis']['forbidden_present'] == ['Content-Length']
+        
+    def test_grammar_rules_retrieval(self, advanced_cfg_parser):
+        """Test grammar rules can be retrieved."""
+        rules = advanced_cfg_parser.get_enhanced_grammar_rules()
+        assert len(rules) > 0
+        for rule in rules:
+            assert 'lhs' in rule
+            assert 'rhs' in rule
+            assert 'rule' in rule
+        
+    def test_grammar_compiled_once(self, advanced_cfg_parser):
+        """Test instances share the class-level compiled grammar and parser."""
+        from advanced_cfg_parser import AdvancedHTTPRequestCFGParser
+        other = AdvancedHTTPRequestCFGParser()
+        assert other.grammar is advanced_cfg_parser.grammar
+        assert other.parser is advanced_cfg_parser.parser
+        assert other.get_enhanced_grammar_rules() is advanced_cfg_parser.get_enhanced_grammar_rules()
+        
+    def test_fast_path_rejection(self, advanced_cfg_parser):
+        """Test non-HTTP input is rejected before lexical analysis."""
+        result = advanced_cfg_parser.validate_request("hello world")
+        assert result['is_valid'] == False
+        assert result['tokens'] == []
+        assert len(result['errors']) == 1
+        
+    def test_full_diagnostics(self, advanced_cfg_parser):
+        """Test the chart parser adds diagnostics for rejected requests."""
+        request = "GET / HTTP/1.1\nHost"
+        quick = advanced_cfg_parser.validate_request(request)
+        full = advanced_cfg_parser.validate_request(request, full_diagnostics=True)
+        assert full['is_valid'] == False
+        assert len(full['errors']) > len(quick['errors'])
+        
+    @pytest.mark.parametrize("request_text", [
+        "GET / HTTP/1.1",
+        "GET / HTTP/1.1\nHost: example.com",
+        FULL_REQUEST,
+    ])
+    def test_token_grammar_agrees(self, advanced_cfg_parser, request_text):
+        """Test the token-level chart grammar accepts what the RFC 7230 parser accepts."""
+        lexer = LexicalAnalyzer()
+        lexer.scan(request_text)
+        trees, errors = advanced_cfg_parser._chart_parse(lexer.types, lexer.values)
+        assert errors == []
+        assert len(trees) == 1
+        
+    def test_tree_to_dict_deep_tree(self, advanced_cfg_parser):
+        """Test tree conversion handles trees deeper than the recursion limit."""
+        from nltk import Tree
+        tree = Tree('Leaf', ['x'])
+        for _ in range(sys.getrecursionlimit() + 100):
+            tree = Tree('Node', [tree])
+        node = advanced_cfg_parser._tree_to_dict(tree)
+        depth = 0
+        while node['children']:
+            node = node['children'][0]
+            depth += 1
+        assert node['label'] == 'x'
+        assert depth == sys.getrecursionlimit() + 101
+
+
+class TestValidateRequestCached:
+    """Test the memoized validation entry point."""
+    
+    def test_repeated_request_reuses_result(self):
+        """Test identical request text returns the same read-only result."""
+        validate_request_cached.cache_clear()
+        first = validate_request_cached(FULL_REQUEST)
+        second = validate_request_cached(FULL_REQUEST)
+        assert first is second
+        assert first['is_valid'] == True
+        assert validate_request_cached.cache_info().hits == 1
+        with pytest.raises(TypeError):
+            first['is_valid'] = False
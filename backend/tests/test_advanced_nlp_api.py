@@ -0,0 +1,236 @@
+"""
+Test suite for the Advanced NLP API infrastructure.
+
+Tests the request plumbing around the NLP endpoints: the token-bucket rate
+limiter, the response cache, async jobs and the Content-Length pre-check.
+The NLP pipelines themselves are replaced where a test only needs their
+result, so these tests do not depend on the NLTK corpora.
+"""
+
+import sys
+import os
+import json
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+
+@pytest.fixture
+def nlp_api(monkeypatch):
+    """The NLP API module with fresh rate limits and caches."""
+    try:
+        import advanced_nlp_api
+    except ImportError:
+        pytest.skip("NLP API not available")
+
+    advanced_nlp_api.app.config['TESTING'] = True
+    monkeypatch.setattr(advanced_nlp_api, 'redis_rate_limit', None)
+    monkeypatch.setattr(advanced_nlp_api, 'rate_limit_store', {})
+    monkeypatch.setattr(advanced_nlp_api, 'response_cache', advanced_nlp_api.ResponseCache())
+    monkeypatch.setattr(advanced_nlp_api, 'job_store', advanced_nlp_api.ResponseCache(maxsize=1000, ttl=600))
+    return advanced_nlp_api
+
+
+@pytest.fixture
+def client(nlp_api):
+    """Test client for the NLP API."""
+    with nlp_api.app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def clock(nlp_api, monkeypatch):
+    """Controllable replacement for time.monotonic, starting at 1000 seconds."""
+    now = [1000.0]
+    monkeypatch.setattr(nlp_api.time, 'monotonic', lambda: now[0])
+    return now
+
+
+SAMPLE_TEXT = ('Context-free grammars describe the structure of HTTP request lines. '
+               'A parser checks each request against the grammar rules.')
+
+
+def post_json(client, url, payload):
+    """POST a JSON payload."""
+    return client.post(url, data=json.dumps(payload), content_type='application/json')
+
+
+class TestRateLimiter:
+    """Test cases for the per-client token bucket."""
+
+    def test_rejects_requests_beyond_limit(self, client, clock):
+        """Test a client gets 429 once its bucket is empty."""
+        # Summarization allows 10 requests per minute; empty payloads are cheap 400s
+        for _ in range(10):
+            assert post_json(client, '/api/v2/summarization/summarize', {}).status_code == 400
+
+        response = post_json(client, '/api/v2/summarization/summarize', {})
+        assert response.status_code == 429
+        assert response.get_json()['error'] == 'Rate limit exceeded'
+
+    def test_bucket_refills_over_time(self, client, clock):
+        """Test tokens come back at limit / window per second."""
+        for _ in range(10):
+            post_json(client, '/api/v2/summarization/summarize', {})
+        assert post_json(client, '/api/v2/summarization/summarize', {}).status_code == 429
+
+        # 10 per minute refills one token every 6 seconds
+        clock[0] += 6
+        assert post_json(client, '/api/v2/summarization/summarize', {}).status_code == 400
+        assert post_json(client, '/api/v2/summarization/summarize', {}).status_code == 429
+
+        # A full window refills the bucket, but never beyond the limit
+        clock[0] += 120
+        statuses = [post_json(client, '/api/v2/summarization/summarize', {}).status_code for _ in range(11)]
+        assert statuses == [400] * 10 + [429]
+
+    def test_limits_are_per_endpoint(self, client, clock):
+        """Test an exhausted endpoint does not limit other endpoints."""
+        for _ in range(11):
+            post_json(client, '/api/v2/summarization/summarize', {})
+
+        assert post_json(client, '/api/v2/classification/classify', {}).status_code == 400
+
+    def test_idle_buckets_are_swept(self, nlp_api, clock, monkeypatch):
+        """Test buckets idle for the sweep interval are dropped."""
+        monkeypatch.setattr(nlp_api, '_last_rate_limit_sweep', clock[0])
+        assert nlp_api.check_rate_limit('idle', 5)
+
+        clock[0] += nlp_api.RATE_LIMIT_SWEEP_INTERVAL
+        assert nlp_api.check_rate_limit('active', 5)
+
+        assert 'idle' not in nlp_api.rate_limit_store
+        assert 'active' in nlp_api.rate_limit_store
+
+
+class TestResponseCache:
+    """Test cases for the response cache."""
+
+    def test_entries_expire_after_ttl(self, nlp_api, clock):
+        """Test a value is served until its TTL passes."""
+        cache = nlp_api.ResponseCache(maxsize=10, ttl=60)
+        cache.set('key', {'value': 1})
+
+        clock[0] += 60
+        assert cache.get('key') == {'value': 1}
+        clock[0] += 1
+        assert cache.get('key') is None
+
+    def test_evicts_least_recently_used(self, nlp_api):
+        """Test the least recently used entry goes once maxsize is exceeded."""
+        cache = nlp_api.ResponseCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1  # 'b' is now least recently used
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+    def test_keys_distinguish_inputs(self, nlp_api):
+        """Test cache keys depend on every part and its position."""
+        make_key = nlp_api.ResponseCache.make_key
+        assert make_key('summarize', 'text', 3) == make_key('summarize', 'text', 3)
+        assert make_key('summarize', 'text', 3) != make_key('summarize', 'text', 4)
+        assert make_key('ab', 'c') != make_key('a', 'bc')
+
+    def test_endpoint_serves_cached_response(self, nlp_api, client):
+        """Test a repeated summarization is answered from the cache."""
+        key = nlp_api.ResponseCache.make_key('summarize', SAMPLE_TEXT, 'tf_idf', 'extractive', 3, None)
+        nlp_api.response_cache.set(key, {'summary': 'cached summary'})
+
+        response = post_json(client, '/api/v2/summarization/summarize', {'text': SAMPLE_TEXT})
+
+        assert response.status_code == 200
+        assert response.get_json() == {'summary': 'cached summary'}
+
+
+class TestAsyncJobs:
+    """Test cases for async jobs and their status endpoint."""
+
+    def submit(self, client):
+        """Submit an async summarization and return its job id."""
+        response = post_json(client, '/api/v2/summarization/summarize', {'text': SAMPLE_TEXT, 'async': True})
+        assert response.status_code == 202
+        data = response.get_json()
+        assert data['status'] == 'pending'
+        assert data['status_url'] == f"/api/v2/jobs/{data['job_id']}"
+        return data['job_id']
+
+    def test_job_lifecycle(self, nlp_api, client, monkeypatch):
+        """Test a job is pending while it runs and then returns its result."""
+        release = threading.Event()
+
+        def slow_summarize(*args):
+            release.wait(5)
+            return {'summary': 'done'}
+
+        monkeypatch.setattr(nlp_api, '_summarize', slow_summarize)
+        job_id = self.submit(client)
+
+        response = client.get(f'/api/v2/jobs/{job_id}')
+        assert response.status_code == 202
+        assert response.get_json()['status'] == 'pending'
+
+        release.set()
+        nlp_api.job_store.get(job_id).result(timeout=5)
+        response = client.get(f'/api/v2/jobs/{job_id}')
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'completed'
+        assert response.get_json()['result'] == {'summary': 'done'}
+
+    def test_failed_job_reports_error_status(self, nlp_api, client, monkeypatch):
+        """Test a job that raised answers with an error status and message."""
+        def failing_summarize(*args):
+            raise ValueError('summarizer exploded')
+
+        monkeypatch.setattr(nlp_api, '_summarize', failing_summarize)
+        job_id = self.submit(client)
+        nlp_api.job_store.get(job_id).exception(timeout=5)
+
+        response = client.get(f'/api/v2/jobs/{job_id}')
+        assert response.status_code == 500
+        data = response.get_json()
+        assert data['status'] == 'failed'
+        assert data['error'] == 'summarizer exploded'
+
+    def test_unknown_job(self, client):
+        """Test polling an unknown job id answers 404."""
+        response = client.get('/api/v2/jobs/does-not-exist')
+        assert response.status_code == 404
+
+    def test_polling_is_not_counted_in_stats(self, nlp_api, client):
+        """Test job polls do not show up in the request statistics."""
+        before = nlp_api.collect_request_stats()
+        client.get('/api/v2/jobs/does-not-exist')
+        after = nlp_api.collect_request_stats()
+
+        assert after['total_requests'] == before['total_requests']
+        assert after['endpoints_usage'].get('get_job') == before['endpoints_usage'].get('get_job')
+
+
+class TestContentLengthCheck:
+    """Test cases for rejecting oversized bodies before parsing them."""
+
+    def test_rejects_oversized_body(self, nlp_api, client, monkeypatch):
+        """Test a body above the worst-case encoded size is rejected with 413 unparsed."""
+        def fail_get_json(*args, **kwargs):
+            raise AssertionError('oversized body was parsed')
+
+        monkeypatch.setattr(nlp_api.app.request_class, 'get_json', fail_get_json)
+        # Query processing accepts 1000 characters: 12 bytes each plus a 64 KiB envelope
+        limit = 1000 * 12 + 64 * 1024
+        body = json.dumps({'query': 'x' * limit})
+
+        response = client.post('/api/v2/query/process', data=body, content_type='application/json')
+
+        assert response.status_code == 413
+        assert str(limit) in response.get_json()['error']
+
+    def test_accepts_body_within_limit(self, client):
+        """Test a body below the limit reaches the usual input validation."""
+        body = json.dumps({'query': ''})
+        response = client.post('/api/v2/query/process', data=body, content_type='application/json')
+        assert response.status_code == 400
@@ -0,0 +1,331 @@
+"""
+Test suite for Advanced Summarization module.
+
+Tests the sentence scoring helpers behind the extractive summarization
+methods. The helpers are pure, so the summarizer is built without loading
+the NLTK corpora its constructor needs.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+import numpy as np
+from collections import Counter
+from scipy import sparse
+
+from advanced_summarization import AdvancedTextSummarizer, TextAnalysis
+
+
+@pytest.fixture
+def summarizer():
+    """Summarizer instance that skips the NLTK setup in __init__."""
+    return AdvancedTextSummarizer.__new__(AdvancedTextSummarizer)
+
+
+class TestLuhnScore:
+    """Test cases for Luhn cluster scoring."""
+
+    def test_empty_sentence(self, summarizer):
+        """Test an empty sentence scores zero."""
+        assert summarizer._calculate_luhn_score([], {'parser'}) == 0.0
+
+    def test_no_significant_words(self, summarizer):
+        """Test a sentence without significant words scores zero."""
+        words = ['the', 'quick', 'brown', 'fox']
+        assert summarizer._calculate_luhn_score(words, {'parser'}) == 0.0
+
+    def test_single_cluster(self, summarizer):
+        """Test a cluster scores significant_count ** 2 / span_length."""
+        words = ['a', 'x', 'a', 'y', 'a']
+        # 3 significant words over a span of 5
+        assert summarizer._calculate_luhn_score(words, {'a'}) == pytest.approx(9 / 5)
+
+    def test_span_excludes_surrounding_words(self, summarizer):
+        """Test the span starts and ends at significant words."""
+        words = ['x', 'x', 'a', 'a', 'x', 'x']
+        assert summarizer._calculate_luhn_score(words, {'a'}) == pytest.approx(4 / 2)
+
+    def test_gap_of_max_gap_joins_cluster(self, summarizer):
+        """Test significant words max_gap words apart share a cluster."""
+        words = ['a', 'x', 'x', 'x', 'x', 'a']
+        # One cluster of 2 over a span of 6, not two singletons scoring 1.0
+        assert summarizer._calculate_luhn_score(words, {'a'}) == pytest.approx(4 / 6)
+
+    def test_gap_above_max_gap_splits_clusters(self, summarizer):
+        """Test a gap larger than max_gap splits clusters and the best one wins."""
+        words = ['a', 'a'] + ['x'] * 5 + ['a', 'x', 'a', 'a']
+        # Clusters score 2 ** 2 / 2 = 2.0 and 3 ** 2 / 4 = 2.25
+        assert summarizer._calculate_luhn_score(words, {'a'}) == pytest.approx(9 / 4)
+
+    def test_max_gap_parameter(self, summarizer):
+        """Test a smaller max_gap splits what the default joins."""
+        words = ['a', 'x', 'x', 'a']
+        assert summarizer._calculate_luhn_score(words, {'a'}) == pytest.approx(4 / 4)
+        assert summarizer._calculate_luhn_score(words, {'a'}, max_gap=1) == pytest.approx(1.0)
+
+
+def make_analysis(sentence_lemmas):
+    """Build a TextAnalysis from each sentence's lemmas."""
+    lemma_vocabulary = {}
+    lemma_ids = [lemma_vocabulary.setdefault(lemma, len(lemma_vocabulary))
+                 for lemmas in sentence_lemmas for lemma in lemmas]
+    sentence_offsets = np.cumsum([0] + [len(lemmas) for lemmas in sentence_lemmas])
+    words = [lemma for lemmas in sentence_lemmas for lemma in lemmas]
+    return TextAnalysis(
+        sentences=[' '.join(lemmas) for lemmas in sentence_lemmas],
+        sentence_words=sentence_lemmas,
+        sentence_tokens=sentence_lemmas,
+        sentence_lemmas=sentence_lemmas,
+        sentence_lemma_sets=[frozenset(lemmas) for lemmas in sentence_lemmas],
+        lemma_vocabulary=lemma_vocabulary,
+        lemma_ids=np.array(lemma_ids, dtype=np.int32),
+        sentence_offsets=sentence_offsets.astype(np.int32),
+        token_ids=np.array(lemma_ids, dtype=np.int32),
+        token_counts=np.bincount(np.array(lemma_ids, dtype=np.int32), minlength=len(lemma_vocabulary)),
+        words=words,
+        word_freq=Counter(words),
+        total_tokens=len(words)
+    )
+
+
+class TestLSAScoring:
+    """Test cases for Latent Semantic Analysis scoring."""
+
+    def test_keeps_top_topics(self, summarizer):
+        """Test scores use min(topics, sentences - 1) singular vectors."""
+        # Disjoint sentences: each is its own topic, with singular value i + 1
+        analysis = make_analysis([[f'w{i}'] * (i + 1) for i in range(5)])
+        scores = [s.score for s in summarizer._lsa_scoring(analysis, '', topics=3)]
+        # Only the 3 strongest topics survive
+        assert scores == pytest.approx([0, 0, 3, 4, 5])
+
+    def test_topics_capped_by_sentence_count(self, summarizer):
+        """Test fewer sentences than topics keep sentences - 1 topics."""
+        analysis = make_analysis([['alpha', 'alpha'], ['beta']])
+        scores = [s.score for s in summarizer._lsa_scoring(analysis, '', topics=3)]
+        # k = 1 drops the weaker topic, which k = 2 would keep as 1.0
+        assert scores == pytest.approx([2, 0])
+
+    def test_single_sentence(self, summarizer):
+        """Test a single sentence keeps one topic instead of none."""
+        analysis = make_analysis([['alpha', 'alpha', 'beta']])
+        scores = summarizer._lsa_scoring(analysis, '', topics=3)
+        assert len(scores) == 1
+        assert scores[0].score == pytest.approx(5 ** 0.5)
+        assert scores[0].metadata['term_vector'] == {'alpha': 2, 'beta': 1}
+
+    def test_empty_vocabulary(self, summarizer):
+        """Test sentences without lemmas score zero."""
+        analysis = make_analysis([[], []])
+        scores = summarizer._lsa_scoring(analysis, '', topics=3)
+        assert [s.score for s in scores] == [0.0, 0.0]
+
+
+class TestPageRank:
+    """Test cases for the TextRank PageRank iteration."""
+
+    def test_symmetric_graph_scores_equally(self, summarizer):
+        """Test sentences of a regular graph share the score evenly."""
+        similarity = sparse.csr_matrix(np.ones((4, 4)) - np.eye(4))
+        scores = summarizer._pagerank(similarity)
+        assert scores == pytest.approx(np.full(4, 0.25))
+
+    def test_column_normalized_stationary_distribution(self, summarizer):
+        """Test scores solve x = (1 - d) / n + d * T @ x for the column-normalized T."""
+        weights = np.array([
+            [0.0, 0.5, 0.2, 0.1],
+            [0.5, 0.0, 0.3, 0.0],
+            [0.2, 0.3, 0.0, 0.4],
+            [0.1, 0.0, 0.4, 0.0],
+        ])
+        damping = 0.85
+        scores = summarizer._pagerank(sparse.csr_matrix(weights), damping=damping, tolerance=1e-12)
+        transition = weights / weights.sum(axis=0)
+        expected = np.linalg.solve(np.eye(4) - damping * transition, np.full(4, (1 - damping) / 4))
+        assert scores == pytest.approx(expected)
+        # Every sentence hands out its whole score, so the total stays 1
+        assert scores.sum() == pytest.approx(1.0)
+
+    def test_hub_scores_highest(self, summarizer):
+        """Test the centre of a star graph outranks its leaves."""
+        weights = np.zeros((4, 4))
+        weights[0, 1:] = weights[1:, 0] = 1.0
+        scores = summarizer._pagerank(sparse.csr_matrix(weights))
+        assert scores[0] > scores[1]
+        assert scores[1:] == pytest.approx(np.full(3, scores[1]))
+
+    def test_isolated_sentence(self, summarizer):
+        """Test a sentence without neighbours keeps only the teleport score."""
+        weights = np.zeros((3, 3))
+        weights[0, 1] = weights[1, 0] = 1.0
+        scores = summarizer._pagerank(sparse.csr_matrix(weights), damping=0.85)
+        assert scores[2] == pytest.approx(0.15 / 3)
+        assert scores[0] == pytest.approx(scores[1])
+
+
+def random_sentence_lemmas(seed, sentences=30, vocabulary=25):
+    """Random sentences over a small vocabulary, including an empty one."""
+    rng = np.random.default_rng(seed)
+    words = [f'w{i}' for i in range(vocabulary)]
+    sentence_lemmas = [list(rng.choice(words, size=rng.integers(1, 12))) for _ in range(sentences)]
+    sentence_lemmas[sentences // 2] = []
+    return sentence_lemmas
+
+
+class TestTfIdfScoring:
+    """Test cases for the sparse TF-IDF scoring."""
+
+    @staticmethod
+    def dense_tfidf(sentence_lemmas):
+        """Reference TF-IDF scores and weights computed term by term."""
+        vocabulary = sorted({lemma for lemmas in sentence_lemmas for lemma in lemmas})
+        n = len(sentence_lemmas)
+        df = {term: sum(1 for lemmas in sentence_lemmas if term in lemmas) for term in vocabulary}
+        scores = []
+        weights = []
+        for lemmas in sentence_lemmas:
+            counts = Counter(lemmas)
+            sentence_weights = {
+                term: count / len(lemmas) * np.log(n / df[term])
+                for term, count in counts.items()
+            }
+            scores.append(sum(sentence_weights.values()) / len(vocabulary))
+            weights.append({term: weight for term, weight in sentence_weights.items() if weight > 0})
+        return scores, weights
+
+    @pytest.mark.parametrize('seed', [0, 1, 2])
+    def test_matches_dense_reference(self, summarizer, seed):
+        """Test sparse scores and weight vectors match the dense computation."""
+        sentence_lemmas = random_sentence_lemmas(seed)
+        expected_scores, expected_weights = self.dense_tfidf(sentence_lemmas)
+
+        scores = summarizer._tfidf_scoring(make_analysis(sentence_lemmas), '')
+
+        assert [s.score for s in scores] == pytest.approx(expected_scores)
+        for score, weights in zip(scores, expected_weights):
+            assert score.metadata['tf_idf_vector'] == pytest.approx(weights)
+            assert score.keywords_count == len(weights)
+
+    def test_term_count_matrix(self, summarizer):
+        """Test the term matrix counts repeated lemmas per sentence."""
+        analysis = make_analysis([['alpha', 'beta', 'alpha'], [], ['beta']])
+        matrix, vocabulary = summarizer._term_count_matrix(analysis)
+
+        assert vocabulary == ['alpha', 'beta']
+        assert matrix.toarray().tolist() == [[2, 1], [0, 0], [0, 1]]
+
+
+class TestSimilarityGraph:
+    """Test cases for the pruned Jaccard similarity graph."""
+
+    @staticmethod
+    def dense_similarity(sentence_lemma_sets, max_neighbours):
+        """Reference graph: all Jaccard similarities, each row cut to its strongest entries."""
+        n = len(sentence_lemma_sets)
+        expected = np.zeros((n, n))
+        for i, a in enumerate(sentence_lemma_sets):
+            row = [(len(a & b) / len(a | b), j) for j, b in enumerate(sentence_lemma_sets)
+                   if j != i and a & b]
+            # Strongest first; ties keep the lower sentence index
+            for similarity, j in sorted(row, key=lambda item: (-item[0], item[1]))[:max_neighbours]:
+                expected[i, j] = similarity
+        return expected
+
+    @pytest.mark.parametrize('max_neighbours', [2, 5, 20])
+    def test_matches_dense_reference(self, summarizer, max_neighbours):
+        """Test the sparse graph keeps exactly the strongest edges of each row."""
+        lemma_sets = [frozenset(lemmas) for lemmas in random_sentence_lemmas(3, sentences=40)]
+
+        graph = summarizer._calculate_sentence_similarity_matrix(lemma_sets, max_neighbours=max_neighbours)
+
+        assert graph.toarray() == pytest.approx(self.dense_similarity(lemma_sets, max_neighbours))
+        assert max(np.diff(graph.indptr)) <= max_neighbours
+
+    def test_sentences_without_shared_lemmas(self, summarizer):
+        """Test sentences sharing nothing have no edges, and none to themselves."""
+        lemma_sets = [frozenset({'a', 'b'}), frozenset({'b', 'c'}), frozenset({'d'}), frozenset()]
+        graph = summarizer._calculate_sentence_similarity_matrix(lemma_sets)
+
+        assert graph.toarray() == pytest.approx(np.array([
+            [0, 1 / 3, 0, 0],
+            [1 / 3, 0, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0],
+        ]))
+
+
+class TestFrequencyScoring:
+    """Test cases for frequency scoring from prefix sums."""
+
+    @pytest.mark.parametrize('seed', [0, 4])
+    def test_matches_per_sentence_mean(self, summarizer, seed):
+        """Test each score is the mean text-wide frequency of the sentence's tokens."""
+        sentence_lemmas = random_sentence_lemmas(seed)
+        analysis = make_analysis(sentence_lemmas)
+        expected = [
+            sum(analysis.word_freq[word] for word in lemmas) / len(lemmas) if lemmas else 0.0
+            for lemmas in sentence_lemmas
+        ]
+
+        scores = summarizer._frequency_based_scoring(analysis, '')
+
+        assert [s.score for s in scores] == pytest.approx(expected)
+        assert scores[len(sentence_lemmas) // 2].score == 0.0
+
+
+class TestSummarizeBatch:
+    """Test cases for batch summarization."""
+
+    TEXTS = [
+        'Grammars describe languages. Parsers check sentences against grammars. '
+        'Valid requests follow the grammar rules closely.',
+        'HTTP requests start with a method. The method is followed by a path. '
+        'The request line ends with the protocol version.',
+        'Caches keep recent results. Repeated requests are answered from the cache. '
+        'Stale entries expire after a while.',
+    ]
+
+    @pytest.fixture
+    def stub_summarizer(self, summarizer, monkeypatch):
+        """Summarizer whose summarize records its arguments instead of running NLTK."""
+        class StubLemmatizer:
+            def lemmatize(self, word):
+                return word
+
+        def fake_summarize(text, **options):
+            return (text, options)
+
+        summarizer.lemmatizer = StubLemmatizer()
+        monkeypatch.setattr(summarizer, 'summarize', fake_summarize)
+        return summarizer
+
+    @pytest.mark.parametrize('max_workers', [None, 1, 4])
+    def test_results_follow_input_order(self, stub_summarizer, max_workers):
+        """Test every text is summarized once with the shared options, in input order."""
+        from advanced_summarization import SummarizationMethod, SummarizationType
+
+        results = stub_summarizer.summarize_batch(self.TEXTS * 3, method=SummarizationMethod.LSA,
+                                                  summary_type=SummarizationType.HYBRID,
+                                                  summary_length=2, max_workers=max_workers)
+
+        assert [text for text, _ in results] == self.TEXTS * 3
+        assert all(options == {'method': SummarizationMethod.LSA,
+                               'summary_type': SummarizationType.HYBRID,
+                               'summary_length': 2,
+                               'compression_ratio': None} for _, options in results)
+
+    def test_threaded_batch_matches_single_calls(self):
+        """Test threaded batch summaries equal summarizing each text on its own."""
+        try:
+            summarizer = AdvancedTextSummarizer()
+        except LookupError:
+            pytest.skip("NLTK corpora not available")
+
+        expected = [summarizer.summarize(text, summary_length=2) for text in self.TEXTS]
+        results = summarizer.summarize_batch(self.TEXTS, summary_length=2, max_workers=3)
+
+        assert [r.summary for r in results] == [r.summary for r in expected]
+        assert [[s.score for s in r.sentence_scores] for r in results] == \
+               [[s.score for s in r.sentence_scores] for r in expected]
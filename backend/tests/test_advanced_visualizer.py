@@ -0,0 +1,116 @@
+"""
+Test suite for the Advanced Visualizer module.
+
+Tests parse tree payload generation, in particular the step-by-step
+derivation built alongside the tree layout and the payload cache.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from advanced_visualizer import AdvancedVisualizer, TreeNode, NodeType
+
+
+def make_node(node_id, label, children=(), rule=None):
+    """Build a tree node; nodes with children are non-terminals."""
+    node_type = NodeType.NON_TERMINAL if children else NodeType.TERMINAL
+    return TreeNode(id=node_id, label=label, node_type=node_type,
+                    children=list(children), production_rule=rule)
+
+
+def repeated_label_tree():
+    """S -> A A, A -> a, A -> B a, B -> a: siblings share the label A."""
+    return make_node('s', 'S', [
+        make_node('a1', 'A', [make_node('t1', 'a')], 'A -> a'),
+        make_node('a2', 'A', [
+            make_node('b', 'B', [make_node('t2', 'a')], 'B -> a'),
+            make_node('t3', 'a')
+        ], 'A -> B a')
+    ], 'S -> A A')
+
+
+class TestParseTreeDerivation:
+    """Test cases for derivation steps in parse tree payloads."""
+    
+    def test_leftmost_derivation_with_repeated_labels(self, visualizer):
+        """Test each step sees the current sentential form and its own offset."""
+        payload = visualizer.generate_parse_tree_visualization(repeated_label_tree(), {})
+        steps = [(step['current_string'], step['position'], step['replaced_symbol'], step['replacement'])
+                 for step in payload['derivation_steps']]
+        
+        assert steps == [
+            ('S', 0, 'S', 'A A'),
+            ('A A', 0, 'A', 'a'),
+            # The second A is found at offset 2, not at the first 'A'
+            ('a A', 2, 'A', 'B a'),
+            ('a B a', 2, 'B', 'a')
+        ]
+        assert [step['step_number'] for step in payload['derivation_steps']] == [1, 2, 3, 4]
+        assert payload['derivation_truncated'] == False
+        
+    def test_unexpanded_symbols_keep_their_width(self, visualizer):
+        """Test a subtree without a rule is left as its label in the derivation."""
+        tree = make_node('s', 'S', [
+            make_node('x', 'XY', [make_node('t1', 'x')]),  # no production rule
+            make_node('a', 'A', [make_node('t2', 'a')], 'A -> a')
+        ], 'S -> XY A')
+        payload = visualizer.generate_parse_tree_visualization(tree, {})
+        steps = [(step['current_string'], step['position']) for step in payload['derivation_steps']]
+        
+        assert steps == [('S', 0), ('XY A', 3)]
+        
+    def test_derivation_truncated(self):
+        """Test derivation stops at MAX_DERIVATION_STEPS and reports it."""
+        class LimitedVisualizer(AdvancedVisualizer):
+            MAX_DERIVATION_STEPS = 2
+        
+        payload = LimitedVisualizer().generate_parse_tree_visualization(repeated_label_tree(), {})
+        
+        assert [step['current_string'] for step in payload['derivation_steps']] == ['S', 'A A']
+        assert payload['derivation_truncated'] == True
+        # The tree itself is still laid out in full
+        assert len(payload['nodes']) == 7
+
+
+class TestParseTreeCache:
+    """Test cases for the parse tree payload cache."""
+    
+    def test_repeated_tree_hits_cache(self, visualizer):
+        """Test an equal tree returns a copy of the cached payload."""
+        first = visualizer.generate_parse_tree_visualization(repeated_label_tree(), {'S': ['A A']})
+        second = visualizer.generate_parse_tree_visualization(repeated_label_tree(), {'S': ['A A']})
+        
+        assert second == first
+        assert second is not first
+        assert len(visualizer._viz_cache) == 1
+        
+    def test_payload_fields_change_fingerprint(self, visualizer):
+        """Test metadata, rules and grammar changes miss the cache."""
+        tree = repeated_label_tree()
+        visualizer.generate_parse_tree_visualization(tree, {})
+        
+        tree.children[0].metadata = {'span': [0, 1]}
+        payload = visualizer.generate_parse_tree_visualization(tree, {})
+        assert payload['nodes'][1]['metadata'] == {'span': [0, 1]}
+        
+        tree.children[0].production_rule = 'A -> b'
+        payload = visualizer.generate_parse_tree_visualization(tree, {})
+        assert payload['derivation_steps'][1]['applied_rule'] == 'A -> b'
+        
+        payload = visualizer.generate_parse_tree_visualization(tree, {'A': ['b']})
+        assert payload['grammar_info']['rules'] == {'A': ['b']}
+        assert len(visualizer._viz_cache) == 4
+        
+    def test_cache_evicts_least_recently_used(self):
+        """Test the cache keeps at most VIZ_CACHE_SIZE payloads."""
+        class SmallCacheVisualizer(AdvancedVisualizer):
+            VIZ_CACHE_SIZE = 2
+        
+        visualizer = SmallCacheVisualizer()
+        trees = [make_node(f'root{i}', 'S') for i in range(3)]
+        keys = [visualizer._fingerprint_parse_tree(tree, {}) for tree in trees]
+        for tree in (trees[0], trees[1], trees[0], trees[2]):
+            visualizer.generate_parse_tree_visualization(tree, {})
+        
+        assert list(visualizer._viz_cache) == [keys[0], keys[2]]
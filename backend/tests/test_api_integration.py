@@ -112,6 +112,62 @@ class TestAPIIntegration:
         assert results[1]['is_valid'] == True  # GET /index.html HTTP/1.0  
         assert results[2]['is_valid'] == False # POST /invalid HTTP/1.1
         
+    def test_repeated_validation_uses_cache(self, client, monkeypatch):
+        """Test repeated request lines are served from the validation cache."""
+        monkeypatch.setitem(flask_app.config, 'ADMIN_TOKEN', 'test-token')
+        headers = {'X-Admin-Token': 'test-token'}
+        client.post('/api/cache/clear', headers=headers)
+        payload = json.dumps({'request_line': 'GET /index.html HTTP/1.1'})
+        
+        first = client.post('/api/validate', data=payload, content_type='application/json')
+        second = client.post('/api/validate', data=payload, content_type='application/json')
+        assert first.get_json()['is_valid'] == second.get_json()['is_valid'] == True
+        
+        response = client.post('/api/cache/clear', headers=headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['cleared'] == 1
+        assert data['hits'] == 1
+        
+    def test_cache_clear_requires_admin_token(self, client, monkeypatch):
+        """Test the cache clear endpoint is disabled or rejected without the admin token."""
+        monkeypatch.setitem(flask_app.config, 'ADMIN_TOKEN', None)
+        assert client.post('/api/cache/clear').status_code == 404
+        
+        monkeypatch.setitem(flask_app.config, 'ADMIN_TOKEN', 'test-token')
+        assert client.post('/api/cache/clear').status_code == 403
+        response = client.post('/api/cache/clear', headers={'X-Admin-Token': 'wrong'})
+        assert response.status_code == 403
+        
+    def test_full_log_queue_drops_entries(self, client, monkeypatch, caplog):
+        """Test validation still answers when the request log queue is full."""
+        import queue
+        import app as app_module
+        
+        class FullQueue:
+            def put_nowait(self, entry):
+                raise queue.Full
+        
+        # A stub instead of a filled queue: a running writer never sees it
+        monkeypatch.setattr(app_module, '_log_queue', FullQueue())
+        monkeypatch.setattr(app_module, '_log_writer_started', True)
+        dropped = app_module._dropped_log_entries
+        
+        payload = json.dumps({'request_line': 'GET /index.html HTTP/1.1'})
+        response = client.post('/api/validate', data=payload, content_type='application/json')
+        
+        assert response.status_code == 200
+        assert app_module._dropped_log_entries == dropped + 1
+        assert 'Request log queue full' in caplog.text
+        
+    def test_malformed_log_entry_is_skipped(self, caplog):
+        """Test a log entry that cannot be stored is reported instead of raised."""
+        import app as app_module
+        
+        app_module._write_request_log({'request_line': 'GET / HTTP/1.1'})
+        
+        assert 'Failed to store request log entry' in caplog.text
+        
     def test_grammar_endpoint(self, client):
         """Test grammar information endpoint."""
         response = client.get('/api/grammar')
@@ -0,0 +1,24 @@
+"""
+Timestamp helpers shared by the validator and NLP APIs
+
+Response bodies carry the current time as an ISO string. Under load many
+responses are built within the same millisecond, so the formatted string is
+reused until the millisecond changes.
+"""
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+# (millisecond, ISO string) of the most recently formatted timestamp
+_timestamp_cache: Tuple[int, str] = (0, '')
+
+def iso_now() -> str:
+    """Return the current local time in ISO format, formatted at most once per millisecond."""
+    global _timestamp_cache
+    now_ms = time.time_ns() // 1_000_000
+    cached_ms, cached = _timestamp_cache
+    if now_ms != cached_ms:
+        cached = datetime.fromtimestamp(now_ms / 1000).isoformat()
+        _timestamp_cache = (now_ms, cached)
+    return cached
@@ -0,0 +1,21 @@
+"""
+WSGI entry point for the CFG-Based HTTP GET Request Validator
+
+Patches the standard library for gevent before the app and its database
+driver are imported, so blocking socket and database calls yield to other
+requests. Run with Gunicorn: gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+from gevent import monkey
+monkey.patch_all()
+
+try:
+    from psycogreen.gevent import patch_psycopg
+except ImportError:
+    patch_psycopg = None
+
+# psycopg2 waits in C, out of gevent's reach, unless given a green wait callback
+if patch_psycopg is not None:
+    patch_psycopg()
+
+from app import app